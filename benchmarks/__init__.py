@@ -0,0 +1,20 @@
+# -*- coding: utf-8 *-*
+"""Benchmarks of the hot paths of :mod:`mongolabclient` and
+:mod:`pymongolab`, run against a
+:class:`~mongolabclient.testing.FakeMongoLabServer` started in another
+process.
+
+Run all of them and save the results as JSON::
+
+   $ python -m benchmarks --output results.json
+
+or through setup.py::
+
+   $ python setup.py benchmark --output results.json
+
+Compare the results with the ones of another version::
+
+   $ python -m benchmarks --compare old.json
+   $ python -m benchmarks --compare old.json --against new.json
+
+See ``python -m benchmarks --help`` for the rest of options."""
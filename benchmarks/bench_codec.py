@@ -0,0 +1,77 @@
+# -*- coding: utf-8 *-*
+"""Cost of encoding and decoding documents of several sizes with the codecs
+of :mod:`mongolabclient.codec`."""
+
+import datetime
+
+from bson.objectid import ObjectId
+
+from benchmarks.runner import benchmark, measure_loop
+from mongolabclient import codec
+
+SIZES = {
+    "small": 5,
+    "medium": 50,
+    "large": 500,
+}
+"""Number of fields of the documents of each size."""
+
+
+def document(fields, extended=True):
+    """Returns a document with `fields` fields, and an ObjectId and a
+    datetime when `extended` is ``True``."""
+    doc = dict(("field%d" % i, "value %d" % i if i % 2 else i * 1.5)
+               for i in range(fields))
+    if extended:
+        doc["_id"] = ObjectId()
+        doc["created"] = datetime.datetime(2013, 1, 1, 12, 30)
+    return doc
+
+
+def _register(size, fields):
+    documents = [document(fields) for _ in range(100)]
+    plain = [document(fields, extended=False) for _ in range(100)]
+
+    for name, instance in (("json", codec.JSONCodec()),
+                           ("fast", codec.FastJSONCodec())):
+        def encode(context, instance=instance):
+            result = measure_loop(lambda: instance.encode(documents),
+                                  context.scale(50))
+            return _per_document(result, len(documents))
+
+        def decode(context, instance=instance):
+            data = instance.encode(documents).encode("utf-8")
+            result = measure_loop(lambda: instance.decode(data),
+                                  context.scale(50))
+            return _per_document(result, len(documents), len(data))
+
+        def decode_plain(context, instance=instance):
+            data = instance.encode(plain).encode("utf-8")
+            result = measure_loop(lambda: instance.decode(data),
+                                  context.scale(50))
+            return _per_document(result, len(plain), len(data))
+
+        def iterdecode(context, instance=instance):
+            data = instance.encode(documents).encode("utf-8")
+            chunks = [data[i:i + 8192] for i in range(0, len(data), 8192)]
+            result = measure_loop(
+                lambda: [d for d in instance.iterdecode(chunks)],
+                context.scale(50))
+            return _per_document(result, len(documents), len(data))
+
+        benchmark("codec.%s.encode.%s" % (name, size))(encode)
+        benchmark("codec.%s.decode.%s" % (name, size))(decode)
+        benchmark("codec.%s.decode_plain.%s" % (name, size))(decode_plain)
+        benchmark("codec.%s.iterdecode.%s" % (name, size))(iterdecode)
+
+
+def _per_document(result, count, size=None):
+    metrics = {"per_doc": result["per_op"] / count,
+               "docs_per_sec": result["ops_per_sec"] * count}
+    if size is not None:
+        metrics["doc_bytes"] = size // count
+    return metrics
+
+
+for size, fields in sorted(SIZES.items()):
+    _register(size, fields)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 *-*
+"""Time of bulk inserts and large finds over a link of limited bandwidth,
+with and without compression of request and response bodies."""
+
+from benchmarks.runner import API_KEY, benchmark, measure_latency, \
+    start_server
+from mongolabclient.compression import Compression
+from pymongolab import MongoClient
+
+BANDWIDTH = 1024 * 1024
+"""Bytes per second of the simulated link."""
+
+
+def _documents(count):
+    return [{"n": i, "group": i % 10, "name": "document %d" % i,
+             "tags": ["a", "b", "c"], "value": i * 1.5}
+            for i in range(count)]
+
+
+def _run(context, compression, operation):
+    """Run `operation` against a server that compresses responses only
+    when `compression` is ``True``, since the HTTP library always accepts
+    gzip."""
+    process, base_url = start_server(sizes={"docs": context.scale(20000)},
+                                     bandwidth=BANDWIDTH,
+                                     compression=compression)
+    try:
+        settings = Compression() if compression else None
+        client = MongoClient(API_KEY, base_url=base_url,
+                             compression=settings)
+        metrics = measure_latency(operation(context, client.bench),
+                                  context.scale(20), warmup=1)
+    finally:
+        process.terminate()
+        process.join()
+    if settings is not None:
+        stats = settings.stats()
+        metrics["saved_bytes"] = stats["saved_bytes"]
+    return metrics
+
+
+def _insert(context, database):
+    documents = _documents(context.scale(5000))
+    return lambda i: database["inserts%d" % i].insert(documents)
+
+
+def _find(context, database):
+    total = context.scale(20000)
+
+    def find(i):
+        count = len(list(database.docs.find().batch_size(total)))
+        assert count == total, count
+    return find
+
+
+for compressed in (False, True):
+    suffix = "gzip" if compressed else "plain"
+    benchmark("compression.insert.%s" % suffix)(
+        lambda context, compressed=compressed:
+        _run(context, compressed, _insert))
+    benchmark("compression.find.%s" % suffix)(
+        lambda context, compressed=compressed:
+        _run(context, compressed, _find))
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 *-*
+"""Cost of creating clients and handles and of building requests, which is
+paid on every operation before any network activity."""
+
+from benchmarks.runner import API_KEY, benchmark, measure_loop
+from mongolabclient import MongoLabClient, settings, validators
+from pymongolab import MongoClient
+
+
+@benchmark("construct.mongolabclient")
+def construct_mongolabclient(context):
+    return measure_loop(lambda: MongoLabClient(API_KEY, connect=False),
+                        context.scale(2000))
+
+
+@benchmark("construct.mongoclient")
+def construct_mongoclient(context):
+    return measure_loop(lambda: MongoClient(API_KEY, connect=False),
+                        context.scale(2000))
+
+
+@benchmark("handles.attribute")
+def handles_attribute(context):
+    """``client.database.collection``, as written in hot loops."""
+    client = MongoClient(API_KEY, connect=False)
+    return measure_loop(lambda: client.bench.events, context.scale(100000))
+
+
+@benchmark("handles.item")
+def handles_item(context):
+    client = MongoClient(API_KEY, connect=False)
+    return measure_loop(lambda: client["bench"]["events"],
+                        context.scale(100000))
+
+
+@benchmark("handles.find")
+def handles_find(context):
+    """Create a cursor, without sending any request."""
+    client = MongoClient(API_KEY, connect=False)
+    return measure_loop(lambda: client.bench.events.find({"n": 1}).limit(10),
+                        context.scale(50000))
+
+
+@benchmark("request.prepare.view_document")
+def prepare_view_document(context):
+    client = MongoLabClient(API_KEY, connect=False)
+    slug_params = {"db": "bench", "col": "events", "id": "abc"}
+    return measure_loop(
+        lambda: client._prepare_request(settings.VIW_DOC, slug_params, {}),
+        context.scale(50000))
+
+
+@benchmark("request.prepare.list_documents")
+def prepare_list_documents(context):
+    client = MongoLabClient(API_KEY, connect=False)
+    slug_params = {"db": "bench", "col": "events"}
+    params = {"q": {"group": 1}, "l": 10, "f": {"name": 1}}
+    return measure_loop(
+        lambda: client._prepare_request(settings.LST_DOCS, slug_params,
+                                        params),
+        context.scale(50000))
+
+
+@benchmark("validators.list_documents_params")
+def validate_list_documents_params(context):
+    return measure_loop(
+        lambda: validators.check_list_documents_params(spec={"group": 1},
+            fields={"name": 1}, limit=10, skip=5),
+        context.scale(50000))
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 *-*
+"""Memory allocated while iterating results and by the objects created on
+every operation, traced with :mod:`tracemalloc` (Python 3.4+)."""
+
+from benchmarks.runner import benchmark, measure_memory
+from pymongolab import collection, cursor
+
+
+@benchmark("memory.cursor.iterate", server=True)
+def cursor_iterate(context):
+    """Iterate a cursor over the whole collection without keeping the
+    documents, so only one page is alive at a time."""
+    docs = context.client().bench.stream
+    total = context.scale(20000)
+
+    def iterate():
+        count = 0
+        for _ in docs.find().batch_size(1000):
+            count += 1
+        assert count == total, count
+    metrics = measure_memory(iterate)
+    metrics["docs"] = total
+    return metrics
+
+
+@benchmark("memory.list_documents", server=True)
+def list_documents(context):
+    """Download the whole collection in a single list, as a reference for
+    :func:`cursor_iterate`."""
+    client = context.client()
+    total = context.scale(20000)
+
+    def download():
+        documents = client.request.list_documents("bench", "stream",
+                                                  limit=total)
+        assert len(documents) == total, len(documents)
+    metrics = measure_memory(download)
+    metrics["docs"] = total
+    return metrics
+
+
+def _per_object(factory, number):
+    metrics = measure_memory(lambda: [factory(i) for i in range(number)])
+    return {"object_bytes": metrics["retained_bytes"] / float(number)}
+
+
+@benchmark("memory.collection_handle")
+def collection_handle(context):
+    database = context.client(connect=False).bench
+    return _per_object(lambda i: collection.Collection(database, "c%d" % i),
+                       context.scale(10000))
+
+
+@benchmark("memory.cursor_handle")
+def cursor_handle(context):
+    docs = context.client(connect=False).bench.docs
+    return _per_object(lambda i: cursor.Cursor(docs, {"n": i}),
+                       context.scale(10000))
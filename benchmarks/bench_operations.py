@@ -0,0 +1,122 @@
+# -*- coding: utf-8 *-*
+"""Throughput and latency of the operations of
+:class:`~pymongolab.collection.Collection` and
+:class:`~pymongolab.database.Database` sent to the fake server."""
+
+import threading
+import time
+
+from benchmarks.runner import benchmark, measure_latency
+
+
+@benchmark("ops.find", server=True)
+def find(context):
+    collection = context.client().bench.docs
+
+    def find(i):
+        return [document for document in
+                collection.find({"group": i % 10}).limit(50)]
+    return measure_latency(find, context.scale(300))
+
+
+@benchmark("ops.find_one", server=True)
+def find_one(context):
+    collection = context.client().bench.docs
+    return measure_latency(lambda i: collection.find_one({"n": i % 100}),
+                           context.scale(500))
+
+
+@benchmark("ops.find_one.fields", server=True)
+def find_one_fields(context):
+    collection = context.client().bench.docs
+    return measure_latency(
+        lambda i: collection.find_one({"n": i % 100}, {"name": 1}),
+        context.scale(500))
+
+
+@benchmark("ops.insert", server=True)
+def insert(context):
+    collection = context.client().bench.inserts
+    try:
+        return measure_latency(
+            lambda i: collection.insert({"n": i, "name": "document %d" % i}),
+            context.scale(500))
+    finally:
+        collection.remove()
+
+
+@benchmark("ops.insert.bulk100", server=True)
+def insert_bulk(context):
+    collection = context.client().bench.inserts
+    documents = [{"n": i, "name": "document %d" % i} for i in range(100)]
+    try:
+        return measure_latency(lambda i: collection.insert(documents),
+                               context.scale(100))
+    finally:
+        collection.remove()
+
+
+@benchmark("ops.update", server=True)
+def update(context):
+    collection = context.client().bench.docs
+    return measure_latency(
+        lambda i: collection.update({"n": i % 100},
+                                    {"$set": {"updated": i}}),
+        context.scale(500))
+
+
+@benchmark("ops.remove", server=True)
+def remove(context):
+    collection = context.client().bench.removes
+    number = context.scale(500)
+    collection.insert([{"n": i} for i in range(number + 5)])
+    try:
+        return measure_latency(lambda i: collection.remove({"n": i}), number)
+    finally:
+        collection.remove()
+
+
+@benchmark("ops.command", server=True)
+def command(context):
+    database = context.client().bench
+    return measure_latency(lambda i: database.command("ping"),
+                           context.scale(500))
+
+
+@benchmark("ops.find_one.threads8", server=True)
+def find_one_threads(context):
+    """find_one from 8 threads sharing a client and its connection pool."""
+    collection = context.client(max_pool_size=8).bench.docs
+    number = context.scale(100)
+
+    def work():
+        for i in range(number):
+            collection.find_one({"n": i % 100})
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    started = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - started
+    return {"ops": 8 * number, "ops_per_sec": 8 * number / elapsed}
+
+
+@benchmark("pool.keepalive", server=True)
+def keepalive(context):
+    """Requests sent through the pooled keep-alive connections."""
+    client = context.client()
+    return measure_latency(lambda i: client.database_names(),
+                           context.scale(500))
+
+
+@benchmark("pool.reconnect", server=True)
+def reconnect(context):
+    """Requests opening a new connection each time, like clients without a
+    connection pool."""
+    client = context.client()
+
+    def request(i):
+        client.database_names()
+        client.close()
+    return measure_latency(request, context.scale(500))
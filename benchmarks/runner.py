@@ -0,0 +1,288 @@
+# -*- coding: utf-8 *-*
+"""Registry, measurement helpers and command line interface of the
+benchmarks."""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import multiprocessing
+import platform
+import sys
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import pymongolab
+from mongolabclient import testing
+
+API_KEY = "a" * 24
+"""API key used by the clients of the benchmarks."""
+
+_BENCHMARKS = []
+
+_MODULES = ["benchmarks.bench_operations", "benchmarks.bench_codec",
+            "benchmarks.bench_memory", "benchmarks.bench_construction",
+            "benchmarks.bench_compression"]
+
+
+class Skipped(Exception):
+    """Raised by a benchmark that can't run on this interpreter."""
+
+
+def benchmark(name, server=False):
+    """Decorator registering a benchmark function, called with a
+    :class:`Context` and returning a dict of metrics. Benchmarks with
+    `server` need the fake REST API server."""
+    def register(func):
+        _BENCHMARKS.append((name, func, server))
+        return func
+    return register
+
+
+class Context(object):
+    """Options of a run shared by all of the benchmarks."""
+
+    def __init__(self, quick=False, base_url=None):
+        self.quick = quick
+        self.base_url = base_url
+
+    def scale(self, number):
+        """Returns the number of iterations to run, divided by ten in quick
+        runs."""
+        if self.quick:
+            return max(1, number // 10)
+        return number
+
+    def client(self, **kwargs):
+        """Returns a :class:`~pymongolab.mongo_client.MongoClient` of the fake
+        server."""
+        return pymongolab.MongoClient(API_KEY, base_url=self.base_url,
+                                      **kwargs)
+
+
+def percentile(values, percent):
+    """Returns the `percent` percentile of a sorted list of values."""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(percent / 100.0 *
+                                           (len(values) - 1))))
+    return values[index]
+
+
+def measure_latency(func, number, warmup=5):
+    """Call `func` `number` times, returning the throughput and the
+    percentiles of the latency of each call."""
+    for i in range(min(warmup, number)):
+        func(i)
+    latencies = []
+    started = time.time()
+    for i in range(number):
+        call_started = time.time()
+        func(i)
+        latencies.append(time.time() - call_started)
+    elapsed = time.time() - started
+    latencies.sort()
+    return {"ops": number, "ops_per_sec": number / elapsed,
+            "mean": elapsed / number, "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99), "max": latencies[-1]}
+
+
+def measure_loop(func, number, repeat=5):
+    """Returns the best time per call of `repeat` loops calling `func`
+    `number` times, with the garbage collector disabled like :mod:`timeit`."""
+    best = None
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.time()
+            for _ in range(number):
+                func()
+            elapsed = time.time() - started
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        if enabled:
+            gc.enable()
+    return {"per_op": best / number, "ops_per_sec": number / best}
+
+
+def measure_memory(func):
+    """Returns the peak and the retained bytes allocated by `func`, traced
+    with :mod:`tracemalloc`."""
+    if tracemalloc is None:
+        raise Skipped("tracemalloc is not available")
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"peak_bytes": peak - before, "retained_bytes": current - before}
+
+
+def _serve(conn, latency, sizes, options):
+    """Run a fake REST API server with the collections used by the
+    benchmarks until the parent process terminates it."""
+    server = testing.FakeMongoLabServer(latency=latency, **options)
+    for name, size in sizes.items():
+        server.load("bench", name, [{"n": i, "group": i % 10,
+                                     "name": "document %d" % i,
+                                     "tags": ["a", "b", "c"],
+                                     "value": i * 1.5} for i in range(size)])
+    conn.send(server.port)
+    conn.close()
+    server.start()
+    while True:
+        time.sleep(3600)
+
+
+def start_server(latency=0, sizes=None, **options):
+    """Start a fake REST API server in another process, so that its threads
+    don't compete with the benchmarks for the GIL nor count in their memory.
+    `options` are passed to :class:`~mongolabclient.testing.FakeMongoLabServer`.
+    Returns the process and the base url of the server."""
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_serve,
+                                      args=(child, latency, sizes or {},
+                                            options))
+    process.daemon = True
+    process.start()
+    port = parent.recv()
+    return process, "http://127.0.0.1:%d/api/1/" % port
+
+
+def load_benchmarks():
+    for module in _MODULES:
+        __import__(module)
+    return list(_BENCHMARKS)
+
+
+def run(names=None, quick=False, latency=0, output=sys.stdout):
+    """Run the benchmarks whose name contains any of `names` and returns a
+    dict with their results, ready to be saved as JSON."""
+    selected = [b for b in load_benchmarks()
+                if not names or any(name in b[0] for name in names)]
+    context = Context(quick)
+    process = None
+    if any(needs_server for _, _, needs_server in selected):
+        process, context.base_url = start_server(latency, {
+            "docs": context.scale(2000), "stream": context.scale(20000)})
+    results = {}
+    try:
+        for name, func, _ in selected:
+            try:
+                metrics = func(context)
+            except Skipped as e:
+                print("%-40s skipped: %s" % (name, e), file=output)
+                continue
+            results[name] = metrics
+            print("%-40s %s" % (name, format_metrics(metrics)), file=output)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.join()
+    return {"meta": {"pymongolab": pymongolab.version,
+                     "python": platform.python_version(),
+                     "implementation": platform.python_implementation(),
+                     "platform": platform.platform(),
+                     "timestamp": time.time(), "quick": quick,
+                     "latency": latency},
+            "results": results}
+
+
+def format_value(name, value):
+    if value is None:
+        return "-"
+    if name.endswith("bytes"):
+        return "%.1fKB" % (value / 1024.0)
+    if name.endswith("per_sec"):
+        return "%.1f" % value
+    if isinstance(value, float):
+        if value < 0.001:
+            return "%.2fus" % (value * 1e6)
+        return "%.3fms" % (value * 1e3)
+    return str(value)
+
+
+def format_metrics(metrics):
+    return " ".join("%s=%s" % (name, format_value(name, value))
+                    for name, value in sorted(metrics.items()))
+
+
+def compare(old, new, output=sys.stdout):
+    """Print the change of every metric of the benchmarks found in both
+    results. Returns the number of metrics compared."""
+    print("%-40s %-16s %12s %12s %9s" % ("benchmark", "metric", "old", "new",
+                                         "change"), file=output)
+    compared = 0
+    for name in sorted(new["results"]):
+        if name not in old["results"]:
+            continue
+        old_metrics = old["results"][name]
+        for metric, value in sorted(new["results"][name].items()):
+            previous = old_metrics.get(metric)
+            if not isinstance(value, (int, float)) or not previous:
+                continue
+            change = (value - previous) * 100.0 / previous
+            better = change > 0 if metric.endswith("per_sec") else change < 0
+            print("%-40s %-16s %12s %12s %+8.1f%%%s" % (
+                name, metric, format_value(metric, previous),
+                format_value(metric, value), change,
+                " *" if better and abs(change) >= 5 else ""), file=output)
+            compared += 1
+    print("\n* better by 5% or more", file=output)
+    return compared
+
+
+def parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+        description="Benchmarks of pymongolab against a fake REST API "
+                    "server.")
+    parser.add_argument("-k", "--filter", action="append", default=[],
+        help="run only the benchmarks whose name contains this text")
+    parser.add_argument("-o", "--output",
+        help="save the results as JSON in this file")
+    parser.add_argument("-c", "--compare",
+        help="compare the results with the ones saved in this file")
+    parser.add_argument("--against",
+        help="with --compare, compare this file instead of running")
+    parser.add_argument("--quick", action="store_true",
+        help="run a tenth of iterations")
+    parser.add_argument("--latency", type=float, default=0,
+        help="milliseconds added by the server to every response")
+    parser.add_argument("--list", action="store_true",
+        help="list the benchmarks and exit")
+    return parser
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    if args.list:
+        for name, _, needs_server in load_benchmarks():
+            print(name + (" (server)" if needs_server else ""))
+        return 0
+    if args.against:
+        if not args.compare:
+            parser().error("--against requires --compare")
+        with open(args.against) as f:
+            results = json.load(f)
+    else:
+        results = run(args.filter, args.quick, args.latency / 1000.0)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print()
+        compare(baseline, results)
+    return 0
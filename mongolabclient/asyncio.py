@@ -0,0 +1,315 @@
+# -*- coding: utf-8 *-*
+"""Asynchronous HTTP requests implementation for `MongoLab REST API`_ running
+on an :mod:`asyncio` event loop.
+
+This module requires Python 3.5+ and aiohttp_.
+
+.. _MongoLab REST API: http://support.mongolab.com/entries/20433053-rest-api-for-mongodb
+.. _aiohttp: https://docs.aiohttp.org/"""
+
+import asyncio
+import time
+
+import aiohttp
+import yarl
+
+from mongolabclient import settings, validators, errors, pool
+from mongolabclient.client import BaseClient, DEFAULT_CONNECT_TIMEOUT
+
+
+async def _acquire(limiter):
+    """Waits in a thread of the default executor until `limiter` lets a
+    request through, without blocking the event loop."""
+    future = asyncio.get_event_loop().run_in_executor(None, limiter.acquire)
+    try:
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        def release(future):
+            if not future.cancelled() and future.exception() is None:
+                limiter.release()
+        future.add_done_callback(release)
+        raise
+
+
+class AsyncMongoLabClient(BaseClient):
+    """Asynchronous version of :class:`~mongolabclient.client.MongoLabClient`.
+    Every operation is a coroutine, so thousands of REST calls can run
+    concurrently on one event loop without a thread per request.
+
+    The operations, URLs and validation of parameters are the same ones of
+    :class:`~mongolabclient.client.MongoLabClient`. The API key is only checked
+    against REST API when :meth:`validate_api_key` is awaited. Failed requests
+    are retried according to ``retry_policy``, an instance of
+    :class:`~mongolabclient.retry.RetryPolicy`, and operations are reported
+    to ``event_listeners`` (see :mod:`mongolabclient.monitoring`). Bodies are
+    compressed according to ``compression`` (see
+    :mod:`mongolabclient.compression`). ``rate_limiter``, ``connect_timeout``
+    and ``read_timeout`` work as in
+    :class:`~mongolabclient.client.MongoLabClient`; a
+    :class:`~mongolabclient.ratelimit.RateLimiter` can be shared by both
+    kinds of clients.
+
+    .. code-block:: python
+
+       >>> from mongolabclient.asyncio import AsyncMongoLabClient
+       >>> client = AsyncMongoLabClient("MongoLabAPIKey", max_pool_size=100)
+       >>> await client.list_documents("database", "collection", limit=2)
+       [{u'_id': ObjectId('50243d38e4b00c3b3e75fc94'), u'foo': u'bar'},
+       {u'_id': ObjectId('50004d646cf431171ed53846'), u'foo': u'bar'}]
+       >>> await client.close()
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, api_key, version=settings.VERSION_1, proxy_url=None,
+        max_pool_size=pool.DEFAULT_MAX_POOL_SIZE, codec=None,
+        retry_policy=None, event_listeners=None, base_url=None,
+        compression=None, rate_limiter=None,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=None):
+        super(AsyncMongoLabClient, self).__init__(api_key, version, proxy_url,
+                                                  codec, event_listeners,
+                                                  base_url, compression,
+                                                  rate_limiter,
+                                                  connect_timeout,
+                                                  read_timeout)
+        if not validators.check_api_key(self.api_key):
+            raise errors.BadAPIKeyFormat(self.api_key)
+        self.max_pool_size = max_pool_size
+        self.retry_policy = retry_policy
+        self.__session = None
+
+    def __get_session(self):
+        """Returns the :class:`aiohttp.ClientSession` of this client, created
+        on first use so it is bound to the running event loop."""
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.max_pool_size)
+            self.__session = aiohttp.ClientSession(connector=connector)
+        return self.__session
+
+    async def __get_response(self, operation, slug_params={}, **kwargs):
+        """Returns response of HTTP request depending the operation
+        selected.
+        """
+        monitor = self._monitor(operation, slug_params)
+        method, url, headers, params, data = self._prepare_request(operation,
+            slug_params, kwargs)
+        if monitor is not None:
+            monitor.start(method, url, params, data)
+        try:
+            status, content = await self.__fetch(method, url, headers, params,
+                                                 data)
+            if monitor is not None:
+                monitor.received(status, content)
+            self._check_status(status)
+            response = self._decode_response(status, content)
+        except Exception as e:
+            if monitor is not None:
+                monitor.failed(e)
+            raise
+        if monitor is not None:
+            monitor.finish(response)
+        return response
+
+    async def __fetch(self, method, url, headers, params, data):
+        """Returns the status and the body of the HTTP response, retrying the
+        request according to :attr:`retry_policy`."""
+        url = yarl.URL("%s?%s" % (url, params), encoded=True)
+        session = self.__get_session()
+        policy = self.retry_policy
+        limiter = self.rate_limiter
+        connect_timeout, read_timeout = self._timeout() or (None, None)
+        timeout = aiohttp.ClientTimeout(total=None,
+                                        sock_connect=connect_timeout,
+                                        sock_read=read_timeout)
+        started = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            if limiter is not None:
+                await _acquire(limiter)
+            try:
+                async with session.request(method, url, headers=headers,
+                                           data=data or None,
+                                           proxy=self.proxy_url,
+                                           timeout=timeout) as response:
+                    delay = None
+                    if policy is not None:
+                        delay = policy.next_delay(method, attempt, started,
+                            response.status, response.headers)
+                    if delay is None:
+                        content = await response.read()
+                        if self.compression is not None:
+                            self.compression.record_response(len(content),
+                                int(response.headers.get("Content-Length",
+                                                         len(content))))
+                        return response.status, content
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if policy is None:
+                    raise
+                delay = policy.next_delay(method, attempt, started)
+                if delay is None:
+                    raise
+            finally:
+                if limiter is not None:
+                    limiter.release()
+            await asyncio.sleep(delay)
+
+    async def validate_api_key(self):
+        """Make a GET request to REST API base url and raise
+        :class:`~mongolabclient.errors.InvalidAPIKey` if the API key is
+        rejected. No request is sent when the key has already been accepted in
+        this process."""
+        if self._is_validated():
+            return
+        r = await self.__get_response(settings.VAL_API)
+        if r["status"] != 200:
+            raise errors.InvalidAPIKey(self.api_key)
+
+    async def close(self):
+        """Close all of pooled connections. They will be reopened on the next
+        request."""
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def list_databases(self):
+        """Returns a list of databases name of your account.
+
+        .. code-block:: bash
+
+           GET /databases
+        """
+        r = await self.__get_response(settings.LST_DBS)
+        if r["status"] == 200:
+            return r["result"]
+        raise Exception(r["result"]["message"])
+
+    async def list_collections(self, database):
+        """Returns a list of collections name of database selected.
+
+        .. code-block:: bash
+
+           GET /databases/{database}/collections
+        """
+        r = await self.__get_response(settings.LST_COLS, {"db": database})
+        if r["status"] == 200:
+            return r["result"]
+        raise Exception(r["result"]["message"])
+
+    async def list_documents(self, database, collection, **kwargs):
+        """Returns a list of dicts with the matched documents with the query.
+        When ``count`` is ``True``, the number of matched documents is counted
+        by REST API and returned instead.
+
+        .. code-block:: bash
+
+           GET /databases/{database}/collections/{collection}
+        """
+        kwargs = validators.check_list_documents_params(**kwargs)
+        r = await self.__get_response(settings.LST_DOCS,
+            {"db": database, "col": collection}, **kwargs)
+        if r["status"] == 200:
+            return r["result"]
+        raise Exception(r["result"]["message"])
+
+    async def insert_documents(self, database, collection, doc_or_docs):
+        """Insert a document or documents into collection.
+
+        .. code-block:: bash
+
+           POST /databases/{database}/collections/{collection}
+        """
+        validators.check_documents_to_insert(doc_or_docs)
+        r = await self.__get_response(settings.INS_DOCS,
+            {"db": database, "col": collection}, data=doc_or_docs)
+        if r["status"] == 200:
+            return r["result"]
+        raise Exception(r["result"]["message"])
+
+    async def update_documents(self, database, collection, spec, doc_or_docs,
+        upsert, multi):
+        """Update a document or documents that matches with query. It is
+        posible ``upsert`` data.
+
+        .. code-block:: bash
+
+           PUT /databases/{database}/collections/{collection}
+        """
+        validators.check_document_to_update(doc_or_docs)
+        r = await self.__get_response(settings.UPD_DOCS,
+            {"db": database, "col": collection},
+            data=doc_or_docs, q=spec, m=multi, u=upsert)
+        if r["status"] == 200:
+            if r["result"]["error"]:
+                raise Exception(r["result"]["error"])
+            return r["result"]["n"]
+        raise Exception(r["result"]["message"])
+
+    async def delete_replace_documents(self, database, collection, spec={},
+        documents=[]):
+        """Delete o replace a document or documents that matches with query.
+
+        .. code-block:: bash
+
+           PUT /databases/{database}/collections/{collection}
+        """
+        r = await self.__get_response(settings.DEL_REP_DOCS,
+            {"db": database, "col": collection}, data=documents, q=spec)
+        if r["status"] == 200:
+            return r["result"]["n"]
+        raise Exception(r["result"]["message"])
+
+    async def view_document(self, database, collection, _id):
+        """Returns a dict with document matched with this ``_id``.
+
+        .. code-block:: bash
+
+           GET /databases/{database}/collections/{collection}/{_id}
+        """
+        r = await self.__get_response(settings.VIW_DOC,
+            {"db": database, "col": collection, "id": str(_id)})
+        if r["status"] == 200:
+            return r["result"]
+        raise Exception(r["result"]["message"])
+
+    async def update_document(self, database, collection, _id, document):
+        """Update a document matched with this ``_id``, returns number of
+        documents affected.
+
+        .. code-block:: bash
+
+           PUT /databases/{database}/collections/{collection}/{_id}
+        """
+        r = await self.__get_response(settings.UPD_DOC,
+            {"db": database, "col": collection, "id": str(_id)},
+            data=document)
+        if r["status"] == 200:
+            return r["result"]
+        raise Exception(r["result"]["message"])
+
+    async def delete_document(self, database, collection, _id):
+        """Delete a document matched with this ``_id``, returns a :class:`dict`
+        with deleted document or a list of dicts with deleted documents.
+
+        .. code-block:: bash
+
+           DELETE /databases/{database}/collections/{collection}/{_id}
+        """
+        r = await self.__get_response(settings.DEL_DOC,
+            {"db": database, "col": collection, "id": str(_id)})
+        if r["status"] == 200:
+            return r["result"]
+        raise Exception(r["result"]["message"])
+
+    async def run_command(self, database, command):
+        """Run a database-collection level command.
+
+        .. code-block:: bash
+
+           POST /databases/{database}/runCommand
+        """
+        r = await self.__get_response(settings.RUN_DB_COL_LVL_CMD,
+            {"db": database}, data=command)
+        if r["status"] == 200:
+            return r["result"]
+        raise Exception(r["result"]["message"])
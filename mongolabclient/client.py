@@ -1,51 +1,117 @@
 # -*- coding: utf-8 *-*
-try:
-    import simplejson as json
-except ImportError:
-    import json
-import requests
-
-from bson import json_util
-from mongolabclient import settings, validators, errors
-
-
-class MongoLabClient(object):
-    """Instance class with the API key located at
-    https://mongolab.com/user?username=[username].
-
-    .. note::
-       The ``version`` parameter is optional, because it is planed for using in
-       future versions of REST API.
-
-    When your connection needs to set a proxy, you can to set an `str` with the
-    Proxy url to ``proxy_url`` parameter. If you don't set a ``proxy_url``,
-    then :class:`MongoLabClient` gets system proxy settings.
-
-    .. code-block:: python
+import threading
+import time
 
-       >>> from mongolabclient import MongoLabClient
-       >>> MongoLabClient("MongoLabAPIKey", proxy_url="https://127.0.0.1:8000")
-       MongoLabClient('MongoLabAPIKey', 'v1')
+import requests
 
-    .. sds:: `proxy_handler` was deprecated on 1.3 version.
+from mongolabclient import compat, settings, validators, errors, pool, \
+    monitoring, compression as _compression
+from mongolabclient.codec import DEFAULT_CODEC
+
+STREAM_CHUNK_SIZE = 64 * 1024
+"""Number of bytes read at once from streamed responses."""
+
+DEFAULT_CONNECT_TIMEOUT = 20.0
+"""Default seconds to wait for a connection to REST API."""
+
+_validated_api_keys = set()
+"""Pairs ``(base_url, api_key)`` already accepted by REST API in this
+process."""
+
+
+class _SingleFlight(object):
+    """Runs concurrent calls with the same key only once, sharing the result
+    of the first one (or its exception) with the rest of callers."""
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+
+    def call(self, key, func, deadline=None):
+        """Returns the result of `func`, calling it unless there is a call
+        with the same `key` in progress, which is waited for until
+        `deadline`."""
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.__calls[key] = [threading.Event(), None, None]
+        if leader:
+            try:
+                call[1] = func()
+                return call[1]
+            except Exception as e:
+                call[2] = e
+                raise
+            finally:
+                with self.__lock:
+                    del self.__calls[key]
+                call[0].set()
+        timeout = None
+        if deadline is not None:
+            timeout = max(deadline - time.time(), 0)
+        if not call[0].wait(timeout):
+            raise errors.ExecutionTimeout()
+        if call[2] is not None:
+            raise call[2]
+        return call[1]
+
+
+class BaseClient(object):
+    """Shared state of :class:`MongoLabClient` and
+    :class:`~mongolabclient.asyncio.AsyncMongoLabClient`: API key, settings of
+    the selected version, proxy and the building of HTTP requests for every
+    operation of REST API.
+
+    Request bodies and responses are encoded and decoded by ``codec``, an
+    instance of any of the classes of :mod:`mongolabclient.codec`.
+    Operations are reported to ``event_listeners``, a list of
+    :class:`~mongolabclient.monitoring.OperationListener`, and to the
+    listeners registered with :func:`mongolabclient.monitoring.register`.
+    Requests are sent to ``base_url`` when it is given instead of the base url
+    of the version, e.g. to a
+    :class:`~mongolabclient.testing.FakeMongoLabServer`.
+
+    ``compression`` is an instance of
+    :class:`~mongolabclient.compression.Compression`, or the encodings
+    accepted to create one (``True`` for the default ones). It is ``None``
+    by default, leaving the ``Accept-Encoding`` header of the HTTP library
+    and sending request bodies uncompressed.
+
+    Every request waits its turn in ``rate_limiter``, an instance of
+    :class:`~mongolabclient.ratelimit.RateLimiter`, when it is given.
+    ``connect_timeout`` and ``read_timeout`` are the seconds to wait for a
+    connection and for each read of a response (``None`` waits forever).
+
+    .. versionadded:: 1.3
     """
 
-    def __init__(self, api_key, version=settings.VERSION_1, proxy_url=None):
+    def __init__(self, api_key, version=settings.VERSION_1, proxy_url=None,
+        codec=None, event_listeners=None, base_url=None, compression=None,
+        rate_limiter=None, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=None):
         self.api_key = api_key
         self.settings = settings.MongoLabSettings(version)
-        self.__content_type = 'application/json;charset=utf-8'
+        if base_url is not None:
+            self._base_url = base_url
+        self.codec = codec or DEFAULT_CODEC
+        self.event_listeners = list(event_listeners or [])
+        self.__headers = {'content-type': 'application/json;charset=utf-8'}
+        if compression is True:
+            compression = _compression.Compression()
+        elif compression and \
+            not isinstance(compression, _compression.Compression):
+            compression = _compression.Compression(compression)
+        self.compression = compression or None
+        if self.compression is not None:
+            self.__headers['accept-encoding'] = \
+                self.compression.accept_encoding
+        self.__templates = None
+        self.__templates_key = None
         self.__proxy_url = proxy_url
-        if not self.__validate_api_key():
-            raise errors.InvalidAPIKey(self.api_key)
-
-    def __validate_api_key(self):
-        """Validate API Key format and make a GET request to REST API base url:
-        https://api.mongolab.com/api/1
-        """
-        if not validators.check_api_key(self.api_key):
-            raise errors.BadAPIKeyFormat(self.api_key)
-        r = self.__get_response(settings.VAL_API)
-        return (r["status"] == 200)
+        self.__rate_limiter = rate_limiter
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
 
     @property
     def base_url(self):
@@ -62,6 +128,15 @@ class MongoLabClient(object):
         """
         return self.__proxy_url
 
+    @property
+    def rate_limiter(self):
+        """Instance of :class:`mongolabclient.ratelimit.RateLimiter` shared by
+        all of HTTP requests, or ``None`` when requests are not limited.
+
+        .. versionadded: 1.3
+        """
+        return self.__rate_limiter
+
     @property
     def proxies(self):
         if self.proxy_url:
@@ -82,80 +157,508 @@ class MongoLabClient(object):
             return urllib2.ProxyHandler({"https": self.proxy_url})
         return urllib2.ProxyHandler()
 
-    def __get_full_url(self, operation, slug_params):
-        """Returns full url of the operation selected with the slug parameters
-        included.
+    def __encode_params(self, kwargs):
+        """Returns query string parameters encoded as JSON, as expected by
+        REST API (e.g. ``c=true`` and ``q={"foo": "bar"}``).
         """
-        return (self.base_url + operation[1]) % slug_params
-
-    def __get_response(self, operation, slug_params={}, **kwargs):
-        """Returns response of HTTP request depending the operation
-        selected.
+        params = {}
+        for key, value in compat.iteritems(kwargs):
+            if key == "data":
+                continue
+            if not isinstance(value, compat.string_type):
+                value = self.codec.encode(value)
+            params[key] = value
+        return params
+
+    def _template(self, operation):
+        """Returns the :class:`~mongolabclient.settings.RequestTemplate` of
+        the operation selected, compiled on first use for the API key and base
+        url of this client."""
+        if self.__templates is None or self.__templates_key != \
+            (self.api_key, self.base_url):
+            self.__templates_key = (self.api_key, self.base_url)
+            self.__templates = self.settings.compile(self.api_key,
+                self.__headers, self.base_url)
+        return self.__templates[operation]
+
+    def _monitor(self, operation, slug_params):
+        """Returns the timings of the operation selected, which publish its
+        events to the listeners of this client, or ``None`` when there is no
+        listener."""
+        listeners = monitoring._LISTENERS + self.event_listeners
+        if not listeners:
+            return None
+        return monitoring._Operation(listeners, operation, slug_params)
+
+    def _prepare_request(self, operation, slug_params, kwargs):
+        """Returns a tuple ``(method, url, headers, params, data)`` with the
+        HTTP request of the operation selected, where ``params`` is an
+        urlencoded query string.
         """
-        operation = self.settings.operations[operation]
-        url = self.__get_full_url(operation, slug_params)
-        method = getattr(requests, operation[0])
-        headers = {'content-type': self.__content_type}
-        params = {'apiKey': self.api_key}
+        template = self._template(operation)
+        method = template.method
         data = {}
-        if operation[0] in ['get', 'delete']:
-            params.update(kwargs)
-        elif operation[0] == "post":
-            data = json.dumps(kwargs.get("data", {}), default=json_util.default)
-        elif operation[0] == "put":
-            params.update(kwargs)
-            del params['data']
-            data = json.dumps(kwargs.get("data", {}), default=json_util.default)
+        if method in ("get", "delete"):
+            params = template.query_string(self.__encode_params(kwargs))
+        elif method == "post":
+            params = template.query
+            data = self.codec.encode(kwargs.get("data", {}))
+        elif method == "put":
+            params = template.query_string(self.__encode_params(kwargs))
+            data = self.codec.encode(kwargs.get("data", {}))
         else:
             raise ValueError('Method not allowed.')
-        params = requests.compat.urlencode(params)
-        response = method(url, headers=headers, params=params, data=data,
-                          proxies=self.proxies)
+        headers = template.headers
+        if self.compression is not None and data:
+            data, encoding = self.compression.compress(data)
+            if encoding is not None:
+                headers = dict(headers)
+                headers['content-encoding'] = encoding
+        return (method, template.url(slug_params), headers, params, data)
+
+    def _is_validated(self):
+        """Returns ``True`` when the API key of this client has already been
+        accepted by REST API in this process."""
+        return (self.base_url, self.api_key) in _validated_api_keys
+
+    def _set_validated(self):
+        """Remember for the whole process that REST API accepts the API key
+        of this client."""
+        _validated_api_keys.add((self.base_url, self.api_key))
+
+    def _check_status(self, status):
+        """Raise :class:`~mongolabclient.errors.InvalidAPIKey` if REST API
+        rejects the API key, or remember the key as valid once a request
+        succeeds."""
+        if status in (401, 403):
+            raise errors.InvalidAPIKey(self.api_key)
+        if status == 200:
+            self._set_validated()
+
+    def _timeout(self, deadline=None):
+        """Returns the ``(connect, read)`` timeout of the next HTTP request,
+        shortened to the time left until `deadline`, or ``None`` to wait
+        forever."""
+        timeout = [self.connect_timeout, self.read_timeout]
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise errors.ExecutionTimeout()
+            timeout = [remaining if t is None else min(t, remaining)
+                       for t in timeout]
+        if timeout == [None, None]:
+            return None
+        return tuple(timeout)
+
+    def _decode_response(self, status, content):
+        """Returns a :class:`dict` with the status and the decoded body of a
+        HTTP response."""
         return {
-            "status": response.status_code,
-            "result": json.loads(response.text,
-                                 object_hook=json_util.object_hook)
+            "status": status,
+            "result": self.codec.decode(content)
         }
 
-    def list_databases(self):
+
+class MongoLabClient(BaseClient):
+    """Instance class with the API key located at
+    https://mongolab.com/user?username=[username].
+
+    .. note::
+       The ``version`` parameter is optional, because it is planed for using in
+       future versions of REST API.
+
+    When your connection needs to set a proxy, you can to set an `str` with the
+    Proxy url to ``proxy_url`` parameter. If you don't set a ``proxy_url``,
+    then :class:`MongoLabClient` gets system proxy settings.
+
+    .. code-block:: python
+
+       >>> from mongolabclient import MongoLabClient
+       >>> MongoLabClient("MongoLabAPIKey", proxy_url="https://127.0.0.1:8000")
+       MongoLabClient('MongoLabAPIKey', 'v1')
+
+    All of HTTP requests are sent through a pool of keep-alive connections
+    (:class:`~mongolabclient.pool.ConnectionPool`) owned by the client. It can
+    be tuned with ``max_pool_size`` (connections kept per host), ``pool_block``
+    (wait for a free connection instead of opening a new one) and
+    ``max_idle_time`` (seconds before idle connections are closed).
+
+    .. code-block:: python
+
+       >>> MongoLabClient("MongoLabAPIKey", max_pool_size=50, pool_block=True)
+       MongoLabClient('MongoLabAPIKey', 'v1')
+
+    JSON is handled by :data:`~mongolabclient.codec.DEFAULT_CODEC` unless
+    other codec is given:
+
+    .. code-block:: python
+
+       >>> from mongolabclient.codec import JSONCodec
+       >>> MongoLabClient("MongoLabAPIKey", codec=JSONCodec())
+       MongoLabClient('MongoLabAPIKey', 'v1')
+
+    Each request is sent once unless a
+    :class:`~mongolabclient.retry.RetryPolicy` is given, which retries
+    transient errors of idempotent operations with exponential backoff:
+
+    .. code-block:: python
+
+       >>> from mongolabclient.retry import RetryPolicy
+       >>> MongoLabClient("MongoLabAPIKey", retry_policy=RetryPolicy())
+       MongoLabClient('MongoLabAPIKey', 'v1')
+
+    Requests can be kept under the quota of the API key with a
+    :class:`~mongolabclient.ratelimit.RateLimiter`, which makes threads wait
+    their turn instead of being throttled by REST API:
+
+    .. code-block:: python
+
+       >>> from mongolabclient.ratelimit import RateLimiter
+       >>> MongoLabClient("MongoLabAPIKey",
+       ...                rate_limiter=RateLimiter(rate=10, burst=20))
+       MongoLabClient('MongoLabAPIKey', 'v1')
+
+    With ``coalesce_reads=True``, identical GET requests sent at the same
+    time by many threads share a single HTTP request, and every caller gets
+    its own decoded copy of the response. Streamed responses are not
+    coalesced.
+
+    Each operation can be monitored by ``event_listeners``, a list of
+    :class:`~mongolabclient.monitoring.OperationListener`, which receive its
+    timings and sizes:
+
+    .. code-block:: python
+
+       >>> from mongolabclient.monitoring import MetricsListener
+       >>> metrics = MetricsListener()
+       >>> MongoLabClient("MongoLabAPIKey", event_listeners=[metrics])
+       MongoLabClient('MongoLabAPIKey', 'v1')
+
+    Requests can be sent to another server than REST API with ``base_url``,
+    like the in-memory :class:`~mongolabclient.testing.FakeMongoLabServer`
+    used by tests and benchmarks:
+
+    .. code-block:: python
+
+       >>> from mongolabclient.testing import FakeMongoLabServer
+       >>> server = FakeMongoLabServer().start()
+       >>> MongoLabClient("MongoLabAPIKey", base_url=server.base_url)
+       MongoLabClient('MongoLabAPIKey', 'v1')
+
+    On bandwidth-bound links, request bodies of 1KB or more can be
+    compressed and compressed responses requested with ``compression``:
+
+    .. code-block:: python
+
+       >>> client = MongoLabClient("MongoLabAPIKey", compression="gzip")
+       >>> client.compression.stats()["saved_bytes"]
+       0
+
+    ``connect_timeout`` and ``read_timeout`` are the seconds to wait for a
+    connection and for each read of a response (``None`` waits forever).
+    Every operation also accepts a ``deadline``, the :func:`time.time` when
+    it must be finished. When it is exceeded,
+    :class:`~mongolabclient.errors.ExecutionTimeout` is raised:
+
+    .. code-block:: python
+
+       >>> import time
+       >>> client = MongoLabClient("MongoLabAPIKey", read_timeout=30)
+       >>> client.list_documents("database", "collection",
+       ...                       deadline=time.time() + 0.5)
+       Traceback (most recent call last):
+       ...
+       ExecutionTimeout: Operation exceeded time limit
+
+    The API key is checked against REST API when the client is created, and
+    only once per process for the same key. With ``connect=False`` no request
+    is sent until the first operation, whose response validates the key:
+
+    .. code-block:: python
+
+       >>> client = MongoLabClient("MongoLabAPIKey", connect=False)
+       >>> client.list_databases()
+       Traceback (most recent call last):
+       ...
+       InvalidAPIKey: 'MongoLabAPIKey' is an invalid API key.
+
+    .. sds:: `proxy_handler` was deprecated on 1.3 version.
+    """
+
+    def __init__(self, api_key, version=settings.VERSION_1, proxy_url=None,
+        max_pool_size=pool.DEFAULT_MAX_POOL_SIZE, pool_block=False,
+        max_idle_time=None, codec=None, connect=True, retry_policy=None,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=None,
+        rate_limiter=None, coalesce_reads=False, event_listeners=None,
+        base_url=None, compression=None):
+        super(MongoLabClient, self).__init__(api_key, version, proxy_url,
+                                             codec, event_listeners, base_url,
+                                             compression, rate_limiter,
+                                             connect_timeout, read_timeout)
+        if not validators.check_api_key(self.api_key):
+            raise errors.BadAPIKeyFormat(self.api_key)
+        self.__pool = pool.ConnectionPool(max_pool_size, pool_block,
+                                          max_idle_time)
+        self.__retry_policy = retry_policy
+        self.__single_flight = _SingleFlight() if coalesce_reads else None
+        if connect:
+            self.validate_api_key()
+
+    def validate_api_key(self):
+        """Make a GET request to REST API base url
+        (https://api.mongolab.com/api/1) and raise
+        :class:`~mongolabclient.errors.InvalidAPIKey` if the API key is
+        rejected. No request is sent when the key has already been accepted in
+        this process.
+
+        .. versionadded:: 1.3
+        """
+        if self._is_validated():
+            return
+        r = self.__get_response(settings.VAL_API)
+        if r["status"] != 200:
+            raise errors.InvalidAPIKey(self.api_key)
+
+    @property
+    def pool(self):
+        """Instance of :class:`mongolabclient.pool.ConnectionPool` used for
+        all of HTTP requests.
+
+        .. versionadded: 1.3
+        """
+        return self.__pool
+
+    @property
+    def retry_policy(self):
+        """Instance of :class:`mongolabclient.retry.RetryPolicy` used to retry
+        failed requests, or ``None`` when requests are sent once.
+
+        .. versionadded: 1.3
+        """
+        return self.__retry_policy
+
+    def __send(self, method, url, deadline=None, **kwargs):
+        """Send a HTTP request through the pool, retrying it according to
+        :attr:`retry_policy`."""
+        def send():
+            limiter = self.rate_limiter
+            if limiter is None:
+                return self.__pool.request(method, url,
+                                           timeout=self._timeout(deadline),
+                                           **kwargs)
+            limiter.acquire(deadline)
+            try:
+                response = self.__pool.request(method, url,
+                                               timeout=self._timeout(deadline),
+                                               **kwargs)
+            except Exception:
+                limiter.release()
+                raise
+            if kwargs.get("stream"):
+                # The body is still being downloaded: keep the slot until
+                # the response is closed.
+                pool._on_close(response, limiter.release)
+            else:
+                limiter.release()
+            return response
+        try:
+            if self.__retry_policy is None:
+                return send()
+            return self.__retry_policy.send(method, send, deadline)
+        except requests.Timeout:
+            if deadline is not None:
+                raise errors.ExecutionTimeout()
+            raise
+
+    def __get_response(self, operation, slug_params={}, deadline=None,
+        **kwargs):
+        """Returns response of HTTP request depending the operation
+        selected.
+        """
+        monitor = self._monitor(operation, slug_params)
+        method, url, headers, params, data = self._prepare_request(operation,
+            slug_params, kwargs)
+
+        def fetch():
+            response = self.__send(method, url, deadline, headers=headers,
+                                   params=params, data=data,
+                                   proxies=self.proxies)
+            content = response.content
+            if self.compression is not None:
+                self.compression.record_response(len(content),
+                    self.__wire_size(response, len(content)))
+            return response.status_code, content
+
+        if monitor is not None:
+            monitor.start(method, url, params, data)
+        try:
+            if self.__single_flight is not None and method == "get":
+                status, content = self.__single_flight.call((url, params),
+                                                            fetch, deadline)
+            else:
+                status, content = fetch()
+            if monitor is not None:
+                monitor.received(status, content)
+            self._check_status(status)
+            response = self._decode_response(status, content)
+        except Exception as e:
+            if monitor is not None:
+                monitor.failed(e)
+            raise
+        if monitor is not None:
+            monitor.finish(response)
+        return response
+
+    def __get_stream(self, operation, slug_params={}, deadline=None,
+        **kwargs):
+        """Returns a generator with the elements of the JSON array returned by
+        the operation selected, decoded while the response body is being
+        downloaded. Raises an exception if REST API returns an error.
+        """
+        monitor = self._monitor(operation, slug_params)
+        method, url, headers, params, data = self._prepare_request(operation,
+            slug_params, kwargs)
+        if monitor is not None:
+            monitor.start(method, url, params, data)
+        try:
+            response = self.__send(method, url, deadline, headers=headers,
+                                   params=params, data=data,
+                                   proxies=self.proxies, stream=True)
+            if monitor is not None:
+                monitor.received(response.status_code)
+            if response.status_code != 200:
+                try:
+                    self._check_status(response.status_code)
+                    r = self._decode_response(response.status_code,
+                                              response.content)
+                finally:
+                    response.close()
+                raise Exception(r["result"]["message"])
+            self._check_status(response.status_code)
+        except Exception as e:
+            if monitor is not None:
+                monitor.failed(e)
+            raise
+        return self.__iter_response(response, deadline, monitor)
+
+    @staticmethod
+    def __iter_until(chunks, deadline):
+        """Yields the chunks of a response body until `deadline`."""
+        try:
+            for chunk in chunks:
+                if time.time() > deadline:
+                    raise errors.ExecutionTimeout()
+                yield chunk
+        except requests.ConnectionError:
+            if time.time() > deadline:
+                raise errors.ExecutionTimeout()
+            raise
+
+    @staticmethod
+    def __wire_size(response, size):
+        """Returns the bytes of a response body received over the network,
+        before it was decompressed."""
+        try:
+            return response.raw.tell()
+        except Exception:
+            return int(response.headers.get("content-length", size))
+
+    def __iter_recorded(self, chunks, response):
+        """Yields the chunks of a response body, counting them in
+        :attr:`compression` when the body is consumed or closed."""
+        size = 0
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+        finally:
+            self.compression.record_response(size,
+                self.__wire_size(response, size))
+
+    def __iter_response(self, response, deadline=None, monitor=None):
+        recorded = None
+        try:
+            chunks = response.iter_content(STREAM_CHUNK_SIZE)
+            if self.compression is not None:
+                chunks = recorded = self.__iter_recorded(chunks, response)
+            if deadline is not None:
+                chunks = self.__iter_until(chunks, deadline)
+            if monitor is None:
+                elements = self.codec.iterdecode(chunks)
+            else:
+                elements = monitor.iterdecode(self.codec.iterdecode, chunks)
+            for element in elements:
+                yield element
+        finally:
+            if recorded is not None:
+                recorded.close()
+            response.close()
+
+    def close(self):
+        """Close all of pooled connections. They will be reopened on the next
+        request.
+
+        .. versionadded: 1.3
+        """
+        self.__pool.close()
+
+    def list_databases(self, deadline=None):
         """Returns a list of databases name of your account.
 
         .. code-block:: bash
 
            GET /databases
         """
-        r = self.__get_response(settings.LST_DBS)
+        r = self.__get_response(settings.LST_DBS, deadline=deadline)
         if r["status"] == 200:
             return r["result"]
         raise Exception(r["result"]["message"])
 
-    def list_collections(self, database):
+    def list_collections(self, database, deadline=None):
         """Returns a list of collections name of database selected.
 
         .. code-block:: bash
 
            GET /databases/{database}/collections
         """
-        r = self.__get_response(settings.LST_COLS, {"db": database})
+        r = self.__get_response(settings.LST_COLS, {"db": database},
+            deadline=deadline)
         if r["status"] == 200:
             return r["result"]
         raise Exception(r["result"]["message"])
 
-    def list_documents(self, database, collection, **kwargs):
+    def list_documents(self, database, collection, stream=False, deadline=None,
+        **kwargs):
         """Returns a list of dicts with the matched documents with the query.
+        When ``count`` is ``True``, the number of matched documents is counted
+        by REST API and returned instead.
+
+        When ``stream`` is ``True``, returns a generator instead of a list.
+        The response body is read in chunks and every document is yielded as
+        soon as it has been parsed, so the first document is available while
+        the rest of them is still downloading.
 
         .. code-block:: bash
 
            GET /databases/{database}/collections/{collection}
+
+        .. versionchanged:: 1.3
+           Added ``stream`` and ``deadline`` parameters.
         """
+        if stream and (kwargs.get("count") or kwargs.get("find_one")):
+            raise ValueError("stream can't be used with count or find_one")
         kwargs = validators.check_list_documents_params(**kwargs)
+        if stream:
+            return self.__get_stream(settings.LST_DOCS,
+                {"db": database, "col": collection}, deadline, **kwargs)
         r = self.__get_response(settings.LST_DOCS,
-            {"db": database, "col": collection}, **kwargs)
+            {"db": database, "col": collection}, deadline, **kwargs)
         if r["status"] == 200:
             return r["result"]
         raise Exception(r["result"]["message"])
 
-    def insert_documents(self, database, collection, doc_or_docs):
+    def insert_documents(self, database, collection, doc_or_docs,
+        deadline=None):
         """Insert a document or documents into collection.
 
         .. code-block:: bash
@@ -164,13 +667,13 @@ class MongoLabClient(object):
         """
         validators.check_documents_to_insert(doc_or_docs)
         r = self.__get_response(settings.INS_DOCS,
-            {"db": database, "col": collection}, data=doc_or_docs)
+            {"db": database, "col": collection}, deadline, data=doc_or_docs)
         if r["status"] == 200:
             return r["result"]
         raise Exception(r["result"]["message"])
 
     def update_documents(self, database, collection, spec, doc_or_docs, upsert,
-        multi):
+        multi, deadline=None):
         """Update a document or documents that matches with query. It is
         posible ``upsert`` data.
 
@@ -180,7 +683,7 @@ class MongoLabClient(object):
         """
         validators.check_document_to_update(doc_or_docs)
         r = self.__get_response(settings.UPD_DOCS,
-            {"db": database, "col": collection},
+            {"db": database, "col": collection}, deadline,
             data=doc_or_docs, q=spec, m=multi, u=upsert)
         if r["status"] == 200:
             if r["result"]["error"]:
@@ -189,7 +692,7 @@ class MongoLabClient(object):
         raise Exception(r["result"]["message"])
 
     def delete_replace_documents(self, database, collection, spec={},
-        documents=[]):
+        documents=[], deadline=None):
         """Delete o replace a document or documents that matches with query.
 
         .. code-block:: bash
@@ -197,12 +700,13 @@ class MongoLabClient(object):
            PUT /databases/{database}/collections/{collection}
         """
         r = self.__get_response(settings.DEL_REP_DOCS,
-            {"db": database, "col": collection}, data=documents, q=spec)
+            {"db": database, "col": collection}, deadline, data=documents,
+            q=spec)
         if r["status"] == 200:
             return r["result"]["n"]
         raise Exception(r["result"]["message"])
 
-    def view_document(self, database, collection, _id):
+    def view_document(self, database, collection, _id, deadline=None):
         """Returns a dict with document matched with this ``_id``.
 
         .. code-block:: bash
@@ -210,12 +714,13 @@ class MongoLabClient(object):
            GET /databases/{database}/collections/{collection}/{_id}
         """
         r = self.__get_response(settings.VIW_DOC,
-            {"db": database, "col": collection, "id": str(_id)})
+            {"db": database, "col": collection, "id": str(_id)}, deadline)
         if r["status"] == 200:
             return r["result"]
         raise Exception(r["result"]["message"])
 
-    def update_document(self, database, collection, _id, document):
+    def update_document(self, database, collection, _id, document,
+        deadline=None):
         """Update a document matched with this ``_id``, returns number of
         documents affected.
 
@@ -224,13 +729,13 @@ class MongoLabClient(object):
            PUT /databases/{database}/collections/{collection}/{_id}
         """
         r = self.__get_response(settings.UPD_DOC,
-            {"db": database, "col": collection, "id": str(_id)},
+            {"db": database, "col": collection, "id": str(_id)}, deadline,
             data=document)
         if r["status"] == 200:
             return r["result"]
         raise Exception(r["result"]["message"])
 
-    def delete_document(self, database, collection, _id):
+    def delete_document(self, database, collection, _id, deadline=None):
         """Delete a document matched with this ``_id``, returns a :class:`dict`
         with deleted document or a list of dicts with deleted documents.
 
@@ -239,12 +744,12 @@ class MongoLabClient(object):
            DELETE /databases/{database}/collections/{collection}/{_id}
         """
         r = self.__get_response(settings.DEL_DOC,
-            {"db": database, "col": collection, "id": str(_id)})
+            {"db": database, "col": collection, "id": str(_id)}, deadline)
         if r["status"] == 200:
             return r["result"]
         raise Exception(r["result"]["message"])
 
-    def run_command(self, database, command):
+    def run_command(self, database, command, deadline=None):
         """Run a database-collection level command.
 
         .. code-block:: bash
@@ -252,7 +757,7 @@ class MongoLabClient(object):
            POST /databases/{database}/runCommand
         """
         r = self.__get_response(settings.RUN_DB_COL_LVL_CMD, {"db": database},
-            data=command)
+            deadline, data=command)
         if r["status"] == 200:
             return r["result"]
         raise Exception(r["result"]["message"])
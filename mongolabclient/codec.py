@@ -0,0 +1,194 @@
+# -*- coding: utf-8 *-*
+"""Pluggable JSON codecs used to encode request bodies and to decode responses
+of `MongoLab REST API`_.
+
+A codec is any object with an ``encode(obj)`` method, returning a JSON
+:class:`str`, a ``decode(data)`` method, accepting the raw bytes of a
+response body, and an ``iterdecode(chunks)`` method, decoding a JSON array
+incrementally from an iterable of bytes. All of them must handle
+`MongoDB Extended JSON`_ types like ``ObjectId`` or ``datetime``.
+
+.. _MongoLab REST API: http://support.mongolab.com/entries/20433053-rest-api-for-mongodb
+.. _MongoDB Extended JSON: http://docs.mongodb.org/manual/reference/mongodb-extended-json/"""
+
+import codecs
+import re
+try:
+    import simplejson as json
+except ImportError:
+    import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from bson import json_util
+from bson.objectid import ObjectId
+
+_MARKER = b'"$'
+
+_CONTAINERS = frozenset([dict, list])
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _object_hook(dct):
+    """Converts `dct` into an ObjectId or, when its first key starts with
+    ``$`` as all of Extended JSON types do, with
+    :func:`bson.json_util.object_hook`."""
+    if "$oid" in dct and len(dct) == 1:
+        return ObjectId(dct["$oid"])
+    for key in dct:
+        if key[:1] == "$":
+            return json_util.object_hook(dct)
+        break
+    return dct
+
+
+def _convert(value):
+    """Converts in place the Extended JSON objects nested in `value`, a
+    value parsed without object hook, with :func:`_object_hook`. Returns
+    the converted value."""
+    kind = type(value)
+    if kind is dict:
+        for key, item in value.items():
+            if type(item) in _CONTAINERS:
+                value[key] = _convert(item)
+        for key in value:
+            if key[:1] == "$":
+                return _object_hook(value)
+            break
+    elif kind is list:
+        for index, item in enumerate(value):
+            if type(item) in _CONTAINERS:
+                value[index] = _convert(item)
+    return value
+
+
+def _iter_array(chunks, raw_decode):
+    """Yields each element of a JSON array received as chunks of UTF-8 bytes,
+    as soon as the element is complete. Every element is parsed once by
+    `raw_decode`, a :meth:`json.JSONDecoder.raw_decode` method; when an
+    element is still incomplete, it is tried again once the buffered text has
+    doubled, so big elements are not parsed over and over.
+    """
+    chunks = iter(chunks)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = u""
+    pos = 0
+    state = "start"
+    wanted = 0
+    more = True
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos < len(buf):
+            if state == "start":
+                if buf[pos] != u"[":
+                    raise ValueError("Expected a JSON array")
+                pos += 1
+                state = "first"
+                continue
+            if state == "after":
+                pos += 1
+                if buf[pos - 1] == u",":
+                    state = "value"
+                    continue
+                if buf[pos - 1] == u"]":
+                    return
+                raise ValueError("Expected ',' or ']' at %d" % pos)
+            if state == "first" and buf[pos] == u"]":
+                return
+            if len(buf) - pos > wanted or not more:
+                try:
+                    value, end = raw_decode(buf, pos)
+                except ValueError:
+                    if not more:
+                        raise
+                    wanted = 2 * (len(buf) - pos)
+                else:
+                    if end < len(buf) or not more:
+                        pos = end
+                        state = "after"
+                        wanted = 0
+                        yield value
+                        continue
+                    wanted = len(buf) - pos
+        if not more:
+            raise ValueError("Unexpected end of JSON array")
+        chunk = next(chunks, None)
+        if chunk is None:
+            more = False
+            chunk = b""
+        buf = buf[pos:] + decoder.decode(chunk, not more)
+        pos = 0
+
+
+class JSONCodec(object):
+    """Codec using :mod:`json` (or simplejson_ when it is installed) with the
+    hooks of :mod:`bson.json_util` for every object. This is the behaviour of
+    previous versions.
+
+    .. _simplejson: http://pypi.python.org/pypi/simplejson
+
+    .. versionadded:: 1.3
+    """
+
+    def encode(self, obj):
+        """Returns a JSON :class:`str` of `obj`."""
+        return json.dumps(obj, default=json_util.default)
+
+    def decode(self, data):
+        """Returns the value of a JSON document."""
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        return json.loads(data, object_hook=json_util.object_hook)
+
+    def iterdecode(self, chunks):
+        """Returns a generator with the values of a JSON array whose bytes are
+        received in `chunks`, yielding each one as soon as it is complete."""
+        decoder = json.JSONDecoder(object_hook=json_util.object_hook)
+        return _iter_array(chunks, decoder.raw_decode)
+
+
+class FastJSONCodec(JSONCodec):
+    """Codec parsing the raw bytes of response bodies directly.
+
+    When orjson_ is installed, bodies are parsed by it without any object
+    hook, and then only the objects whose first key starts with ``$`` are
+    converted, which is skipped for bodies without a ``"$`` marker. Without
+    orjson, :mod:`json` calls a hook building ObjectIds directly, since it
+    is faster than walking the parsed body in Python. Other objects whose
+    first key starts with ``$`` go through :func:`bson.json_util.object_hook`.
+    That path is not faster than :class:`JSONCodec`, so it is only the
+    default codec when orjson is installed.
+
+    .. _orjson: http://pypi.python.org/pypi/orjson
+
+    .. versionadded:: 1.3
+    """
+
+    def decode(self, data):
+        """Returns the value of a JSON document."""
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        if orjson is None:
+            if _MARKER not in data:
+                return json.loads(data)
+            return json.loads(data, object_hook=_object_hook)
+        value = orjson.loads(data)
+        if _MARKER not in data:
+            return value
+        return _convert(value)
+
+    def iterdecode(self, chunks):
+        """Returns a generator with the values of a JSON array whose bytes are
+        received in `chunks`, yielding each one as soon as it is complete."""
+        decoder = json.JSONDecoder(object_hook=_object_hook)
+        return _iter_array(chunks, decoder.raw_decode)
+
+
+DEFAULT_CODEC = FastJSONCodec() if orjson is not None else JSONCodec()
+"""Codec used by clients when no ``codec`` is given:
+:class:`FastJSONCodec` when orjson is installed, :class:`JSONCodec`
+otherwise."""
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 *-*
+"""Utility functions and definitions for Python 2 and Python 3
+compatibility."""
+
+import sys
+
+PY3 = sys.version_info[0] == 3
+
+if PY3:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    import queue
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qsl, quote_plus, unquote, urlencode, \
+        urlparse
+
+    string_type = str
+    integer_types = (int,)
+
+    def iteritems(d):
+        return iter(d.items())
+else:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    import Queue as queue
+    from SocketServer import ThreadingMixIn
+    from urllib import quote_plus, unquote, urlencode
+    from urlparse import parse_qsl, urlparse
+
+    string_type = basestring
+    integer_types = (int, long)
+
+    def iteritems(d):
+        return d.iteritems()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 *-*
+"""Compression of the bodies of HTTP requests and responses exchanged with
+`MongoLab REST API`_.
+
+gzip and deflate are always available; br requires the brotli_ package.
+
+.. _MongoLab REST API: http://support.mongolab.com/entries/20433053-rest-api-for-mongodb
+.. _brotli: http://pypi.python.org/pypi/Brotli"""
+
+import threading
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from mongolabclient import compat
+
+ENCODINGS = ("br", "gzip", "deflate")
+"""Supported content encodings."""
+
+DEFAULT_THRESHOLD = 1024
+"""Minimum size in bytes of the request bodies compressed by default."""
+
+
+def compress(data, encoding, level=6):
+    """Returns `data` compressed with `encoding`, one of
+    :data:`ENCODINGS`."""
+    if encoding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED,
+                                      16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    if encoding == "deflate":
+        return zlib.compress(data, level)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=min(level, 11))
+    raise ValueError("unsupported content encoding %r" % encoding)
+
+
+def decompress(data, encoding):
+    """Returns `data` decompressed with `encoding`, one of
+    :data:`ENCODINGS`."""
+    if encoding == "gzip":
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompress(data)
+    if encoding == "br" and brotli is not None:
+        return brotli.decompress(data)
+    raise ValueError("unsupported content encoding %r" % encoding)
+
+
+class Compression(object):
+    """Compression settings of a
+    :class:`~mongolabclient.client.MongoLabClient`.
+
+    The encodings are sent in the ``Accept-Encoding`` header of every
+    request, so REST API can compress responses, which are decompressed
+    while they are downloaded. Request bodies of `threshold` bytes or more
+    are compressed with the first encoding.
+
+    :Parameters:
+        - `encodings` (optional): an encoding or a list of encodings of
+          :data:`ENCODINGS`, in order of preference
+        - `threshold` (optional): minimum size in bytes of the request bodies
+          compressed
+        - `level` (optional): compression level, from ``1`` (fastest) to
+          ``9`` (smallest)
+
+    .. code-block:: python
+
+       >>> from pymongolab import MongoClient
+       >>> from mongolabclient.compression import Compression
+       >>> compression = Compression("gzip", threshold=4096)
+       >>> con = MongoClient("MongoLabAPIKey", compression=compression)
+       >>> con.database.collection.insert(documents)
+       >>> compression.stats()
+       {'compressed_requests': 1, 'request_bytes': 1205332,
+       'request_wire_bytes': 153220, 'response_bytes': 42,
+       'response_wire_bytes': 42, 'saved_bytes': 1052112}
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, encodings=("gzip", "deflate"),
+        threshold=DEFAULT_THRESHOLD, level=6):
+        if isinstance(encodings, compat.string_type):
+            encodings = [encodings]
+        encodings = tuple(encodings)
+        if not encodings:
+            raise ValueError("encodings must not be empty")
+        for encoding in encodings:
+            if encoding not in ENCODINGS:
+                raise ValueError("unsupported content encoding %r" % encoding)
+            if encoding == "br" and brotli is None:
+                raise ValueError("br encoding requires the brotli package")
+        self.encodings = encodings
+        self.threshold = threshold
+        self.level = level
+        self.accept_encoding = ", ".join(encodings)
+        self.__lock = threading.Lock()
+        self.__compressed = 0
+        self.__request_bytes = 0
+        self.__request_wire_bytes = 0
+        self.__response_bytes = 0
+        self.__response_wire_bytes = 0
+
+    def compress(self, data):
+        """Returns a tuple ``(body, encoding)`` with the request body `data`
+        compressed, or not compressed and ``None`` when it is smaller than
+        :attr:`threshold`."""
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        size = len(data)
+        encoding = None
+        if size >= self.threshold:
+            encoding = self.encodings[0]
+            data = compress(data, encoding, self.level)
+        with self.__lock:
+            if encoding is not None:
+                self.__compressed += 1
+            self.__request_bytes += size
+            self.__request_wire_bytes += len(data)
+        return data, encoding
+
+    def record_response(self, size, wire_size):
+        """Count a response body of `size` bytes, received as `wire_size`
+        bytes."""
+        with self.__lock:
+            self.__response_bytes += size
+            self.__response_wire_bytes += wire_size
+
+    def stats(self):
+        """Returns a dict with the counters of bodies sent and received:
+        ``compressed_requests``, ``request_bytes`` and ``response_bytes``
+        (uncompressed sizes), ``request_wire_bytes`` and
+        ``response_wire_bytes`` (sizes sent over the network) and
+        ``saved_bytes``."""
+        with self.__lock:
+            return {"compressed_requests": self.__compressed,
+                    "request_bytes": self.__request_bytes,
+                    "request_wire_bytes": self.__request_wire_bytes,
+                    "response_bytes": self.__response_bytes,
+                    "response_wire_bytes": self.__response_wire_bytes,
+                    "saved_bytes": self.__request_bytes +
+                    self.__response_bytes - self.__request_wire_bytes -
+                    self.__response_wire_bytes}
@@ -38,3 +38,21 @@ class InvalidUpdateOperator(Exception):
     def __init__(self, operator):
         message = "%r is an invalid update operator." % operator
         super(InvalidUpdateOperator, self).__init__(message)
+
+
+class InvalidOperation(Exception):
+    """An exception that will raise when a client attempts to perform an
+    invalid operation, like to modify a cursor that has already been used."""
+
+    def __init__(self, message):
+        super(InvalidOperation, self).__init__(message)
+
+
+class ExecutionTimeout(Exception):
+    """An exception that will raise when an operation exceeds its time limit.
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, message="Operation exceeded time limit"):
+        super(ExecutionTimeout, self).__init__(message)
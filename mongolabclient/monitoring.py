@@ -0,0 +1,477 @@
+# -*- coding: utf-8 *-*
+"""Monitoring of the operations sent to `MongoLab REST API`_, similar to the
+command monitoring of PyMongo.
+
+Listeners are subclasses of :class:`OperationListener` that receive an event
+when each operation starts, succeeds or fails. They are registered for every
+client of the process with :func:`register`, or for a single client with the
+``event_listeners`` parameter of
+:class:`~mongolabclient.client.MongoLabClient`:
+
+.. code-block:: python
+
+   >>> from mongolabclient import MongoLabClient, monitoring
+   >>> class SlowOperations(monitoring.OperationListener):
+   ...     def succeeded(self, event):
+   ...         if event.duration > 1:
+   ...             print event.operation, event.collection, event.duration
+   >>> monitoring.register(SlowOperations())
+
+:class:`MetricsListener` keeps histograms of the timings and sizes of every
+operation, which can be exported as a dict.
+
+When no listener is registered, operations are not timed at all.
+
+.. _MongoLab REST API: http://support.mongolab.com/entries/20433053-rest-api-for-mongodb"""
+
+from bisect import bisect_left
+import itertools
+import threading
+import time
+
+_LISTENERS = []
+
+_operation_ids = itertools.count(1)
+
+DURATION_BOUNDS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""Default upper bounds (in seconds) of the buckets of histograms of
+timings."""
+
+SIZE_BOUNDS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+               16777216)
+"""Default upper bounds (in bytes) of the buckets of histograms of sizes."""
+
+
+def register(listener):
+    """Register a :class:`OperationListener` for the operations of every
+    client of this process.
+
+    .. versionadded:: 1.3
+    """
+    if not isinstance(listener, OperationListener):
+        raise TypeError("listener must be an instance of OperationListener")
+    _LISTENERS.append(listener)
+
+
+def unregister(listener):
+    """Remove a listener registered with :func:`register`.
+
+    .. versionadded:: 1.3
+    """
+    _LISTENERS.remove(listener)
+
+
+class OperationListener(object):
+    """Base class for listeners of the operations sent to REST API. Every
+    method does nothing by default, so subclasses only override the events
+    they need.
+
+    Listeners are called synchronously by the thread sending the operation,
+    so they must be fast. Exceptions raised by a listener are ignored.
+
+    .. versionadded:: 1.3
+    """
+
+    def started(self, event):
+        """Called with an :class:`OperationStartedEvent` before the HTTP
+        request of an operation is sent."""
+
+    def succeeded(self, event):
+        """Called with an :class:`OperationSucceededEvent` when an operation
+        finishes."""
+
+    def failed(self, event):
+        """Called with an :class:`OperationFailedEvent` when an operation
+        raises an exception or gets a HTTP error status."""
+
+
+class _OperationEvent(object):
+    """Fields shared by all of the events of an operation."""
+
+    __slots__ = ("operation", "method", "database", "collection",
+                 "operation_id", "request_bytes")
+
+    def __init__(self, operation, method, database, collection, operation_id,
+        request_bytes):
+        self.operation = operation
+        self.method = method
+        self.database = database
+        self.collection = collection
+        self.operation_id = operation_id
+        self.request_bytes = request_bytes
+
+    def __repr__(self):
+        return "<%s %s %s.%s #%d>" % (self.__class__.__name__,
+            self.operation, self.database, self.collection, self.operation_id)
+
+
+class OperationStartedEvent(_OperationEvent):
+    """Event published before the HTTP request of an operation is sent.
+
+    :Attributes:
+        - `operation`: pseudo-code of the operation, one of the constants of
+          :mod:`mongolabclient.settings` (e.g. ``"list-documents"``)
+        - `method`: HTTP method
+        - `database`: database name, or ``None``
+        - `collection`: collection name, or ``None``
+        - `operation_id`: number identifying the operation in this process,
+          shared by all of its events
+        - `request_bytes`: size of the url, query string and body of the
+          request
+
+    .. versionadded:: 1.3
+    """
+
+    __slots__ = ()
+
+
+class _FinishedEvent(_OperationEvent):
+    """Fields of the events published when an operation finishes."""
+
+    __slots__ = ("status", "response_bytes", "duration", "encode_time",
+                 "network_time", "decode_time")
+
+    def __init__(self, operation, method, database, collection, operation_id,
+        request_bytes, status, response_bytes, encode_time, network_time,
+        decode_time):
+        super(_FinishedEvent, self).__init__(operation, method, database,
+            collection, operation_id, request_bytes)
+        self.status = status
+        self.response_bytes = response_bytes
+        self.encode_time = encode_time
+        self.network_time = network_time
+        self.decode_time = decode_time
+        self.duration = encode_time + network_time + decode_time
+
+
+class OperationSucceededEvent(_FinishedEvent):
+    """Event published when an operation finishes with a successful HTTP
+    status. Besides the attributes of :class:`OperationStartedEvent`:
+
+    :Attributes:
+        - `status`: HTTP status of the response
+        - `response_bytes`: size of the response body
+        - `encode_time`: seconds spent building the request
+        - `network_time`: seconds spent sending the request and receiving the
+          response, including retries and waits of the rate limiter
+        - `decode_time`: seconds spent decoding the response
+        - `duration`: sum of the three timings
+
+    .. versionadded:: 1.3
+    """
+
+    __slots__ = ()
+
+
+class OperationFailedEvent(_FinishedEvent):
+    """Event published when an operation raises an exception or gets a HTTP
+    error status. It has the attributes of :class:`OperationSucceededEvent`,
+    where `status` and `response_bytes` are ``None`` when no response was
+    received, and:
+
+    :Attributes:
+        - `failure`: the exception raised, or the decoded body of the HTTP
+          error response
+
+    .. versionadded:: 1.3
+    """
+
+    __slots__ = ("failure",)
+
+    def __init__(self, *args, **kwargs):
+        self.failure = kwargs.pop("failure")
+        super(OperationFailedEvent, self).__init__(*args, **kwargs)
+
+
+class Histogram(object):
+    """Thread-safe histogram of values counted in buckets with the upper
+    `bounds` given, plus one bucket for greater values.
+
+    .. code-block:: python
+
+       >>> from mongolabclient.monitoring import Histogram
+       >>> histogram = Histogram((0.1, 1, 10))
+       >>> for value in (0.05, 0.5, 0.7, 20):
+       ...     histogram.record(value)
+       >>> histogram.percentile(50)
+       1
+       >>> histogram.export()
+       {'count': 4, 'sum': 21.25, 'min': 0.05, 'max': 20,
+       'buckets': [(0.1, 1), (1, 2), (10, 0), (None, 1)]}
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, bounds=DURATION_BOUNDS):
+        self.bounds = tuple(sorted(bounds))
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Remove all of recorded values."""
+        with self.__lock:
+            self.__counts = [0] * (len(self.bounds) + 1)
+            self.__count = 0
+            self.__sum = 0
+            self.__min = None
+            self.__max = None
+
+    def record(self, value):
+        """Add a value to the histogram."""
+        index = bisect_left(self.bounds, value)
+        with self.__lock:
+            self.__counts[index] += 1
+            self.__count += 1
+            self.__sum += value
+            if self.__min is None or value < self.__min:
+                self.__min = value
+            if self.__max is None or value > self.__max:
+                self.__max = value
+
+    @property
+    def count(self):
+        """Number of recorded values."""
+        return self.__count
+
+    def percentile(self, percent):
+        """Returns the upper bound of the bucket holding the given percentile
+        (e.g. ``99``), the maximum value when it is in the last bucket, or
+        ``None`` when no value has been recorded."""
+        with self.__lock:
+            if not self.__count:
+                return None
+            rank = self.__count * percent / 100.0
+            seen = 0
+            for index, count in enumerate(self.__counts):
+                seen += count
+                if count and seen >= rank:
+                    if index < len(self.bounds):
+                        return min(self.bounds[index], self.__max)
+                    return self.__max
+            return self.__max
+
+    def export(self):
+        """Returns a dict with the ``count``, ``sum``, ``min`` and ``max`` of
+        the recorded values and the ``buckets``, a list of ``(bound,
+        count)`` tuples where the bound of the last bucket is ``None``."""
+        with self.__lock:
+            bounds = self.bounds + (None,)
+            return {"count": self.__count, "sum": self.__sum,
+                    "min": self.__min, "max": self.__max,
+                    "buckets": list(zip(bounds, self.__counts))}
+
+
+class MetricsListener(OperationListener):
+    """Listener keeping in-process metrics of every operation: counters of
+    succeeded and failed operations and a :class:`Histogram` for each timing
+    and size of their events.
+
+    .. code-block:: python
+
+       >>> from mongolabclient import MongoLabClient
+       >>> from mongolabclient.monitoring import MetricsListener
+       >>> metrics = MetricsListener()
+       >>> client = MongoLabClient("MongoLabAPIKey", event_listeners=[metrics])
+       >>> client.list_documents("database", "collection")
+       >>> metrics.histogram("list-documents", "duration").percentile(99)
+       0.25
+       >>> metrics.export()["list-documents"]["succeeded"]
+       1
+
+    .. versionadded:: 1.3
+    """
+
+    TIMINGS = ("duration", "encode_time", "network_time", "decode_time")
+    """Timing attributes of events recorded in histograms."""
+
+    SIZES = ("request_bytes", "response_bytes")
+    """Size attributes of events recorded in histograms."""
+
+    def __init__(self, duration_bounds=DURATION_BOUNDS,
+        size_bounds=SIZE_BOUNDS):
+        self.duration_bounds = duration_bounds
+        self.size_bounds = size_bounds
+        self.__lock = threading.Lock()
+        self.__operations = {}
+
+    def __metrics(self, operation):
+        metrics = self.__operations.get(operation)
+        if metrics is None:
+            with self.__lock:
+                metrics = self.__operations.get(operation)
+                if metrics is None:
+                    metrics = {"succeeded": 0, "failed": 0}
+                    for name in self.TIMINGS:
+                        metrics[name] = Histogram(self.duration_bounds)
+                    for name in self.SIZES:
+                        metrics[name] = Histogram(self.size_bounds)
+                    self.__operations[operation] = metrics
+        return metrics
+
+    def __record(self, event, result):
+        metrics = self.__metrics(event.operation)
+        with self.__lock:
+            metrics[result] += 1
+        for name in self.TIMINGS + self.SIZES:
+            value = getattr(event, name)
+            if value is not None:
+                metrics[name].record(value)
+
+    def succeeded(self, event):
+        self.__record(event, "succeeded")
+
+    def failed(self, event):
+        self.__record(event, "failed")
+
+    def histogram(self, operation, name):
+        """Returns the :class:`Histogram` of the attribute `name` (e.g.
+        ``"duration"`` or ``"response_bytes"``) of the events of
+        `operation`."""
+        return self.__metrics(operation)[name]
+
+    def export(self):
+        """Returns a dict with the metrics of each operation, which are dicts
+        with the ``succeeded`` and ``failed`` counters and the export of each
+        histogram (see :meth:`Histogram.export`)."""
+        with self.__lock:
+            operations = list(self.__operations.items())
+        exported = {}
+        for operation, metrics in operations:
+            exported[operation] = dict(
+                (name, value.export() if isinstance(value, Histogram)
+                 else value) for name, value in metrics.items())
+        return exported
+
+    def reset(self):
+        """Remove all of the metrics."""
+        with self.__lock:
+            self.__operations = {}
+
+
+class _Operation(object):
+    """Timings of an operation being sent, publishing its events to
+    `listeners`.
+
+    The time from its creation to :meth:`start` is spent encoding the
+    request, from :meth:`start` to :meth:`received` in network and from
+    there to :meth:`succeeded` or :meth:`failed` decoding the response.
+    """
+
+    __slots__ = ("listeners", "operation", "method", "database",
+                 "collection", "operation_id", "request_bytes", "status",
+                 "response_bytes", "encode_time", "network_time",
+                 "decode_time", "__mark", "__finished")
+
+    def __init__(self, listeners, operation, slug_params):
+        self.listeners = listeners
+        self.operation = operation
+        self.method = None
+        self.database = slug_params.get("db")
+        self.collection = slug_params.get("col")
+        self.operation_id = next(_operation_ids)
+        self.request_bytes = 0
+        self.status = None
+        self.response_bytes = None
+        self.encode_time = 0.0
+        self.network_time = 0.0
+        self.decode_time = 0.0
+        self.__mark = time.time()
+        self.__finished = False
+
+    def __lap(self):
+        now = time.time()
+        elapsed = now - self.__mark
+        self.__mark = now
+        return elapsed
+
+    def __publish(self, name, event):
+        for listener in self.listeners:
+            try:
+                getattr(listener, name)(event)
+            except Exception:
+                # A broken listener must not break the operation it watches.
+                pass
+
+    def __event(self, cls, **kwargs):
+        return cls(self.operation, self.method, self.database,
+                   self.collection, self.operation_id, self.request_bytes,
+                   self.status, self.response_bytes, self.encode_time,
+                   self.network_time, self.decode_time, **kwargs)
+
+    def start(self, method, url, params, data):
+        """The request is encoded and about to be sent."""
+        self.method = method
+        self.request_bytes = len(url) + len(params) + len(data or "") + 1
+        self.encode_time = self.__lap()
+        self.__publish("started", OperationStartedEvent(self.operation,
+            method, self.database, self.collection, self.operation_id,
+            self.request_bytes))
+
+    def received(self, status, content=None):
+        """The response is received, or only its headers when the body is
+        streamed."""
+        self.status = status
+        if content is not None:
+            self.response_bytes = len(content)
+        self.network_time += self.__lap()
+
+    def finish(self, response):
+        """The response has been decoded into `response`, a dict with its
+        ``status`` and ``result``."""
+        if response["status"] >= 400:
+            self.failed(response["result"])
+        else:
+            self.succeeded()
+
+    def succeeded(self):
+        if self.__finished:
+            return
+        self.__finished = True
+        self.decode_time += self.__lap()
+        self.__publish("succeeded", self.__event(OperationSucceededEvent))
+
+    def failed(self, failure):
+        if self.__finished:
+            return
+        self.__finished = True
+        if self.status is None:
+            self.network_time += self.__lap()
+        else:
+            self.decode_time += self.__lap()
+        self.__publish("failed", self.__event(OperationFailedEvent,
+                                              failure=failure))
+
+    def __read(self, chunks):
+        chunks = iter(chunks)
+        while True:
+            self.decode_time += self.__lap()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                self.network_time += self.__lap()
+                return
+            self.network_time += self.__lap()
+            self.response_bytes = (self.response_bytes or 0) + len(chunk)
+            yield chunk
+
+    def iterdecode(self, iterdecode, chunks):
+        """Yields the elements decoded from a streamed response body by
+        `iterdecode`, splitting the time spent reading `chunks` and decoding
+        them. The operation succeeds once the body is consumed or the
+        generator is closed."""
+        self.__lap()
+        elements = iterdecode(self.__read(chunks))
+        try:
+            for element in elements:
+                self.decode_time += self.__lap()
+                yield element
+                self.__lap()
+        except GeneratorExit:
+            self.__lap()
+            raise
+        except Exception as e:
+            self.failed(e)
+            raise
+        finally:
+            self.succeeded()
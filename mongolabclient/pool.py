@@ -0,0 +1,128 @@
+# -*- coding: utf-8 *-*
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_MAX_POOL_SIZE = 10
+"""Default maximum number of keep-alive connections kept per host."""
+
+
+def _on_close(response, callback):
+    """Calls `callback` once, when `response` is closed."""
+    close = response.close
+    closed = []
+
+    def on_close():
+        try:
+            close()
+        finally:
+            if not closed:
+                closed.append(True)
+                callback()
+    response.close = on_close
+
+
+class ConnectionPool(object):
+    """Thread-safe pool of keep-alive HTTP connections shared by every request
+    made through a :class:`~mongolabclient.client.MongoLabClient`.
+
+    The pool wraps a :class:`requests.Session`, so the TCP+TLS handshake with
+    the REST API is paid once per connection instead of once per operation.
+
+    :Parameters:
+        - `max_size` (optional): maximum number of connections kept open per
+          host.
+        - `block` (optional): when ``True``, a request waits for a free
+          connection once ``max_size`` connections are in use. When ``False``
+          an extra connection is opened and discarded after use.
+        - `max_idle_time` (optional): number of seconds the pool may stay
+          unused before its connections are closed and reopened on demand.
+          ``None`` keeps connections open forever. A streamed response keeps
+          the pool in use until it is closed.
+
+    .. code-block:: python
+
+       >>> from mongolabclient.pool import ConnectionPool
+       >>> pool = ConnectionPool(max_size=20, block=True, max_idle_time=60)
+       >>> pool.request("get", "https://api.mongolab.com/api/1/databases",
+       ...              params={"apiKey": "MongoLabAPIKey"})
+       <Response [200]>
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_POOL_SIZE, block=False,
+        max_idle_time=None):
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+        if max_idle_time is not None and max_idle_time <= 0:
+            raise ValueError("max_idle_time must be greater than 0")
+        self.max_size = max_size
+        self.block = block
+        self.max_idle_time = max_idle_time
+        self.__lock = threading.Lock()
+        self.__session = None
+        self.__in_use = 0
+        self.__last_used = time.time()
+
+    def __new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.max_size,
+                              pool_block=self.block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def __checkout(self):
+        """Returns the shared session, replacing it when it has been idle for
+        longer than ``max_idle_time``."""
+        with self.__lock:
+            idle = time.time() - self.__last_used
+            if self.__session is not None and self.__in_use == 0 and \
+                self.max_idle_time is not None and idle > self.max_idle_time:
+                self.__session.close()
+                self.__session = None
+            if self.__session is None:
+                self.__session = self.__new_session()
+            self.__in_use += 1
+            return self.__session
+
+    def __checkin(self):
+        with self.__lock:
+            self.__in_use -= 1
+            self.__last_used = time.time()
+
+    @property
+    def in_use(self):
+        """Number of requests being sent through the pool, counting streamed
+        responses until they are closed."""
+        return self.__in_use
+
+    def request(self, method, url, **kwargs):
+        """Send a HTTP request using a pooled connection. Accepts the same
+        keyword arguments as :meth:`requests.Session.request`.
+
+        With ``stream=True`` the connection is in use until the response is
+        closed, so it is not evicted while its body is being read.
+        """
+        session = self.__checkout()
+        try:
+            response = session.request(method, url, **kwargs)
+        except Exception:
+            self.__checkin()
+            raise
+        if kwargs.get("stream"):
+            _on_close(response, self.__checkin)
+        else:
+            self.__checkin()
+        return response
+
+    def close(self):
+        """Close every pooled connection. The pool is reopened on the next
+        request."""
+        with self.__lock:
+            if self.__session is not None:
+                self.__session.close()
+                self.__session = None
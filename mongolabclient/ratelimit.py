@@ -0,0 +1,139 @@
+# -*- coding: utf-8 *-*
+"""Client-side rate limiting of HTTP requests sent to `MongoLab REST API`_.
+
+.. _MongoLab REST API: http://support.mongolab.com/entries/20433053-rest-api-for-mongodb"""
+
+from collections import deque
+import threading
+import time
+
+from mongolabclient import errors
+
+
+class RateLimiter(object):
+    """Thread-safe limiter of the HTTP requests sent by a
+    :class:`~mongolabclient.client.MongoLabClient`, so that all of threads
+    sharing a client stay under the quota of its API key.
+
+    Requests are limited to `rate` per second by a token bucket holding up to
+    `burst` tokens, and to `max_in_flight` requests waiting for a response at
+    the same time; a streamed response counts as in flight until it is
+    closed. Callers over the limits are not rejected: they wait in a
+    FIFO queue and are let through in arrival order.
+
+    :Parameters:
+        - `rate` (optional): requests per second, ``None`` for no limit
+        - `burst` (optional): requests that can be sent at once after the
+          limiter has been idle
+        - `max_in_flight` (optional): maximum concurrent requests, ``None`` for
+          no limit
+
+    .. code-block:: python
+
+       >>> from mongolabclient import MongoLabClient
+       >>> from mongolabclient.ratelimit import RateLimiter
+       >>> limiter = RateLimiter(rate=10, burst=20, max_in_flight=4)
+       >>> client = MongoLabClient("MongoLabAPIKey", rate_limiter=limiter)
+       >>> limiter.stats()
+       {'acquired': 1, 'waited': 0, 'wait_time': 0.0, 'max_wait': 0.0,
+       'in_flight': 0, 'queued': 0}
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, rate=None, burst=1, max_in_flight=None):
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if burst < 1:
+            raise ValueError("burst must be greater than 0")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be greater than 0")
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.__cond = threading.Condition(threading.Lock())
+        self.__queue = deque()
+        self.__tokens = float(burst)
+        self.__updated = time.time()
+        self.__in_flight = 0
+        self.__acquired = 0
+        self.__waited = 0
+        self.__total_wait = 0.0
+        self.__max_wait = 0.0
+
+    def __refill(self, now):
+        if self.rate is not None:
+            self.__tokens = min(self.burst, self.__tokens +
+                                (now - self.__updated) * self.rate)
+        self.__updated = now
+
+    def __wait_time(self):
+        """Returns the seconds to wait until a request can be sent, ``None``
+        when it depends on other requests finishing."""
+        if self.max_in_flight is not None and \
+            self.__in_flight >= self.max_in_flight:
+            return None
+        if self.rate is None or self.__tokens >= 1:
+            return 0
+        return (1 - self.__tokens) / self.rate
+
+    def acquire(self, deadline=None):
+        """Wait until a request can be sent. Raises
+        :class:`~mongolabclient.errors.ExecutionTimeout` if it is not possible
+        before `deadline`, a :func:`time.time` value."""
+        started = time.time()
+        waiter = object()
+        with self.__cond:
+            self.__queue.append(waiter)
+            try:
+                while True:
+                    now = time.time()
+                    self.__refill(now)
+                    wait = None
+                    if self.__queue[0] is waiter:
+                        wait = self.__wait_time()
+                        if wait == 0:
+                            break
+                    if deadline is not None:
+                        if now >= deadline:
+                            raise errors.ExecutionTimeout()
+                        wait = deadline - now if wait is None else \
+                            min(wait, deadline - now)
+                    self.__cond.wait(wait)
+            finally:
+                self.__queue.remove(waiter)
+                self.__cond.notify_all()
+            if self.rate is not None:
+                self.__tokens -= 1
+            self.__in_flight += 1
+            waited = time.time() - started
+            self.__acquired += 1
+            if waited > 0.001:
+                self.__waited += 1
+            self.__total_wait += waited
+            self.__max_wait = max(self.__max_wait, waited)
+
+    def release(self):
+        """Mark a request acquired with :meth:`acquire` as finished."""
+        with self.__cond:
+            self.__in_flight -= 1
+            self.__cond.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+    def stats(self):
+        """Returns a dict with the counters of this limiter: ``acquired``
+        (requests let through), ``waited`` (requests that had to wait),
+        ``wait_time`` and ``max_wait`` (total and maximum seconds waited),
+        ``in_flight`` and ``queued``."""
+        with self.__cond:
+            return {"acquired": self.__acquired, "waited": self.__waited,
+                    "wait_time": self.__total_wait,
+                    "max_wait": self.__max_wait,
+                    "in_flight": self.__in_flight,
+                    "queued": len(self.__queue)}
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 *-*
+"""Retry policy with exponential backoff and jitter for HTTP requests sent to
+`MongoLab REST API`_.
+
+.. _MongoLab REST API: http://support.mongolab.com/entries/20433053-rest-api-for-mongodb"""
+
+from email.utils import parsedate_tz, mktime_tz
+import random
+import threading
+import time
+
+import requests
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+"""HTTP status codes of transient errors retried by default."""
+
+IDEMPOTENT_METHODS = frozenset(["get", "delete"])
+"""HTTP methods of operations that are safe to send again."""
+
+
+class RetryBudget(object):
+    """Thread-safe token bucket limiting the number of retries. Every retry
+    takes a token and tokens are refilled at a constant rate, so when REST API
+    is down the retries of all of threads sharing the budget can't grow into
+    a retry storm.
+
+    :Parameters:
+        - `capacity` (optional): maximum number of tokens, i.e. retries that
+          can be made in a burst
+        - `refill_rate` (optional): tokens added per second
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, capacity=10, refill_rate=1.0):
+        if capacity < 1:
+            raise ValueError("capacity must be greater than 0")
+        if refill_rate < 0:
+            raise ValueError("refill_rate must be >= 0")
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.__lock = threading.Lock()
+        self.__tokens = float(capacity)
+        self.__updated = time.time()
+
+    def __refill(self):
+        now = time.time()
+        self.__tokens = min(self.capacity, self.__tokens +
+                            (now - self.__updated) * self.refill_rate)
+        self.__updated = now
+
+    @property
+    def tokens(self):
+        """Number of retries that can be made right now."""
+        with self.__lock:
+            self.__refill()
+            return self.__tokens
+
+    def acquire(self):
+        """Take a token, returns ``False`` when the budget is exhausted."""
+        with self.__lock:
+            self.__refill()
+            if self.__tokens < 1:
+                return False
+            self.__tokens -= 1
+            return True
+
+
+class RetryPolicy(object):
+    """Policy deciding when and after how long a failed HTTP request is sent
+    again by a :class:`~mongolabclient.client.MongoLabClient`.
+
+    A request is retried when the connection fails or times out, or when
+    REST API answers with any of `statuses`. The delay before the attempt
+    ``n`` is chosen at random between 0 and ``backoff_base * 2 ** (n - 1)``
+    seconds, capped by `backoff_max` ("full jitter"), unless a longer delay is
+    requested by a ``Retry-After`` header. Only GET and DELETE requests are
+    retried unless `retry_all_methods` is ``True``, because a POST or PUT may
+    have been applied before the failure.
+
+    :Parameters:
+        - `max_attempts` (optional): maximum number of attempts of a request,
+          including the first one
+        - `backoff_base` (optional): seconds of the delay before the first
+          retry
+        - `backoff_max` (optional): maximum seconds between two attempts
+        - `deadline` (optional): maximum seconds spent in all of attempts of
+          a request, ``None`` for no limit
+        - `statuses` (optional): HTTP status codes that are retried
+        - `retry_all_methods` (optional): retry non-idempotent requests too
+        - `budget` (optional): a :class:`RetryBudget` shared by all of
+          requests of the client, by default a new one with 10 tokens
+          refilled at 1 token per second
+
+    .. code-block:: python
+
+       >>> from mongolabclient import MongoLabClient
+       >>> from mongolabclient.retry import RetryPolicy
+       >>> policy = RetryPolicy(max_attempts=5, backoff_base=0.2, deadline=10)
+       >>> MongoLabClient("MongoLabAPIKey", retry_policy=policy)
+       MongoLabClient('MongoLabAPIKey', 'v1')
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, max_attempts=3, backoff_base=0.1, backoff_max=10.0,
+        deadline=None, statuses=RETRY_STATUSES, retry_all_methods=False,
+        budget=None):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be greater than 0")
+        if backoff_base < 0 or backoff_max < 0:
+            raise ValueError("backoff_base and backoff_max must be >= 0")
+        if deadline is not None and deadline <= 0:
+            raise ValueError("deadline must be greater than 0")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.statuses = frozenset(statuses)
+        self.retry_all_methods = retry_all_methods
+        self.budget = budget or RetryBudget()
+
+    def backoff(self, attempt):
+        """Returns a random delay in seconds before the retry following the
+        attempt number `attempt` (starting at 1)."""
+        cap = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    @staticmethod
+    def retry_after(headers):
+        """Returns the seconds requested by the ``Retry-After`` header of a
+        response, given as seconds or as a HTTP date, or ``None``."""
+        value = headers.get("Retry-After") if headers else None
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            date = parsedate_tz(value)
+            if date is None:
+                return None
+            return max(mktime_tz(date) - time.time(), 0)
+
+    def next_delay(self, method, attempt, started, status=None,
+        headers=None, deadline=None):
+        """Returns the seconds to wait before sending again a request, or
+        ``None`` when it must not be retried.
+
+        :Parameters:
+            - `method`: HTTP method of the request
+            - `attempt`: number of attempts already made
+            - `started`: time when the first attempt was sent
+            - `status` (optional): HTTP status of the response, ``None`` when
+              the connection failed
+            - `headers` (optional): headers of the response
+            - `deadline` (optional): :func:`time.time` when the operation
+              must be finished
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if not self.retry_all_methods and \
+            method.lower() not in IDEMPOTENT_METHODS:
+            return None
+        if status is not None and status not in self.statuses:
+            return None
+        delay = self.backoff(attempt)
+        retry_after = self.retry_after(headers)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if self.deadline is not None and \
+            time.time() + delay - started > self.deadline:
+            return None
+        if deadline is not None and time.time() + delay >= deadline:
+            return None
+        if not self.budget.acquire():
+            return None
+        return delay
+
+    def send(self, method, send, deadline=None):
+        """Returns the response of calling `send`, a function without
+        arguments sending a HTTP request with :mod:`requests`, calling it
+        again while the request fails and may be retried before `deadline`.
+        """
+        started = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout):
+                delay = self.next_delay(method, attempt, started,
+                                        deadline=deadline)
+                if delay is None:
+                    raise
+            else:
+                delay = self.next_delay(method, attempt, started,
+                                        response.status_code,
+                                        response.headers, deadline)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 *-*
-from mongolabclient import errors
+from mongolabclient import compat, errors
 
 VAL_API = "validate-api-key"
 """Pseudo-code for Validation API key operation."""
@@ -65,3 +65,73 @@ class MongoLabSettings(object):
         self.version = version
         self.base_url = self.__BASE_URLS[version]
         self.operations = self.__OPERATIONS[version]
+
+    def compile(self, api_key, headers, base_url=None):
+        """Returns a dict with a :class:`RequestTemplate` for each operation
+        of the selected version, sending `api_key` and `headers` to
+        `base_url` (by default, the base url of the version).
+
+        .. versionadded:: 1.3
+        """
+        base_url = base_url or self.base_url
+        api_key = compat.urlencode({"apiKey": api_key})
+        templates = {}
+        for code, (method, path) in compat.iteritems(self.operations):
+            templates[code] = RequestTemplate(method, base_url + path,
+                                              api_key, headers)
+        return templates
+
+
+class RequestTemplate(object):
+    """Precompiled HTTP request of an operation of REST API, so that only
+    the variable parts of each request are built on every call.
+
+    The url of each database and collection is formatted once and cached, the
+    ``apiKey`` parameter is already urlencoded in :attr:`query` and
+    :attr:`headers` is shared by all of the requests (it must not be
+    modified).
+
+    :Parameters:
+        - `method`: HTTP method of the operation
+        - `url`: full url of the operation, with ``%(db)s``, ``%(col)s`` and
+          ``%(id)s`` slugs
+        - `query`: urlencoded query string sent on every request
+        - `headers`: HTTP headers sent on every request
+        - `max_urls` (optional): maximum number of cached urls
+
+    .. versionadded:: 1.3
+    """
+
+    __slots__ = ("method", "query", "headers", "__prefix", "__suffix",
+                 "__urls", "__max_urls")
+
+    def __init__(self, method, url, query, headers, max_urls=1024):
+        self.method = method
+        self.query = query
+        self.headers = headers
+        prefix, slug, suffix = url.partition("%(id)s")
+        self.__prefix = prefix
+        self.__suffix = suffix if slug else None
+        self.__urls = {}
+        self.__max_urls = max_urls
+
+    def url(self, slug_params):
+        """Returns the full url of the operation with the slug parameters
+        included."""
+        key = (slug_params.get("db"), slug_params.get("col"))
+        url = self.__urls.get(key)
+        if url is None:
+            url = self.__prefix % slug_params
+            if len(self.__urls) >= self.__max_urls:
+                self.__urls.clear()
+            self.__urls[key] = url
+        if self.__suffix is None:
+            return url
+        return "%s%s%s" % (url, slug_params["id"], self.__suffix)
+
+    def query_string(self, params):
+        """Returns the query string with the ``apiKey`` parameter and the
+        already encoded `params`."""
+        if not params:
+            return self.query
+        return self.query + "&" + compat.urlencode(params)
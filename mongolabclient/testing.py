@@ -0,0 +1,705 @@
+# -*- coding: utf-8 *-*
+"""In-process stand-in of `MongoLab REST API`_ for tests and benchmarks.
+
+:class:`FakeMongoLabServer` serves every operation of
+:mod:`mongolabclient.settings` over HTTP on localhost, backed by an in-memory
+store, so clients can be exercised end to end without network access:
+
+.. code-block:: python
+
+   >>> from mongolabclient.testing import FakeMongoLabServer
+   >>> from pymongolab import MongoClient
+   >>> with FakeMongoLabServer(latency=0.01) as server:
+   ...     con = MongoClient("MongoLabAPIKey", base_url=server.base_url)
+   ...     con.database.collection.insert({"foo": "bar"})
+   ...     con.database.collection.find_one()
+   {u'_id': ObjectId('50243d38e4b00c3b3e75fc94'), u'foo': u'bar'}
+
+Documents are stored as `MongoDB Extended JSON`_ values, like REST API
+receives them. Queries support equality, dotted keys and the ``$in``,
+``$nin``, ``$ne``, ``$gt``, ``$gte``, ``$lt``, ``$lte``, ``$exists``,
+``$and`` and ``$or`` operators; updates support the ``$set``, ``$unset``,
+``$inc``, ``$push``, ``$pushAll``, ``$addToSet``, ``$pop``, ``$pull``,
+``$pullAll`` and ``$rename`` operators.
+
+.. _MongoLab REST API: http://support.mongolab.com/entries/20433053-rest-api-for-mongodb
+.. _MongoDB Extended JSON: http://docs.mongodb.org/manual/reference/mongodb-extended-json/"""
+
+from collections import OrderedDict
+import copy
+import errno
+import json
+import random
+import socket
+import sys
+import threading
+import time
+
+from bson.objectid import ObjectId
+
+from mongolabclient import compat, compression as _compression, validators
+
+DEFAULT_LIMIT = 1000
+"""Number of documents returned by list-documents operation when no limit
+is given, like REST API."""
+
+_UNAVAILABLE = {"message": "Service unavailable (injected error)."}
+_THROTTLED = {"message": "Too many requests."}
+_INVALID_API_KEY = {"message": "Please provide a valid API key."}
+_NOT_FOUND = {"message": "Document not found"}
+_MISSING = object()
+
+
+def _scalar(value):
+    """Returns the comparable value of an Extended JSON value."""
+    if isinstance(value, dict) and len(value) == 1:
+        for key in ("$oid", "$date", "$numberLong"):
+            if key in value:
+                return value[key]
+    return value
+
+
+def _is_operator(value):
+    """Returns ``True`` if `value` is a dict of query operators like
+    ``{"$gt": 1}``, and not an Extended JSON value like ``{"$oid": ...}``."""
+    return isinstance(value, dict) and bool(value) and \
+        all(key.startswith("$") for key in value) and _scalar(value) is value
+
+
+def _sort_key(value):
+    value = _scalar(value)
+    if value is _MISSING or value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (4, value)
+    if isinstance(value, (int, float) + compat.integer_types):
+        return (1, value)
+    if isinstance(value, compat.string_type):
+        return (2, value)
+    return (3, json.dumps(value, sort_keys=True))
+
+
+def _get(document, key):
+    """Returns the value of a dotted `key` of `document`, or ``_MISSING``."""
+    value = document
+    for part in key.split("."):
+        if isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        elif isinstance(value, list) and part.isdigit() and \
+            int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return value
+    return value
+
+
+def _parent(document, key, create=True):
+    """Returns the dict holding the last part of a dotted `key` and that
+    part."""
+    parts = key.split(".")
+    for part in parts[:-1]:
+        if part not in document and create:
+            document[part] = {}
+        document = document.get(part)
+        if not isinstance(document, dict):
+            return None, parts[-1]
+    return document, parts[-1]
+
+
+def _compare(value, operator, argument):
+    if operator == "$in":
+        return _equals_any(value, argument)
+    if operator == "$nin":
+        return not _equals_any(value, argument)
+    if operator == "$ne":
+        return not _equals(value, argument)
+    if operator == "$exists":
+        return (value is not _MISSING) == bool(argument)
+    if value is _MISSING:
+        return False
+    value, argument = _sort_key(value), _sort_key(argument)
+    if value[0] != argument[0]:
+        return False
+    if operator == "$gt":
+        return value > argument
+    if operator == "$gte":
+        return value >= argument
+    if operator == "$lt":
+        return value < argument
+    if operator == "$lte":
+        return value <= argument
+    raise ValueError("unsupported operator %s" % operator)
+
+
+def _equals(value, expected):
+    if isinstance(value, list) and not isinstance(expected, list):
+        return any(_scalar(item) == _scalar(expected) for item in value)
+    if value is _MISSING:
+        return expected is None
+    return _scalar(value) == _scalar(expected)
+
+
+def _equals_any(value, expected):
+    return any(_equals(value, item) for item in expected)
+
+
+def match(document, spec):
+    """Returns ``True`` if `document` matches the query `spec`."""
+    for key, condition in compat.iteritems(spec or {}):
+        if key == "$and":
+            if not all(match(document, s) for s in condition):
+                return False
+        elif key == "$or":
+            if not any(match(document, s) for s in condition):
+                return False
+        elif _is_operator(condition):
+            value = _get(document, key)
+            for operator, argument in compat.iteritems(condition):
+                if not _compare(value, operator, argument):
+                    return False
+        elif not _equals(_get(document, key), condition):
+            return False
+    return True
+
+
+def project(document, fields):
+    """Returns a copy of `document` with the `fields` selected, a dict like
+    ``{"name": 1}`` or ``{"name": 0}``."""
+    if not fields:
+        return copy.deepcopy(document)
+    include = [k for k, v in compat.iteritems(fields) if v and k != "_id"]
+    if include:
+        result = {}
+        if fields.get("_id", 1) and "_id" in document:
+            result["_id"] = document["_id"]
+        for key in include:
+            value = _get(document, key)
+            if value is not _MISSING:
+                parent, last = _parent(result, key)
+                parent[last] = copy.deepcopy(value)
+        return result
+    result = copy.deepcopy(document)
+    for key, value in compat.iteritems(fields):
+        if not value:
+            parent, last = _parent(result, key, create=False)
+            if parent is not None:
+                parent.pop(last, None)
+    return result
+
+
+def update(document, changes):
+    """Apply an update document (with operators like ``$set``) to
+    `document`, or replace its content when `changes` has no operator."""
+    if not any(key.startswith("$") for key in changes):
+        _id = document.get("_id")
+        document.clear()
+        document.update(copy.deepcopy(changes))
+        if _id is not None:
+            document["_id"] = _id
+        return
+    validators.check_document_to_update(changes)
+    for operator, arguments in compat.iteritems(changes):
+        for key, argument in compat.iteritems(arguments):
+            argument = copy.deepcopy(argument)
+            parent, last = _parent(document, key)
+            if parent is None:
+                continue
+            current = parent.get(last, _MISSING)
+            if operator == "$set":
+                parent[last] = argument
+            elif operator == "$unset":
+                parent.pop(last, None)
+            elif operator == "$inc":
+                parent[last] = (0 if current is _MISSING else current) + \
+                    argument
+            elif operator in ("$push", "$pushAll", "$addToSet"):
+                items = parent.setdefault(last, [])
+                if isinstance(argument, dict) and "$each" in argument:
+                    argument = argument["$each"]
+                elif operator != "$pushAll":
+                    argument = [argument]
+                for item in argument:
+                    if operator != "$addToSet" or item not in items:
+                        items.append(item)
+            elif operator == "$pop" and isinstance(current, list) and current:
+                current.pop(0 if argument < 0 else -1)
+            elif operator in ("$pull", "$pullAll") and \
+                isinstance(current, list):
+                removed = argument if operator == "$pullAll" else [argument]
+                parent[last] = [item for item in current
+                                if not _equals_any(item, removed)]
+            elif operator == "$rename" and current is not _MISSING:
+                target, name = _parent(document, argument)
+                if target is not None:
+                    target[name] = parent.pop(last)
+
+
+def _new_id():
+    return {"$oid": str(ObjectId())}
+
+
+class FakeMongoLabServer(object):
+    """HTTP server answering the operations of `MongoLab REST API`_ from an
+    in-memory store, running in a background thread.
+
+    Faults can be injected in every request: a fixed `latency`, a random
+    fraction `error_rate` of requests failing with `error_status`, and
+    throttling to `rate_limit` requests per second with ``429`` responses.
+    :meth:`fail_next` makes the next requests fail. A link with limited
+    `bandwidth` can be simulated too, where compression of request bodies
+    (any encoding of :mod:`mongolabclient.compression`) and of responses (when
+    `compression` is ``True``) saves time.
+
+    :Parameters:
+        - `port` (optional): port to listen to, a free one by default
+        - `api_keys` (optional): list of API keys accepted, any key with a
+          valid format by default
+        - `latency` (optional): seconds added to every response, or a
+          ``(min, max)`` tuple for a random latency
+        - `error_rate` (optional): probability of a request failing
+        - `error_status` (optional): HTTP status of injected errors
+        - `rate_limit` (optional): requests per second accepted, ``None`` for
+          no limit
+        - `seed` (optional): seed of random latencies and errors
+        - `bandwidth` (optional): bytes per second transferred in each
+          direction of every request, ``None`` for no limit
+        - `compression` (optional): compress responses of 1KB or more with
+          an encoding of the ``Accept-Encoding`` header of the request
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, port=0, api_keys=None, latency=0, error_rate=0.0,
+        error_status=503, rate_limit=None, seed=None, bandwidth=None,
+        compression=False):
+        self.api_keys = set(api_keys) if api_keys is not None else None
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.bandwidth = bandwidth
+        self.compression = compression
+        self.databases = {}
+        self.lock = threading.RLock()
+        self.__random = random.Random(seed)
+        self.__failures = []
+        self.__tokens = rate_limit or 0
+        self.__updated = time.time()
+        self.__profile = {}
+        self.__counters = {"requests": 0, "errors": 0, "throttled": 0,
+                           "bytes_received": 0, "bytes_sent": 0}
+        self.__server = _HTTPServer(("127.0.0.1", port), _RequestHandler)
+        self.__server.fake = self
+        self.__thread = None
+
+    @property
+    def port(self):
+        """Port where the server listens."""
+        return self.__server.server_address[1]
+
+    @property
+    def base_url(self):
+        """Base url of REST API served, to use as ``base_url`` of the
+        clients."""
+        return "http://127.0.0.1:%d/api/1/" % self.port
+
+    def start(self):
+        """Start serving requests in a background thread."""
+        if self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__server.serve_forever)
+            self.__thread.daemon = True
+            self.__thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and close its socket."""
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def collection(self, database, collection):
+        """Returns the list of documents stored in a collection, created if
+        it doesn't exist."""
+        with self.lock:
+            return self.databases.setdefault(database, {}).setdefault(
+                collection, [])
+
+    def load(self, database, collection, documents):
+        """Add `documents` to a collection. Documents without ``_id`` get a
+        new ObjectId."""
+        documents = [copy.deepcopy(document) for document in documents]
+        for document in documents:
+            document.setdefault("_id", _new_id())
+        with self.lock:
+            self.collection(database, collection).extend(documents)
+
+    def reset(self):
+        """Remove all of databases and reset the counters."""
+        with self.lock:
+            self.databases.clear()
+            self.__profile.clear()
+            del self.__failures[:]
+            for key in self.__counters:
+                self.__counters[key] = 0
+
+    def fail_next(self, count=1, status=503, retry_after=None):
+        """Make the next `count` requests fail with the HTTP `status` given,
+        sending a ``Retry-After`` header when `retry_after` is given."""
+        with self.lock:
+            self.__failures.extend([(status, retry_after)] * count)
+
+    def stats(self):
+        """Returns a dict with the counters of the server: ``requests``,
+        ``errors`` (injected), ``throttled``, ``bytes_received`` and
+        ``bytes_sent``."""
+        with self.lock:
+            return dict(self.__counters)
+
+    def _count(self, name, value=1):
+        with self.lock:
+            self.__counters[name] += value
+
+    def _delay(self):
+        """Returns the seconds to wait before answering a request."""
+        if isinstance(self.latency, (tuple, list)):
+            with self.lock:
+                return self.__random.uniform(*self.latency)
+        return self.latency
+
+    def _transfer(self, size):
+        """Wait the time needed to transfer `size` bytes."""
+        if self.bandwidth:
+            time.sleep(float(size) / self.bandwidth)
+
+    def _encoding(self, accept_encoding, size):
+        """Returns the encoding of a response of `size` bytes for the
+        ``Accept-Encoding`` header given, or ``None``."""
+        if not self.compression or size < _compression.DEFAULT_THRESHOLD:
+            return None
+        accepted = [value.split(";")[0].strip()
+                    for value in (accept_encoding or "").split(",")]
+        for encoding in _compression.ENCODINGS:
+            if encoding in accepted and (encoding != "br" or
+                                         _compression.brotli is not None):
+                return encoding
+        return None
+
+    def _fault(self):
+        """Returns ``(status, body, headers)`` of an injected fault for the
+        current request, or ``None``."""
+        with self.lock:
+            if self.__failures:
+                status, retry_after = self.__failures.pop(0)
+                self.__counters["errors"] += 1
+                headers = {}
+                if retry_after is not None:
+                    headers["Retry-After"] = str(retry_after)
+                return status, _UNAVAILABLE, headers
+            if self.rate_limit is not None:
+                now = time.time()
+                self.__tokens = min(self.rate_limit, self.__tokens +
+                                    (now - self.__updated) * self.rate_limit)
+                self.__updated = now
+                if self.__tokens < 1:
+                    self.__counters["throttled"] += 1
+                    return 429, _THROTTLED, {"Retry-After": "1"}
+                self.__tokens -= 1
+            if self.error_rate and self.__random.random() < self.error_rate:
+                self.__counters["errors"] += 1
+                return self.error_status, _UNAVAILABLE, {}
+        return None
+
+    def _check_api_key(self, api_key):
+        if not api_key or not validators.check_api_key(api_key):
+            return False
+        return self.api_keys is None or api_key in self.api_keys
+
+    def _dispatch(self, method, parts, params, body):
+        """Returns ``(status, body)`` of a REST API operation, where `parts`
+        are the segments of the path after the version."""
+        with self.lock:
+            if not parts:
+                return 200, {}
+            if parts == ["databases"] and method == "GET":
+                return 200, sorted(self.databases)
+            if len(parts) < 3 or parts[0] != "databases":
+                return 404, {"message": "Not found"}
+            database = parts[1]
+            if parts[2] == "runCommand" and method == "POST":
+                return 200, self._command(database, body)
+            if parts[2] != "collections":
+                return 404, {"message": "Not found"}
+            if len(parts) == 3 and method == "GET":
+                return 200, sorted(self.databases.get(database, {}))
+            if len(parts) == 4:
+                return self._documents(method, database, parts[3], params,
+                                       body)
+            if len(parts) == 5:
+                return self._document(method, database, parts[3], parts[4],
+                                      body)
+            return 404, {"message": "Not found"}
+
+    def _find(self, database, collection, spec=None, sort=None):
+        documents = self.databases.get(database, {}).get(collection, [])
+        found = [document for document in documents if match(document, spec)]
+        for key, direction in reversed(list(compat.iteritems(sort or {}))):
+            found.sort(key=lambda document: _sort_key(_get(document, key)),
+                       reverse=direction < 0)
+        return found
+
+    def _documents(self, method, database, collection, params, body):
+        spec = json.loads(params.get("q", "{}"), object_pairs_hook=OrderedDict)
+        sort = json.loads(params.get("s", "{}"), object_pairs_hook=OrderedDict)
+        if "$query" in spec:
+            # A hinted query, wrapped with its sort order; the index
+            # given as $hint is not needed to find the documents.
+            sort = spec.get("$orderby", sort)
+            spec = spec["$query"]
+        if method == "GET":
+            found = self._find(database, collection, spec, sort)
+            if params.get("c") == "true":
+                return 200, len(found)
+            skip = int(params.get("sk", 0))
+            limit = int(params.get("l", 0)) or DEFAULT_LIMIT
+            fields = json.loads(params.get("f", "{}"))
+            found = [project(document, fields)
+                     for document in found[skip:skip + limit]]
+            if params.get("fo") == "true":
+                return 200, found[0] if found else None
+            return 200, found
+        if method == "POST":
+            documents = body if isinstance(body, list) else [body]
+            self.load(database, collection, documents)
+            inserted = self.collection(database, collection)[-len(documents):]
+            if isinstance(body, list):
+                return 200, {"n": len(documents)}
+            return 200, inserted[0]
+        if method == "PUT" and isinstance(body, list):
+            documents = self.collection(database, collection)
+            found = self._find(database, collection, spec)
+            removed = set(id(document) for document in found)
+            documents[:] = [d for d in documents if id(d) not in removed]
+            self.load(database, collection, body)
+            return 200, {"n": len(found), "removed": len(found),
+                         "inserted": len(body)}
+        if method == "PUT":
+            found = self._find(database, collection, spec)
+            if params.get("m") != "true":
+                found = found[:1]
+            for document in found:
+                update(document, body)
+            upserted = False
+            if not found and params.get("u") == "true":
+                document = dict((k, v) for k, v in compat.iteritems(spec)
+                                if not k.startswith("$") and
+                                not _is_operator(v))
+                update(document, body)
+                self.load(database, collection, [document])
+                upserted = True
+            return 200, {"n": len(found) or int(upserted),
+                         "updatedExisting": bool(found), "error": None,
+                         "err": None, "ok": 1}
+        return 405, {"message": "Method not allowed"}
+
+    def _document(self, method, database, collection, _id, body):
+        documents = self.databases.get(database, {}).get(collection, [])
+        for index, document in enumerate(documents):
+            if _scalar(document.get("_id")) == _id:
+                break
+        else:
+            if method == "PUT":
+                document = {"_id": {"$oid": _id} if ObjectId.is_valid(_id)
+                            else _id}
+                update(document, body)
+                self.load(database, collection, [document])
+                return 200, document
+            return 404, _NOT_FOUND
+        if method == "GET":
+            return 200, document
+        if method == "PUT":
+            update(document, body)
+            return 200, document
+        if method == "DELETE":
+            del documents[index]
+            return 200, document
+        return 405, {"message": "Method not allowed"}
+
+    def _command(self, database, command):
+        """Returns the result of a database command."""
+        name = next(iter(command)) if command else None
+        value = command.get(name)
+        ok = {"ok": 1.0, "serverUsed": "127.0.0.1:27017"}
+        if name in ("getLastError", "getPrevError"):
+            ok.update({"err": None, "n": 0, "connectionId": 1,
+                       "lastOp": None})
+            if name == "getPrevError":
+                ok["nPrev"] = -1
+            return ok
+        if name == "resetError" or name == "ping":
+            return ok
+        if name == "profile":
+            previous = self.__profile.get(database, 0)
+            if int(value) >= 0:
+                self.__profile[database] = int(value)
+            ok.update({"was": previous, "slowms": command.get("slowms", 100)})
+            return ok
+        if name == "count":
+            ok["n"] = len(self._find(database, value, command.get("query")))
+            return ok
+        if name == "distinct":
+            values = []
+            for document in self._find(database, value,
+                                       command.get("query")):
+                item = _get(document, command["key"])
+                if item is not _MISSING and item not in values:
+                    values.append(item)
+            ok["values"] = values
+            return ok
+        if name == "findAndModify":
+            return self._find_and_modify(database, value, command, ok)
+        if name == "dbStats":
+            collections = self.databases.get(database, {})
+            ok.update({"db": database, "collections": len(collections),
+                       "objects": sum(len(c) for c in collections.values())})
+            return ok
+        if name == "collStats":
+            count = len(self.databases.get(database, {}).get(value, []))
+            ok.update({"ns": "%s.%s" % (database, value), "count": count,
+                       "nindexes": 1})
+            return ok
+        if name == "reIndex":
+            ok.update({"nIndexesWas": 1, "nIndexes": 1})
+            return ok
+        if name == "drop":
+            self.databases.get(database, {}).pop(value, None)
+            return ok
+        return {"ok": 0.0, "errmsg": "no such cmd: %s" % name}
+
+    def _find_and_modify(self, database, collection, command, ok):
+        found = self._find(database, collection, command.get("query"),
+                           command.get("sort"))
+        fields = command.get("fields")
+        if not found:
+            if not command.get("upsert") or command.get("remove"):
+                return {"ok": 0.0, "errmsg": "No matching object found"}
+            document = {}
+            update(document, command.get("update", {}))
+            self.load(database, collection, [document])
+            document = self.collection(database, collection)[-1]
+            ok["value"] = project(document, fields) \
+                if command.get("new") else None
+            return ok
+        document = found[0]
+        before = project(document, fields)
+        if command.get("remove"):
+            self.collection(database, collection).remove(document)
+        else:
+            update(document, command.get("update", {}))
+        ok["value"] = project(document, fields) if command.get("new") and \
+            not command.get("remove") else before
+        return ok
+
+
+_DISCONNECTED = (errno.EPIPE, errno.ECONNRESET, errno.ECONNABORTED)
+"""Errors of the connections closed by clients before their response was
+written, e.g. by cancelled streams and timeouts."""
+
+
+class _HTTPServer(compat.ThreadingMixIn, compat.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def handle_error(self, request, client_address):
+        error = sys.exc_info()[1]
+        if isinstance(error, socket.error) and error.errno in _DISCONNECTED:
+            return
+        compat.HTTPServer.handle_error(self, request, client_address)
+
+
+class _RequestHandler(compat.BaseHTTPRequestHandler):
+    """Handler of the HTTP requests of :class:`FakeMongoLabServer`."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; with Nagle's algorithm every
+    # response on a keep-alive connection would wait for a delayed ACK.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def __respond(self, status, body, headers=None):
+        fake = self.server.fake
+        data = json.dumps(body).encode("utf-8")
+        encoding = fake._encoding(self.headers.get("Accept-Encoding"),
+                                  len(data))
+        if encoding is not None:
+            data = _compression.compress(data, encoding)
+        fake._transfer(len(data))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        for key, value in compat.iteritems(headers or {}):
+            self.send_header(key, value)
+        self.end_headers()
+        # Counted first, so the stats are up to date once the client has
+        # read the response.
+        fake._count("bytes_sent", len(data))
+        self.wfile.write(data)
+
+    def __handle(self, method):
+        fake = self.server.fake
+        url = compat.urlparse(self.path)
+        params = dict(compat.parse_qsl(url.query, keep_blank_values=True))
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length) if length else b""
+        fake._count("requests")
+        fake._count("bytes_received", len(self.path) + len(data))
+        fake._transfer(len(data))
+        delay = fake._delay()
+        if delay:
+            time.sleep(delay)
+        fault = fake._fault()
+        if fault is not None:
+            return self.__respond(*fault)
+        if not fake._check_api_key(params.get("apiKey")):
+            return self.__respond(401, _INVALID_API_KEY)
+        parts = [compat.unquote(part)
+                 for part in url.path.strip("/").split("/")[2:]]
+        try:
+            body = None
+            encoding = self.headers.get("Content-Encoding")
+            if data and encoding:
+                data = _compression.decompress(data, encoding)
+            if data:
+                # Commands are identified by their first key.
+                body = json.loads(data.decode("utf-8"),
+                                  object_pairs_hook=OrderedDict)
+            status, result = fake._dispatch(method, parts, params, body)
+        except Exception as e:
+            status, result = 400, {"message": str(e)}
+        self.__respond(status, result)
+
+    def do_GET(self):
+        self.__handle("GET")
+
+    def do_POST(self):
+        self.__handle("POST")
+
+    def do_PUT(self):
+        self.__handle("PUT")
+
+    def do_DELETE(self):
+        self.__handle("DELETE")
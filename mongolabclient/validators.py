@@ -1,5 +1,5 @@
 # -*- coding: utf-8 *-*
-from mongolabclient import errors
+from mongolabclient import compat, errors
 import re
 
 
@@ -37,9 +37,8 @@ def check_list_documents_params(**kwargs):
     they are correct, removing them if no have a value or raise a TypeError if
     they have a not expected type."""
     params = {}
-    keys = __param_types.keys() + __default_params.keys() + __key_params.keys()
-    for key, value in kwargs.iteritems():
-        if key not in keys:
+    for key, value in compat.iteritems(kwargs):
+        if key not in __param_types:
             raise Exception("Invalid parameter %r" % (key))
         if not isinstance(value, __param_types[key]):
             raise TypeError("%r must be an instance of %r" % (key,
@@ -52,7 +51,7 @@ def check_list_documents_params(**kwargs):
 def remove_empty_params(params):
     """Remove items from a :class:`dict` if no have a value."""
     r = {}
-    for key, value in params.iteritems():
+    for key, value in compat.iteritems(params):
         if value:
             r[key] = value
     return r
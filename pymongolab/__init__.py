@@ -4,6 +4,8 @@
 
 .. _PyMongo: http://api.mongodb.org/python/current/"""
 
+from mongolabclient.compat import string_type
+
 
 ASCENDING = 1
 """Ascending sort order."""
@@ -23,7 +25,7 @@ version_tuple = (1, 2, '+')
 
 
 def get_version_string():
-    if isinstance(version_tuple[-1], basestring):
+    if isinstance(version_tuple[-1], string_type):
         return '.'.join(map(str, version_tuple[:-1])) + version_tuple[-1]
     return '.'.join(map(str, version_tuple))
 
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 *-*
+"""Asynchronous, PyMongo_-flavored API for accessing to MongoLab databases on
+an :mod:`asyncio` event loop via
+:class:`~mongolabclient.asyncio.AsyncMongoLabClient`.
+
+This module requires Python 3.5+ and aiohttp_.
+
+.. code-block:: python
+
+   >>> from pymongolab.asyncio import AsyncMongoClient
+   >>> con = AsyncMongoClient("MongoLabAPIKey")
+   >>> await con.database.collection.insert({"foo": "bar"})
+   {u'foo': u'bar', u'_id': ObjectId('50242e46e4b0926293fd4d7c')}
+   >>> async for doc in con.database.collection.find({"foo": "bar"}):
+   ...     print(doc)
+   {u'_id': ObjectId('50242e46e4b0926293fd4d7c'), u'foo': u'bar'}
+   >>> await con.close()
+
+.. versionadded:: 1.3
+
+.. _PyMongo: http://api.mongodb.org/python/current/
+.. _aiohttp: https://docs.aiohttp.org/"""
+
+import asyncio
+import time
+
+from collections import deque
+
+from bson.objectid import ObjectId
+from mongolabclient import compat, errors
+from mongolabclient.asyncio import AsyncMongoLabClient
+from pymongolab import helpers
+from pymongolab.cursor import DEFAULT_BATCH_SIZE
+
+
+class AsyncMongoClient(object):
+    """Asynchronous version of :class:`~pymongolab.mongo_client.MongoClient`.
+    Keyword arguments are passed to
+    :class:`~mongolabclient.asyncio.AsyncMongoLabClient`.
+    """
+
+    def __init__(self, api_key, version="v1", proxy_url=None, **kwargs):
+        self.api_key = api_key
+        self.version = version
+        self.__request = AsyncMongoLabClient(api_key, version, proxy_url,
+                                             **kwargs)
+
+    @property
+    def request(self):
+        """An instance of :class:`mongolabclient.asyncio.AsyncMongoLabClient`
+        used for internal calls to MongoLab REST API.
+        """
+        return self.__request
+
+    async def close(self):
+        """Close all of pooled HTTP connections used by this client."""
+        await self.request.close()
+
+    def __eq__(self, other):
+        if isinstance(other, AsyncMongoClient):
+            us = (self.api_key, self.version)
+            them = (other.api_key, other.version)
+            return us == them
+        return NotImplemented
+
+    def __repr__(self):
+        return "AsyncMongoClient(%r, %r)" % (self.api_key, self.version)
+
+    def __getattr__(self, name):
+        """Get a database using a attribute-style access."""
+        if name.startswith("_"):
+            raise AttributeError("AsyncMongoClient has no attribute %r. To "
+                                 "access the %s database, use client[%r]."
+                                 % (name, name, name))
+        return AsyncDatabase(self, name)
+
+    def __getitem__(self, name):
+        """Get a database using a dictionary-style access."""
+        return AsyncDatabase(self, name)
+
+    async def database_names(self):
+        """Returns a list with your database names."""
+        return await self.request.list_databases()
+
+
+class AsyncDatabase(object):
+    """Asynchronous version of :class:`~pymongolab.database.Database`."""
+
+    def __init__(self, connection, name):
+        self.__connection = connection
+        self.name = name
+
+    @property
+    def connection(self):
+        """An instance of :class:`AsyncMongoClient` used for internal calls to
+        MongoLab REST API.
+        """
+        return self.__connection
+
+    def __eq__(self, other):
+        if isinstance(other, AsyncDatabase):
+            us = (self.connection, self.name)
+            them = (other.connection, other.name)
+            return us == them
+        return NotImplemented
+
+    def __repr__(self):
+        return "AsyncDatabase(%r, %r)" % (self.connection, self.name)
+
+    def __getattr__(self, name):
+        """Get a collection using a attribute-style access."""
+        if name.startswith("_"):
+            raise AttributeError("AsyncDatabase has no attribute %r. To "
+                                 "access the %s collection, use "
+                                 "database[%r]." % (name, name, name))
+        return AsyncCollection(self, name)
+
+    def __getitem__(self, name):
+        """Get a collection using a dictionary-style access."""
+        return AsyncCollection(self, name)
+
+    async def collection_names(self):
+        """Returns a list with the collection names of your database."""
+        return await self.connection.request.list_collections(self.name)
+
+    async def command(self, command, value=1, **kwargs):
+        """Execute a database-collection level command. See
+        :meth:`pymongolab.database.Database.command`.
+        """
+        cmd = helpers._command_document(command, value, kwargs)
+        return await self.connection.request.run_command(self.name, cmd)
+
+
+class AsyncCollection(object):
+    """Asynchronous version of :class:`~pymongolab.collection.Collection`."""
+
+    def __init__(self, database, name):
+        self.__database = database
+        self.name = name
+        self.__full_name = u"%s.%s" % (self.__database.name, self.name)
+
+    @property
+    def database(self):
+        """An instance of :class:`AsyncDatabase`."""
+        return self.__database
+
+    @property
+    def full_name(self):
+        """The full name of this collection, of the form
+        `database_name.collection_name`.
+        """
+        return self.__full_name
+
+    def __eq__(self, other):
+        if isinstance(other, AsyncCollection):
+            us = (self.database, self.name)
+            them = (other.database, other.name)
+            return us == them
+        return NotImplemented
+
+    def __repr__(self):
+        return "AsyncCollection(%r, %r)" % (self.database, self.name)
+
+    @property
+    def __request(self):
+        return self.database.connection.request
+
+    def find(self, spec_or_id=None, fields={}, skip=0, limit=0, **kwargs):
+        """Query the database. Returns an :class:`AsyncCursor`; no request is
+        sent until it is iterated with ``async for``. See
+        :meth:`pymongolab.collection.Collection.find`.
+
+        Like the synchronous version, an ``_id`` value instead of a query
+        gets the document with that ``_id``, returning an awaitable of it.
+        """
+        if isinstance(spec_or_id, ObjectId) or \
+            isinstance(spec_or_id, compat.string_type):
+            return self.find_one(helpers._id_spec(spec_or_id), fields)
+        return AsyncCursor(self, spec_or_id, fields, skip, limit, **kwargs)
+
+    async def find_one(self, spec_or_id=None, fields={}, **kwargs):
+        """Returns the first document matched with the query or ``None``. See
+        :meth:`pymongolab.collection.Collection.find_one`.
+        """
+        params = helpers._find_one_params(spec_or_id, fields, kwargs)
+        document = await self.__request.list_documents(self.database.name,
+            self.name, **params)
+        return document or None
+
+    async def count(self, spec=None):
+        """Returns the number of documents matched with `spec`, counted by
+        REST API.
+        """
+        if not spec:
+            spec = {}
+        return await self.__request.list_documents(self.database.name,
+            self.name, spec=spec, count=True)
+
+    async def distinct(self, key):
+        """Get a list of distinct values for `key` among all documents in this
+        collection.
+        """
+        result = await self.database.command({'distinct': self.name,
+                                              'key': key})
+        return result['values']
+
+    async def insert(self, doc_or_docs):
+        """Insert a document or documents into this collection. See
+        :meth:`pymongolab.collection.Collection.insert`.
+        """
+        return await self.__request.insert_documents(self.database.name,
+            self.name, doc_or_docs)
+
+    async def update(self, spec, document, upsert=False, multi=False):
+        """Update a document or documents into this collection. See
+        :meth:`pymongolab.collection.Collection.update`.
+        """
+        return await self.__request.update_documents(self.database.name,
+            self.name, spec, document, upsert, multi)
+
+    async def remove(self, spec_or_id=None):
+        """Remove a document or documents into this collection. See
+        :meth:`pymongolab.collection.Collection.remove`.
+        """
+        if isinstance(spec_or_id, ObjectId) or \
+            isinstance(spec_or_id, compat.string_type):
+            return await self.__request.delete_document(self.database.name,
+                self.name, spec_or_id)
+        if not spec_or_id:
+            spec_or_id = {}
+        return await self.__request.delete_replace_documents(
+            self.database.name, self.name, spec_or_id, [])
+
+    async def find_and_modify(self, query={}, update=None, upsert=False,
+        sort=None, fields=None, **kwargs):
+        """Update and return an object. See
+        :meth:`pymongolab.collection.Collection.find_and_modify`.
+        """
+        kwargs = helpers._find_and_modify_command(query, update, upsert, sort,
+                                                  fields, kwargs)
+        out = await self.database.command("findAndModify", self.name,
+                                          **kwargs)
+        return helpers._find_and_modify_result(out)
+
+
+class AsyncCursor(object):
+    """Asynchronous version of :class:`~pymongolab.cursor.Cursor`, iterated
+    with ``async for``. No request is sent until the first document is
+    requested, then the results are fetched in pages of :meth:`batch_size`
+    documents.
+
+    When `max_time_ms` is given, all of pages must be fetched within that
+    many milliseconds from the first iteration, otherwise
+    :class:`~mongolabclient.errors.ExecutionTimeout` is raised.
+    """
+
+    def __init__(self, collection, spec=None, fields={}, skip=0, limit=0,
+        batch_size=0, max_time_ms=None, **kwargs):
+        self.collection = collection
+        self.__spec = spec or {}
+        self.__fields = helpers._fields_document(fields)
+        self.__skip = 0
+        self.__limit = 0
+        self.__batch_size = 0
+        self.__sort = None
+        self.__hint = None
+        self.__max_time_ms = None
+        self.__deadline = None
+        sort = kwargs.pop("sort", None)
+        hint = kwargs.pop("hint", None)
+        self.__kwargs = kwargs
+        self.__data = deque()
+        self.__retrieved = 0
+        self.__started = False
+        self.__exhausted = False
+        self.skip(skip)
+        self.limit(limit)
+        self.batch_size(batch_size)
+        self.max_time_ms(max_time_ms)
+        if sort:
+            self.__sort = helpers._sort_document(sort)
+        self.hint(hint)
+
+    def __check_okay_to_chain(self):
+        """Check if it is okay to chain more options onto this cursor."""
+        if self.__started:
+            raise errors.InvalidOperation("cannot set options after "
+                                          "executing query")
+
+    def sort(self, key_or_list, direction=None):
+        """Sorts this cursor's results. See
+        :meth:`pymongolab.cursor.Cursor.sort`."""
+        self.__check_okay_to_chain()
+        keys = helpers._index_list(key_or_list, direction)
+        self.__sort = helpers._index_document(keys)
+        return self
+
+    def hint(self, index):
+        """Tells REST API what index to use for the query of this cursor. See
+        :meth:`pymongolab.cursor.Cursor.hint`."""
+        self.__check_okay_to_chain()
+        self.__hint = helpers._hint_document(index)
+        return self
+
+    def max_time_ms(self, max_time_ms):
+        """Limits the milliseconds to iterate this cursor, shared by all of
+        its pages. See :meth:`pymongolab.cursor.Cursor.max_time_ms`."""
+        helpers._check_max_time_ms(max_time_ms)
+        self.__check_okay_to_chain()
+        self.__max_time_ms = max_time_ms
+        return self
+
+    def skip(self, skip):
+        """Skips the first `skip` results of this cursor."""
+        helpers._check_cursor_option("skip", skip)
+        self.__check_okay_to_chain()
+        self.__skip = skip
+        return self
+
+    def limit(self, limit):
+        """Limits the number of results to be returned by this cursor."""
+        helpers._check_cursor_option("limit", limit)
+        self.__check_okay_to_chain()
+        self.__limit = limit
+        return self
+
+    def batch_size(self, batch_size):
+        """Limits the number of documents requested on each page of
+        results."""
+        helpers._check_cursor_option("batch_size", batch_size)
+        self.__check_okay_to_chain()
+        self.__batch_size = batch_size
+        return self
+
+    @property
+    def alive(self):
+        """Does this cursor have the potential to return more data?"""
+        return bool(self.__data) or not self.__exhausted
+
+    async def __send_request(self):
+        """Fetch the next page of results, replacing the consumed one."""
+        page_size, kwargs = helpers._page_params(self.__spec, self.__fields,
+            self.__sort, self.__hint, self.__skip, self.__limit,
+            self.__batch_size or DEFAULT_BATCH_SIZE, self.__retrieved,
+            self.__kwargs)
+        r = self.collection.database.connection.request
+        timeout = None
+        if self.__deadline is not None:
+            timeout = self.__deadline - time.time()
+            if timeout <= 0:
+                raise errors.ExecutionTimeout()
+        try:
+            page = await asyncio.wait_for(r.list_documents(
+                self.collection.database.name, self.collection.name,
+                **kwargs), timeout)
+        except asyncio.TimeoutError:
+            raise errors.ExecutionTimeout()
+        self.__data = deque(page)
+        self.__retrieved += len(page)
+        if len(page) < page_size or \
+            (self.__limit and self.__retrieved >= self.__limit):
+            self.__exhausted = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.__started:
+            self.__started = True
+            self.__deadline = helpers._deadline(self.__max_time_ms)
+        if not self.__data and not self.__exhausted:
+            await self.__send_request()
+        if self.__data:
+            return self.__data.popleft()
+        raise StopAsyncIteration
+
+    async def to_list(self, length=None):
+        """Returns a list with the next `length` documents of this cursor, or
+        all of the remaining ones when `length` is ``None``."""
+        documents = []
+        async for document in self:
+            documents.append(document)
+            if length is not None and len(documents) >= length:
+                break
+        return documents
+
+    async def count(self, with_limit_and_skip=False):
+        """Get the size of the results set for this query, counted by REST
+        API. See :meth:`pymongolab.cursor.Cursor.count`.
+        """
+        if not isinstance(with_limit_and_skip, bool):
+            raise TypeError("with_limit_and_skip must be an instance of bool")
+        r = self.collection.database.connection.request
+        count = await r.list_documents(self.collection.database.name,
+            self.collection.name, spec=self.__spec, count=True)
+        if with_limit_and_skip:
+            count = helpers._count_with_limit_and_skip(count, self.__skip,
+                                                       self.__limit)
+        return count
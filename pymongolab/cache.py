@@ -0,0 +1,142 @@
+# -*- coding: utf-8 *-*
+"""Read-through cache of query results."""
+
+from collections import OrderedDict
+import threading
+import time
+
+from mongolabclient.codec import DEFAULT_CODEC
+
+
+class QueryCache(object):
+    """Thread-safe, read-through cache of query results with TTL and LRU
+    eviction, shared by all of collections of a
+    :class:`~pymongolab.mongo_client.MongoClient`.
+
+    Results of :meth:`~pymongolab.collection.Collection.find`,
+    :meth:`~pymongolab.collection.Collection.find_one`,
+    :meth:`~pymongolab.collection.Collection.count` and
+    :meth:`~pymongolab.collection.Collection.distinct` are stored encoded as
+    JSON, so every hit returns new objects and the size of an entry is known.
+    Writes through :meth:`~pymongolab.collection.Collection.insert`,
+    :meth:`~pymongolab.collection.Collection.update`,
+    :meth:`~pymongolab.collection.Collection.remove` and
+    :meth:`~pymongolab.collection.Collection.find_and_modify` invalidate all of
+    entries of their collection.
+
+    :Parameters:
+        - `ttl` (optional): seconds an entry is valid, ``None`` for no
+          expiration
+        - `max_entries` (optional): maximum number of entries
+        - `max_bytes` (optional): maximum size in bytes of all of entries,
+          ``None`` for no limit
+        - `codec` (optional): codec used to encode the entries, see
+          :mod:`mongolabclient.codec`
+
+    Example usage:
+
+    .. code-block:: python
+
+       >>> from pymongolab import MongoClient
+       >>> from pymongolab.cache import QueryCache
+       >>> con = MongoClient("MongoLabAPIKey",
+       ...                   query_cache=QueryCache(ttl=5, max_entries=500))
+       >>> con.database.collection.find_one({"name": "config"})
+       {u'_id': ObjectId('50243d38e4b00c3b3e75fc94'), u'name': u'config'}
+       >>> con.query_cache.stats()
+       {'hits': 0, 'misses': 1, 'evictions': 0, 'entries': 1, 'bytes': 67}
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, ttl=60, max_entries=1000, max_bytes=None, codec=None):
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+        if max_entries < 1:
+            raise ValueError("max_entries must be greater than 0")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.codec = codec or DEFAULT_CODEC
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.__generations = {}
+        self.__epoch = 0
+        self.__bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __remove(self, key):
+        expires, data = self.__entries.pop(key)
+        self.__bytes -= len(data)
+
+    def fetch(self, database, collection, query, loader):
+        """Returns the cached result of `query` on the collection, or the
+        result of calling `loader` when there is no valid entry for it, which
+        is stored for next calls.
+
+        :Parameters:
+            - `database`: name of the database
+            - `collection`: name of the collection
+            - `query`: a dict with every parameter of the read operation
+            - `loader`: a callable without arguments sending the query
+        """
+        key = (database, collection, self.codec.encode(query))
+        namespace = (database, collection)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                if entry[0] is None or entry[0] > time.time():
+                    self.__entries[key] = self.__entries.pop(key)
+                    self.hits += 1
+                    return self.codec.decode(entry[1])
+                self.__remove(key)
+            self.misses += 1
+            generation = (self.__epoch, self.__generations.get(namespace, 0))
+        result = loader()
+        data = self.codec.encode(result).encode("utf-8")
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return result
+        expires = None
+        if self.ttl is not None:
+            expires = time.time() + self.ttl
+        with self.__lock:
+            if (self.__epoch, self.__generations.get(namespace, 0)) != \
+                generation:
+                return result
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = (expires, data)
+            self.__bytes += len(data)
+            while len(self.__entries) > self.max_entries or \
+                (self.max_bytes is not None and
+                 self.__bytes > self.max_bytes):
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+        return result
+
+    def invalidate(self, database, collection):
+        """Remove all of entries of a collection."""
+        namespace = (database, collection)
+        with self.__lock:
+            self.__generations[namespace] = \
+                self.__generations.get(namespace, 0) + 1
+            for key in list(self.__entries):
+                if key[:2] == namespace:
+                    self.__remove(key)
+
+    def clear(self):
+        """Remove all of entries."""
+        with self.__lock:
+            self.__epoch += 1
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def stats(self):
+        """Returns a dict with the counters of this cache: ``hits``,
+        ``misses``, ``evictions``, ``entries`` and ``bytes``."""
+        with self.__lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions,
+                    "entries": len(self.__entries), "bytes": self.__bytes}
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 *-*
 from bson.objectid import ObjectId
 from collections import OrderedDict
-from pymongolab import cursor, helpers
+from mongolabclient import compat
+from pymongolab import cursor, helpers, results, writer
 
 
 class Collection(object):
@@ -42,6 +43,8 @@ class Collection(object):
        'database'), 'collection')
     """
 
+    __slots__ = ("__database", "__full_name", "name", "__weakref__")
+
     def __init__(self, database, name):
         self.__database = database
         self.name = name
@@ -72,12 +75,30 @@ class Collection(object):
     def __repr__(self):
         return "Collection(%r, %r)" % (self.database, self.name)
 
+    def _cached_read(self, query, loader):
+        """Returns the result of `loader` through the query cache of the
+        client, when it has one. `query` is a dict with every parameter of the
+        read operation.
+        """
+        cache = self.database.connection.query_cache
+        if cache is None:
+            return loader()
+        return cache.fetch(self.database.name, self.name, query, loader)
+
+    def _invalidate_cache(self):
+        """Remove cached results of this collection after a write."""
+        cache = self.database.connection.query_cache
+        if cache is not None:
+            cache.invalidate(self.database.name, self.name)
+
     def __iter__(self):
         return self
 
     def next(self):
         raise TypeError("'Collection' object is not iterable")
 
+    __next__ = next
+
     def find(self, spec_or_id=None, fields={}, skip=0, limit=0, **kwargs):
         """Query the database.
 
@@ -87,12 +108,28 @@ class Collection(object):
         :Parameters:
             - `spec` (optional): a dict specifying elements which must be
               present for a document to be included in the result set
-            - `fields` (optional): a dict specifying the fields to return
+            - `fields` (optional): a dict specifying the fields to return,
+              or a list of the names of the fields to return
             - `sort` (optional): a list of (key, direction) pairs specifying
               the sort order for this query.
+            - `hint` (optional): an index name or a list of (key, direction)
+              pairs of the index to use for this query
             - `skip` (optional): the number of documents to omit (from the
               start of the result set) when returning the results
             - `limit` (optional): the maximum number of results to return
+            - `batch_size` (optional): the number of documents requested on
+              each page of results
+            - `max_time_ms` (optional): the maximum milliseconds to iterate
+              the cursor, shared by all of its pages. When it is exceeded,
+              :class:`~mongolabclient.errors.ExecutionTimeout` is raised
+
+        No request is sent until the returned cursor is iterated, so
+        :meth:`~pymongolab.cursor.Cursor.sort`,
+        :meth:`~pymongolab.cursor.Cursor.skip`,
+        :meth:`~pymongolab.cursor.Cursor.limit`,
+        :meth:`~pymongolab.cursor.Cursor.batch_size`,
+        :meth:`~pymongolab.cursor.Cursor.hint` and
+        :meth:`~pymongolab.cursor.Cursor.max_time_ms` can be chained on it.
 
         Example usage:
 
@@ -106,15 +143,29 @@ class Collection(object):
            [{u'_id': ObjectId('50243d38e4b00c3b3e75fc94'), u'foo': u'bar',
            u'tld': u'com'}, {u'_id': ObjectId('50004d646cf431171ed53846'),
            u'foo': u'bar', u'tld': u'org'}]
+
+        The fields selected are projected by REST API, also when a document
+        is requested by its ``_id``:
+
+        .. code-block:: python
+
+           >>> con.database.collection.find(
+           ...     ObjectId('50243d38e4b00c3b3e75fc94'), ["foo"])
+           {u'_id': ObjectId('50243d38e4b00c3b3e75fc94'), u'foo': u'bar'}
+
+        .. versionchanged:: 1.3
+           `fields` can be a list of names of fields, and is applied to
+           documents requested by their ``_id``, which are got with
+           :meth:`find_one` and are ``None`` when they don't exist.
         """
         if isinstance(spec_or_id, ObjectId) or \
-            isinstance(spec_or_id, basestring):
-            return self.database.connection.request.view_document(
-                self.database.name, self.name, spec_or_id)
+            isinstance(spec_or_id, compat.string_type):
+            return self.find_one(spec_or_id, fields,
+                                 kwargs.get("max_time_ms"))
         return cursor.Cursor(self, spec_or_id, fields, skip, limit, **kwargs)
 
     def find_and_modify(self, query={}, update=None, upsert=False, sort=None,
-        **kwargs):
+        fields=None, **kwargs):
         """Update and return an object.
 
         This is a thin wrapper around the findAndModify_ command. The
@@ -137,52 +188,46 @@ class Collection(object):
             - `remove`: remove rather than updating (default ``False``)
             - `new`: return updated rather than original object
               (default ``False``)
-            - `fields`: see second argument to :meth:`find` (default all)
+            - `fields`: see second argument to :meth:`find` (default all).
+              The fields are projected by the command, so only them are
+              transferred
             - `**kwargs`: any other options the findAndModify_ command
               supports can be passed here.
 
         .. _findAndModify: http://dochub.mongodb.org/core/findAndModify
 
         .. versionadded:: 1.2
+
+        .. versionchanged:: 1.3
+           `fields` can be a list of names of fields.
         """
-        if (not update and not kwargs.get('remove', None)):
-            raise ValueError("Must either update or remove")
-        if (update and kwargs.get('remove', None)):
-            raise ValueError("Can't do both update and remove")
-        if query:
-            kwargs['query'] = query
-        if update:
-            kwargs['update'] = update
-        if upsert:
-            kwargs['upsert'] = upsert
-        if sort:
-            if isinstance(sort, list):
-                kwargs['sort'] = helpers._index_document(sort)
-            elif (isinstance(sort, OrderedDict) or isinstance(sort, dict) and
-                 len(sort) == 1):
-                kwargs['sort'] = sort
-            else:
-                raise TypeError("sort must be a list of (key, direction) "
-                                "pairs, a dict of len 1, or an instance of "
-                                "OrderedDict")
-        out = self.database.command("findAndModify", self.name, **kwargs)
-        if not out['ok']:
-            if out["errmsg"] == "No matching object found":
-                return None
-            else:
-                raise ValueError("Unexpected Error: %s" % (out,))
-        return out.get('value')
-
-    def find_one(self, spec_or_id=None, **kwargs):
+        kwargs = helpers._find_and_modify_command(query, update, upsert, sort,
+                                                  fields, kwargs)
+        try:
+            out = self.database.command("findAndModify", self.name, **kwargs)
+        finally:
+            self._invalidate_cache()
+        return helpers._find_and_modify_result(out)
+
+    def find_one(self, spec_or_id=None, fields={}, max_time_ms=None,
+        **kwargs):
         """Query the database.
 
         Return an instance of :class:`dict` with the first document of query
-        result on None if no results.
+        result on None if no results. The document is requested with the
+        ``fo`` parameter of REST API, so a single request is sent and no
+        cursor is created.
 
         :Paramaters:
             - `spec_or_id` (optional): a dict specifying elements which must be
               present for a document to be included in the result set or a _id
               value.
+            - `fields` (optional): a dict specifying the fields to return,
+              or a list of the names of the fields to return
+            - `sort` (optional): a list of (key, direction) pairs or a dict
+              specifying the sort order used to select the first document
+            - `max_time_ms` (optional): the maximum milliseconds to wait for
+              the document
 
         Example usage:
 
@@ -193,20 +238,100 @@ class Collection(object):
            >>> con.database.collection.find_one()
            {u'_id': ObjectId('50243d38e4b00c3b3e75fc94'), u'foo': u'bar',
            u'tld': u'com'}
+           >>> con.database.collection.find_one({"tld": "com"}, {"foo": 1})
+           {u'_id': ObjectId('50243d38e4b00c3b3e75fc94'), u'foo': u'bar'}
+
+        A document requested by its ``_id`` is requested with an
+        ``{"_id": _id}`` query too, so REST API projects it, and ``None`` is
+        returned when it doesn't exist. Strings of valid ObjectIds match an
+        ObjectId, like in the url of the document.
+
+        .. versionchanged:: 1.3
+           Added `fields` and `max_time_ms` parameters. Documents requested by
+           their ``_id`` that don't exist are ``None`` instead of raising an
+           exception.
         """
-        if isinstance(spec_or_id, ObjectId) or \
-            isinstance(spec_or_id, basestring):
-            return self.database.connection.request.view_document(
-                self.database.name, self.name, spec_or_id)
-        if not spec_or_id:
-            spec_or_id = {}
-        documents = self.find(spec_or_id, limit=1, **kwargs)
-        if not documents.count():
-            return None
-        return documents[0]
-
-    def count(self):
-        """Returns the number of documents into a collection.
+        params = helpers._find_one_params(spec_or_id, fields, kwargs)
+        request = self.database.connection.request
+        deadline = helpers._deadline(max_time_ms)
+        document = self._cached_read(params,
+            lambda: request.list_documents(self.database.name, self.name,
+                deadline=deadline, **params))
+        return document or None
+
+    def find_by_ids(self, ids, fields=None, chunk_size=500, max_bytes=4096,
+        workers=4, max_time_ms=None):
+        """Get many documents by their ``_id`` with a few queries.
+
+        The ids are split into chunks of at most `chunk_size` ids whose
+        URL-encoded query takes at most `max_bytes` bytes, so URLs stay
+        under the limits of HTTP servers. Each chunk is requested with an
+        ``{"_id": {"$in": [...]}}`` query, and up to `workers` chunks are
+        requested concurrently.
+
+        Returns a list with a document for each id, in the order of `ids`.
+        The ids not found are ``None``. Like in :meth:`find_one`, strings of
+        valid ObjectIds match an ObjectId.
+
+        :Parameters:
+            - `ids`: a list of ``_id`` values
+            - `fields` (optional): a dict specifying the fields to return,
+              or a list of their names; ``_id`` is always returned
+            - `chunk_size` (optional): maximum number of ids per request
+            - `max_bytes` (optional): maximum size in bytes of the
+              URL-encoded ``{"_id": {"$in": [...]}}`` query of each request
+            - `workers` (optional): maximum number of concurrent requests
+            - `max_time_ms` (optional): the maximum milliseconds to wait for
+              all of documents
+
+        Example usage:
+
+        .. code-block:: python
+
+           >>> from pymongolab import MongoClient
+           >>> con = MongoClient("MongoLabAPIKey")
+           >>> con.database.collection.find_by_ids([
+           ...     ObjectId('50243d38e4b00c3b3e75fc94'),
+           ...     ObjectId('50004d646cf431171ed53846')], {"foo": 1})
+           [{u'_id': ObjectId('50243d38e4b00c3b3e75fc94'), u'foo': u'bar'},
+           None]
+
+        .. versionadded:: 1.3
+        """
+        request = self.database.connection.request
+        ids = [helpers._id_spec(_id)["_id"] for _id in ids]
+        keys = [request.codec.encode(_id) for _id in ids]
+        unique = list(OrderedDict(zip(keys, ids)).values())
+        fields = helpers._fields_document(fields)
+        if fields:
+            fields = dict(fields)
+            if not fields.get("_id", 1):
+                del fields["_id"]
+        deadline = helpers._deadline(max_time_ms)
+        chunks = helpers._split_documents(unique, chunk_size, max_bytes,
+            lambda chunk: compat.quote_plus(
+                request.codec.encode({"_id": {"$in": chunk}})))
+
+        def find_chunk(chunk):
+            spec = {"_id": {"$in": chunk}}
+            return self._cached_read({"find": spec, "fields": fields},
+                lambda: request.list_documents(self.database.name, self.name,
+                    spec=spec, fields=fields or {}, limit=len(chunk),
+                    deadline=deadline))
+
+        documents = {}
+        for index, found in helpers._fan_out(find_chunk, chunks, workers):
+            for document in found:
+                documents[request.codec.encode(document["_id"])] = document
+        return [documents.get(key) for key in keys]
+
+    def count(self, spec=None):
+        """Returns the number of documents into a collection. The documents are
+        counted by REST API, so only a number is transferred.
+
+        :Parameters:
+            - `spec` (optional): a dict specifying elements which must be
+              present for a document to be counted
 
         Example usage:
 
@@ -216,8 +341,18 @@ class Collection(object):
            >>> con = MongoClient("MongoLabAPIKey")
            >>> con.database.collection.count()
            22
+           >>> con.database.collection.count({"foo": "bar"})
+           7
+
+        .. versionchanged:: 1.3
+           Added `spec` parameter.
         """
-        return len(self.find())
+        if not spec:
+            spec = {}
+        request = self.database.connection.request
+        return self._cached_read({"count": spec},
+            lambda: request.list_documents(self.database.name, self.name,
+                spec=spec, count=True))
 
     def distinct(self, key):
         """Get a list of distinct values for `key` among all documents in this
@@ -237,11 +372,13 @@ class Collection(object):
 
         .. versionadded:: 1.2
         """
-        return self.database.command({'distinct': self.name,
-                                      'key': key})['values']
+        return self._cached_read({"distinct": key},
+            lambda: self.database.command({'distinct': self.name,
+                                           'key': key})['values'])
 
-    def insert(self, doc_or_docs):
-        """Insert a document or documents into this collection.
+    def insert(self, doc_or_docs, max_time_ms=None):
+        """Insert a document or documents into this collection. The request
+        is limited to `max_time_ms` milliseconds when it is given.
 
         Example usage:
 
@@ -263,12 +400,101 @@ class Collection(object):
         :class:`dict` of inserted document including as attribute `_id` an
         instance of :class:`bson.objectid.ObjectId`. Else, this function
         returns the number of inserted documents.
+
+        .. versionchanged:: 1.3
+           Added `max_time_ms` parameter.
+        """
+        deadline = helpers._deadline(max_time_ms)
+        try:
+            return self.database.connection.request.insert_documents(
+                self.database.name, self.name, doc_or_docs, deadline)
+        finally:
+            self._invalidate_cache()
+
+    def insert_many(self, documents, chunk_size=1000, max_bytes=0,
+        workers=1):
+        """Insert a large list of documents into this collection.
+
+        The documents are split into chunks of at most `chunk_size` documents
+        and, when `max_bytes` is given, at most `max_bytes` bytes of JSON. The
+        chunks are inserted concurrently by up to `workers` threads through
+        the pooled connections of the client, so `workers` should not be
+        greater than its ``max_pool_size``.
+
+        Returns an instance of :class:`~pymongolab.results.InsertManyResult`.
+        A failed chunk does not stop the other ones; it is reported on
+        :attr:`~pymongolab.results.InsertManyResult.failures`.
+
+        :Parameters:
+            - `documents`: a list of dicts to insert
+            - `chunk_size` (optional): maximum number of documents per request
+            - `max_bytes` (optional): maximum size in bytes of each request
+              body
+            - `workers` (optional): number of requests sent concurrently
+
+        Example usage:
+
+        .. code-block:: python
+
+           >>> from pymongolab import MongoClient
+           >>> con = MongoClient("MongoLabAPIKey", max_pool_size=8)
+           >>> docs = [{"i": i} for i in range(100000)]
+           >>> result = con.database.collection.insert_many(docs,
+           ...     chunk_size=5000, max_bytes=1024 * 1024, workers=8)
+           >>> result.inserted_count, result.failures
+           (100000, [])
+
+        .. versionadded:: 1.3
+        """
+        if not isinstance(documents, list):
+            raise TypeError("documents must be an instance of list")
+        if workers < 1:
+            raise ValueError("workers must be greater than 0")
+        request = self.database.connection.request
+        chunks = helpers._split_documents(documents, chunk_size, max_bytes,
+                                          request.codec.encode)
+
+        def insert_chunk(chunk):
+            return request.insert_documents(self.database.name, self.name,
+                                            chunk)["n"]
+
+        result = results.InsertManyResult(len(chunks))
+        try:
+            for index, n, error in helpers._run_parallel(insert_chunk, chunks,
+                                                         workers):
+                if error is not None:
+                    result._add_failure(index, chunks[index], error)
+                else:
+                    result._add_inserted(n)
+        finally:
+            self._invalidate_cache()
+        return result
+
+    def buffered_writer(self, max_docs=1000, max_bytes=0, flush_interval=1.0,
+        max_buffered=10000, on_error=None, max_failures=100):
+        """Returns a :class:`~pymongolab.writer.BufferedWriter`, which inserts
+        documents into this collection in bulk from a background thread.
+
+        Example usage:
+
+        .. code-block:: python
+
+           >>> from pymongolab import MongoClient
+           >>> con = MongoClient("MongoLabAPIKey")
+           >>> writer = con.database.events.buffered_writer(max_docs=500,
+           ...                                              flush_interval=2)
+           >>> writer.insert({"type": "click"})
+           >>> writer.close()
+
+        .. versionadded:: 1.3
         """
-        return self.database.connection.request.insert_documents(
-            self.database.name, self.name, doc_or_docs)
+        return writer.BufferedWriter(self, max_docs, max_bytes, flush_interval,
+                                     max_buffered, on_error, max_failures)
 
-    def update(self, spec, document, upsert=False, multi=False):
-        """Update a document or documents into this collection.
+    def update(self, spec, document, upsert=False, multi=False,
+        max_time_ms=None):
+        """Update a document or documents into this collection. The request
+        is limited to `max_time_ms` milliseconds when it is given.
 
         Example usage:
 
@@ -294,9 +520,17 @@ class Collection(object):
            Update operation defaults affects to first document that matchs with
            `spec` parameter. Then for other usages it's better to use `multi`
            parameter on `True`.
+
+        .. versionchanged:: 1.3
+           Added `max_time_ms` parameter.
         """
-        return self.database.connection.request.update_documents(
-            self.database.name, self.name, spec, document, upsert, multi)
+        deadline = helpers._deadline(max_time_ms)
+        try:
+            return self.database.connection.request.update_documents(
+                self.database.name, self.name, spec, document, upsert, multi,
+                deadline)
+        finally:
+            self._invalidate_cache()
 
     def reindex(self):
         """Rebuilds all indexes on this collection.
@@ -322,8 +556,9 @@ class Collection(object):
         del result['serverUsed']
         return result
 
-    def remove(self, spec_or_id=None):
-        """Remove a document or documents into this collection.
+    def remove(self, spec_or_id=None, max_time_ms=None):
+        """Remove a document or documents into this collection. The request
+        is limited to `max_time_ms` milliseconds when it is given.
 
         Example usage:
 
@@ -337,12 +572,19 @@ class Collection(object):
            >>> #Deleting all documents
            ... con.database.collection.remove()
            22
+
+        .. versionchanged:: 1.3
+           Added `max_time_ms` parameter.
         """
-        if isinstance(spec_or_id, ObjectId) or \
-            isinstance(spec_or_id, basestring):
-            return self.database.connection.request.delete_document(
-                self.database.name, self.name, spec_or_id)
-        if not spec_or_id:
-            spec_or_id = {}
-        return self.database.connection.request.delete_replace_documents(
-            self.database.name, self.name, spec_or_id, [])
+        deadline = helpers._deadline(max_time_ms)
+        try:
+            if isinstance(spec_or_id, ObjectId) or \
+                isinstance(spec_or_id, compat.string_type):
+                return self.database.connection.request.delete_document(
+                    self.database.name, self.name, spec_or_id, deadline)
+            if not spec_or_id:
+                spec_or_id = {}
+            return self.database.connection.request.delete_replace_documents(
+                self.database.name, self.name, spec_or_id, [], deadline)
+        finally:
+            self._invalidate_cache()
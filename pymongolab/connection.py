@@ -1,5 +1,5 @@
 # -*- coding: utf-8 *-*
-from pymongolab import database
+from pymongolab import database, helpers
 from mongolabclient import MongoLabClient
 
 
@@ -36,10 +36,14 @@ class Connection(object):
        Connection('MongoLabAPIKey', 'v1')
    """
 
-    def __init__(self, api_key, version="v1", proxy_url=None):
+    def __init__(self, api_key, version="v1", proxy_url=None,
+        query_cache=None, **kwargs):
         self.api_key = api_key
         self.version = version
-        self.__request = MongoLabClient(api_key, version, proxy_url)
+        self.__query_cache = query_cache
+        self.__databases = helpers._HandleCache(
+            lambda name: database.Database(self, name))
+        self.__request = MongoLabClient(api_key, version, proxy_url, **kwargs)
 
     @property
     def request(self):
@@ -48,6 +52,25 @@ class Connection(object):
         """
         return self.__request
 
+    @property
+    def query_cache(self):
+        """An instance of :class:`pymongolab.cache.QueryCache` used to cache
+        the results of queries of this client, or ``None`` when results are
+        not cached.
+
+        .. versionadded:: 1.3
+        """
+        return self.__query_cache
+
+    def close(self):
+        """Close all of pooled HTTP connections used by this client and every
+        :class:`~pymongolab.database.Database` and
+        :class:`~pymongolab.collection.Collection` derived from it.
+
+        .. versionadded:: 1.3
+        """
+        self.request.close()
+
     def __eq__(self, other):
         if isinstance(other, Connection):
             us = (self.api_key, self.version)
@@ -70,7 +93,11 @@ class Connection(object):
            >>> con.database
            Database(Connection('MongoLabAPIKey', 'v1'), 'database')
         """
-        return database.Database(self, name)
+        if name.startswith("_"):
+            raise AttributeError("Connection has no attribute %r. To access "
+                                 "the %s database, use client[%r]."
+                                 % (name, name, name))
+        return self.__databases[name]
 
     def __getitem__(self, name):
         """Get a database using a dictionary-style access.
@@ -84,7 +111,7 @@ class Connection(object):
            >>> db = con["database"]
            Database(Connection('MongoLabAPIKey', 'v1'), 'database')
         """
-        return self.__getattr__(name)
+        return self.__databases[name]
 
     def database_names(self):
         """Returns a list with your database names.
@@ -99,3 +126,57 @@ class Connection(object):
            [u'database', u'otherdatabase']
         """
         return self.request.list_databases()
+
+    def map_find(self, queries, workers=4, **kwargs):
+        """Run several queries concurrently on any database and collection.
+
+        Returns a generator yielding ``(full_name, documents)`` tuples, where
+        `full_name` is the ``database.collection`` name of the query and
+        `documents` is the list of its results, as soon as each query
+        finishes. The queries are sent by up to `workers` threads through the
+        pooled connections of this client, so the elapsed time is close to
+        the slowest query instead of the sum of all of them. The first error
+        cancels the pending queries and is raised.
+
+        :Parameters:
+            - `queries`: a list of ``(database, collection, spec)`` tuples
+            - `workers` (optional): maximum number of concurrent queries
+            - `**kwargs` (optional): any other argument of
+              :meth:`~pymongolab.collection.Collection.find` applied to every
+              query
+
+        Example usage:
+
+        .. code-block:: python
+
+           >>> from pymongolab import Connection
+           >>> con = Connection("MongoLabAPIKey")
+           >>> for name, docs in con.map_find([("db1", "users", {}),
+           ...                                 ("db2", "users", {})]):
+           ...     print name, len(docs)
+           db2.users 12
+           db1.users 7
+
+        .. versionadded:: 1.3
+        """
+        return helpers._map_find(self, queries, workers, kwargs)
+
+    def map_command(self, commands, workers=4):
+        """Run several database commands concurrently. Returns a generator
+        yielding ``(database, result)`` tuples as soon as each command
+        finishes, like :meth:`map_find`.
+
+        :Parameters:
+            - `commands`: a list of ``(database, command)`` tuples, where
+              `command` is any value accepted by
+              :meth:`~pymongolab.database.Database.command`
+            - `workers` (optional): maximum number of concurrent commands
+
+        .. code-block:: python
+
+           >>> names = con.database_names()
+           >>> dict(con.map_command([(name, "dbStats") for name in names]))
+
+        .. versionadded:: 1.3
+        """
+        return helpers._map_command(self, commands, workers)
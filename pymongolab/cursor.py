@@ -1,45 +1,382 @@
 # -*- coding: utf-8 *-*
+from mongolabclient import compat, errors
+from pymongolab import helpers
+
+DEFAULT_BATCH_SIZE = 1000
+"""Number of documents requested per page when no ``batch_size`` is set. It
+matches the default page size of MongoLab REST API."""
 
 
 class Cursor(object):
     """A cursor / iterator over MongoLab REST API query results.
+
+    No request is sent until the first document is requested. Then the results
+    are fetched in pages of :meth:`batch_size` documents using the ``sk`` and
+    ``l`` parameters of REST API. Every page is streamed: each document is
+    returned as soon as it has been downloaded and parsed, and it is not kept
+    by the cursor afterwards.
+
+    Example usage:
+
+    .. code-block:: python
+
+       >>> from pymongolab import MongoClient
+       >>> con = MongoClient("MongoLabAPIKey")
+       >>> cursor = con.database.collection.find().skip(10).limit(50)
+       >>> for doc in cursor.batch_size(20):
+       ...     print doc["_id"]
+
+    Every option set before the first iteration, including :meth:`sort` and
+    :meth:`hint`, is sent to REST API with the query, so only the documents
+    selected are transferred:
+
+    .. code-block:: python
+
+       >>> from pymongolab import DESCENDING
+       >>> cursor = con.database.collection.find({"tld": "com"})
+       >>> cursor.sort("created", DESCENDING).hint([("tld", 1)]).limit(10)
+
+    When `max_time_ms` is given, all of pages must be fetched within that
+    many milliseconds from the first iteration, otherwise
+    :class:`~mongolabclient.errors.ExecutionTimeout` is raised.
     """
 
+    __slots__ = ("collection", "__spec", "__fields", "__skip", "__limit",
+                 "__batch_size", "__sort", "__hint", "__max_time_ms",
+                 "__deadline", "__kwargs",
+                 "__empty", "__page", "__page_size", "__page_retrieved",
+                 "__retrieved", "__started", "__exhausted", "__weakref__")
+
     def __init__(self, collection, spec_or_id=None, fields={}, skip=0, limit=0,
-        **kwargs):
+        batch_size=0, max_time_ms=None, **kwargs):
         self.collection = collection
         if not spec_or_id:
             spec_or_id = {}
-        kwargs["spec"] = spec_or_id
-        kwargs["fields"] = fields
-        kwargs["skip"] = skip
-        kwargs["limit"] = limit
-        r = self.collection.database.connection.request
-        self.__data = r.list_documents(self.collection.database.name,
-            self.collection.name, **kwargs)
-        self.__index = 0
-        self.__count = len(self.__data)
-
-    def __getitem__(self, index_or_slice):
-        if isinstance(index_or_slice, int) or \
-            isinstance(index_or_slice, slice):
-            return self.__data[index_or_slice]
-        raise TypeError("index_or_slice must be an instance of int or slice")
+        self.__spec = spec_or_id
+        self.__fields = helpers._fields_document(fields)
+        self.__skip = 0
+        self.__limit = 0
+        self.__batch_size = 0
+        self.__sort = None
+        self.__hint = None
+        self.__max_time_ms = None
+        self.__deadline = None
+        sort = kwargs.pop("sort", None)
+        hint = kwargs.pop("hint", None)
+        self.__kwargs = kwargs
+        self.__empty = False
+        self.__page = None
+        self.rewind()
+        self.skip(skip)
+        self.limit(limit)
+        self.batch_size(batch_size)
+        self.max_time_ms(max_time_ms)
+        if sort:
+            self.__sort = helpers._sort_document(sort)
+        self.hint(hint)
 
-    def __iter__(self):
+    def __check_okay_to_chain(self):
+        """Check if it is okay to chain more options onto this cursor."""
+        if self.__started:
+            raise errors.InvalidOperation("cannot set options after "
+                                          "executing query")
+
+    def rewind(self):
+        """Rewind this cursor to its unevaluated state.
+
+        Reset this cursor if it has been partially or completely evaluated.
+        Any options that are present on the cursor will remain in effect.
+        Future iterating performed on this cursor will cause new queries to
+        be sent to MongoLab REST API.
+
+        .. versionadded:: 1.3
+        """
+        self.close()
+        self.__retrieved = 0
+        self.__started = False
+        self.__exhausted = False
+        return self
+
+    def close(self):
+        """Close the page of results being downloaded, if any. The cursor
+        won't return more documents until it is rewound.
+
+        .. versionadded:: 1.3
+        """
+        if self.__page is not None:
+            self.__page.close()
+            self.__page = None
+        self.__exhausted = True
+
+    def clone(self):
+        """Get a clone of this cursor.
+
+        Returns a new Cursor instance with options matching those that have
+        been set on the current instance. The clone will be completely
+        unevaluated, even if the current instance has been partially or
+        completely evaluated.
+
+        .. versionadded:: 1.3
+        """
+        clone = Cursor(self.collection, self.__spec, self.__fields,
+                       self.__skip, self.__limit, self.__batch_size,
+                       self.__max_time_ms, **self.__kwargs)
+        clone.__sort = self.__sort
+        clone.__hint = self.__hint
+        clone.__empty = self.__empty
+        return clone
+
+    def skip(self, skip):
+        """Skips the first `skip` results of this cursor.
+
+        Raises :class:`TypeError` if `skip` is not an integer. Raises
+        :class:`ValueError` if `skip` is less than ``0``. Raises
+        :class:`~mongolabclient.errors.InvalidOperation` if this cursor has
+        already been used.
+
+        :Parameters:
+            - `skip`: the number of results to skip
+
+        .. versionadded:: 1.3
+        """
+        helpers._check_cursor_option("skip", skip)
+        self.__check_okay_to_chain()
+        self.__skip = skip
         return self
 
-    def __len__(self):
-        return self.__count
+    def limit(self, limit):
+        """Limits the number of results to be returned by this cursor.
+
+        A limit of ``0`` is equivalent to no limit. Raises :class:`TypeError`
+        if `limit` is not an integer. Raises
+        :class:`~mongolabclient.errors.InvalidOperation` if this cursor has
+        already been used.
+
+        :Parameters:
+            - `limit`: the number of results to return
+
+        .. versionadded:: 1.3
+        """
+        helpers._check_cursor_option("limit", limit)
+        self.__check_okay_to_chain()
+        self.__empty = False
+        self.__limit = limit
+        return self
+
+    def batch_size(self, batch_size):
+        """Limits the number of documents requested on each page of results.
+
+        A batch size of ``0`` uses :data:`DEFAULT_BATCH_SIZE`. Raises
+        :class:`TypeError` if `batch_size` is not an integer. Raises
+        :class:`ValueError` if `batch_size` is less than ``0``. Raises
+        :class:`~mongolabclient.errors.InvalidOperation` if this cursor has
+        already been used.
+
+        :Parameters:
+            - `batch_size`: the size of each page of results
+
+        .. versionadded:: 1.3
+        """
+        helpers._check_cursor_option("batch_size", batch_size)
+        self.__check_okay_to_chain()
+        self.__batch_size = batch_size
+        return self
+
+    def sort(self, key_or_list, direction=None):
+        """Sorts this cursor's results.
+
+        Pass a field name and a direction, either
+        :data:`~pymongolab.ASCENDING` or :data:`~pymongolab.DESCENDING`, or a
+        list of (key, direction) pairs. The documents are sorted by REST API.
+        Raises :class:`~mongolabclient.errors.InvalidOperation` if this cursor
+        has already been used.
+
+        :Parameters:
+            - `key_or_list`: a single key or a list of (key, direction) pairs
+              specifying the keys to sort on
+            - `direction` (optional): only used if `key_or_list` is a single
+              key, if not given :data:`~pymongolab.ASCENDING` is assumed
+
+        .. versionadded:: 1.3
+        """
+        self.__check_okay_to_chain()
+        keys = helpers._index_list(key_or_list, direction)
+        self.__sort = helpers._index_document(keys)
+        return self
+
+    def hint(self, index):
+        """Tells REST API what index to use for the query of this cursor.
+
+        `index` is the name of an index or a list of (key, direction) pairs,
+        like the index specifier given to create it. ``None`` clears any
+        hint. Raises :class:`~mongolabclient.errors.InvalidOperation` if this
+        cursor has already been used.
+
+        .. warning::
+
+           REST API has no parameter for hints, so the query is sent wrapped
+           into the ``{"$query": ..., "$orderby": ..., "$hint": ...}`` query
+           modifiers document of MongoDB in the ``q`` parameter. Check that
+           your REST API endpoint honours it before relying on it.
+
+        :Parameters:
+            - `index`: index to hint on
+
+        .. versionadded:: 1.3
+        """
+        self.__check_okay_to_chain()
+        self.__hint = helpers._hint_document(index)
+        return self
+
+    def max_time_ms(self, max_time_ms):
+        """Limits the milliseconds to iterate this cursor, shared by all of
+        its pages. Each page is requested with the remaining time as its
+        deadline, and :class:`~mongolabclient.errors.ExecutionTimeout` is
+        raised once it is exceeded. ``None`` means no limit.
+
+        Raises :class:`TypeError` if `max_time_ms` is not an integer or
+        ``None``. Raises :class:`~mongolabclient.errors.InvalidOperation` if
+        this cursor has already been used.
+
+        :Parameters:
+            - `max_time_ms`: the time limit in milliseconds
+
+        .. versionadded:: 1.3
+        """
+        helpers._check_max_time_ms(max_time_ms)
+        self.__check_okay_to_chain()
+        self.__max_time_ms = max_time_ms
+        return self
+
+    @property
+    def alive(self):
+        """Does this cursor have the potential to return more data?
+
+        .. versionadded:: 1.3
+        """
+        return self.__page is not None or not (self.__exhausted or
+                                                self.__empty)
+
+    def __send_request(self):
+        """Fetch the next page of results, replacing the consumed one."""
+        page_size, kwargs = helpers._page_params(self.__spec, self.__fields,
+            self.__sort, self.__hint, self.__skip, self.__limit,
+            self.__batch_size or DEFAULT_BATCH_SIZE, self.__retrieved,
+            self.__kwargs)
+        connection = self.collection.database.connection
+        r = connection.request
+        if connection.query_cache is None:
+            self.__page = r.list_documents(self.collection.database.name,
+                self.collection.name, stream=True, deadline=self.__deadline,
+                **kwargs)
+        else:
+            page = self.collection._cached_read(dict(kwargs, find=True),
+                lambda: r.list_documents(self.collection.database.name,
+                    self.collection.name, deadline=self.__deadline,
+                    **kwargs))
+            self.__page = (document for document in page)
+        self.__page_size = page_size
+        self.__page_retrieved = 0
+
+    def __next_document(self):
+        """Returns the next document of the current page, or ``None`` when the
+        page has been consumed."""
+        for document in self.__page:
+            self.__retrieved += 1
+            self.__page_retrieved += 1
+            return document
+        self.__page = None
+        if self.__page_retrieved < self.__page_size or \
+            (self.__limit and self.__retrieved >= self.__limit):
+            self.__exhausted = True
+        return None
+
+    def __getitem__(self, index):
+        """Get a single document or a slice of documents from this cursor.
+
+        An integer index sends a query for that document only and returns it,
+        raising :class:`IndexError` if there is no such document. A slice
+        applies the equivalent :meth:`skip` and :meth:`limit` to this cursor
+        and returns it.
+        """
+        self.__check_okay_to_chain()
+        self.__empty = False
+        if isinstance(index, slice):
+            if index.step is not None:
+                raise IndexError("Cursor instances do not support slice "
+                                 "steps")
+            skip = 0
+            if index.start is not None:
+                if index.start < 0:
+                    raise IndexError("Cursor instances do not support "
+                                     "negative indices")
+                skip = index.start
+            if index.stop is not None:
+                limit = index.stop - skip
+                if limit < 0:
+                    raise IndexError("stop index must be greater than start "
+                                     "index for slice %r" % index)
+                if limit == 0:
+                    self.__empty = True
+            else:
+                limit = 0
+            self.__skip = skip
+            self.__limit = limit
+            return self
+        if isinstance(index, compat.integer_types):
+            if index < 0:
+                raise IndexError("Cursor instances do not support negative "
+                                 "indices")
+            clone = self.clone()
+            clone.skip(index + self.__skip)
+            clone.limit(1)
+            for doc in clone:
+                return doc
+            raise IndexError("no such item for Cursor instance")
+        raise TypeError("index %r cannot be applied to Cursor "
+                        "instances" % index)
+
+    def __iter__(self):
+        return self
 
     def next(self):
         """Iterate the current cursor with result set."""
-        if self.__index >= self.__count:
+        if self.__empty:
             raise StopIteration
-        item = self.__data[self.__index]
-        self.__index += 1
-        return item
+        if not self.__started:
+            self.__started = True
+            self.__deadline = helpers._deadline(self.__max_time_ms)
+        while self.__page is not None or not self.__exhausted:
+            if self.__page is None:
+                self.__send_request()
+            document = self.__next_document()
+            if document is not None:
+                return document
+        raise StopIteration
+
+    __next__ = next
+
+    def count(self, with_limit_and_skip=False):
+        """Get the size of the results set for this query.
+
+        The documents are counted by REST API, so only a number is transferred
+        no matter how many documents match the query.
+
+        :Parameters:
+            - `with_limit_and_skip` (optional): take any :meth:`limit` or
+              :meth:`skip` that has been applied to this cursor into account
+              when getting the count
 
-    def count(self):
-        """Get the size of the results set for this query."""
-        return self.__count
+        .. versionchanged:: 1.3
+           Added `with_limit_and_skip` parameter. The count is performed by
+           REST API and ignores :meth:`limit` and :meth:`skip` by default.
+        """
+        if not isinstance(with_limit_and_skip, bool):
+            raise TypeError("with_limit_and_skip must be an instance of bool")
+        count = self.collection.count(self.__spec)
+        if with_limit_and_skip:
+            if self.__empty:
+                return 0
+            count = helpers._count_with_limit_and_skip(count, self.__skip,
+                                                       self.__limit)
+        return count
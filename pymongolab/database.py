@@ -1,6 +1,5 @@
 # -*- coding: utf-8 *-*
-from collections import OrderedDict
-from pymongolab import collection
+from pymongolab import collection, helpers
 
 
 class Database(object):
@@ -35,8 +34,11 @@ class Database(object):
        Database(MongoClient('MongoLabAPIKey', 'v1'), 'database')
     """
 
+    __slots__ = ("__connection", "__collections", "name", "__weakref__")
+
     def __init__(self, connection, name):
         self.__connection = connection
+        self.__collections = None
         self.name = name
 
     @property
@@ -56,6 +58,12 @@ class Database(object):
     def __repr__(self):
         return "Database(%r, %r)" % (self.connection, self.name)
 
+    def __collection(self, name):
+        if self.__collections is None:
+            self.__collections = helpers._HandleCache(
+                lambda name: collection.Collection(self, name))
+        return self.__collections[name]
+
     def __getattr__(self, name):
         """Get a collection using a attribute-style access.
 
@@ -70,7 +78,11 @@ class Database(object):
            Collection(Database(MongoClient('MongoLabAPIKey', 'v1'),
            'database'), 'collection')
         """
-        return collection.Collection(self, name)
+        if name.startswith("_"):
+            raise AttributeError("Database has no attribute %r. To access "
+                                 "the %s collection, use database[%r]."
+                                 % (name, name, name))
+        return self.__collection(name)
 
     def __getitem__(self, name):
         """Get a database using a dictionary-style access.
@@ -86,7 +98,7 @@ class Database(object):
            Collection(Database(MongoClient('MongoLabAPIKey', 'v1'),
            'database'), 'collection')
         """
-        return self.__getattr__(name)
+        return self.__collection(name)
 
     def collection_names(self):
         """Returns a list with the collection names of your database.
@@ -102,7 +114,46 @@ class Database(object):
         """
         return self.connection.request.list_collections(self.name)
 
-    def command(self, command, value=1, **kwargs):
+    def find_across(self, collections=None, spec=None, workers=4, **kwargs):
+        """Run the same query concurrently on several collections of this
+        database.
+
+        Returns a generator yielding ``(collection_name, documents)`` tuples
+        as soon as the query on each collection finishes. See
+        :meth:`~pymongolab.mongo_client.MongoClient.map_find`.
+
+        :Parameters:
+            - `collections` (optional): a list of collection names, by default
+              all of collections of this database except ``system.*`` ones
+            - `spec` (optional): a dict specifying elements which must be
+              present for a document to be included in the results
+            - `workers` (optional): maximum number of concurrent queries
+            - `**kwargs` (optional): any other argument of
+              :meth:`~pymongolab.collection.Collection.find`
+
+        Example usage:
+
+        .. code-block:: python
+
+           >>> from pymongolab import MongoClient
+           >>> con = MongoClient("MongoLabAPIKey")
+           >>> dict(con.database.find_across(["users", "issues"],
+           ...                               {"owner": "me"}))
+           {u'issues': [...], u'users': [...]}
+
+        .. versionadded:: 1.3
+        """
+        if collections is None:
+            collections = [name for name in self.collection_names()
+                           if not name.startswith("system.")]
+        queries = [(self.name, name, spec) for name in collections]
+        prefix = len(self.name) + 1
+        for full_name, documents in helpers._map_find(self.connection,
+                                                      queries, workers,
+                                                      kwargs):
+            yield full_name[prefix:], documents
+
+    def command(self, command, value=1, max_time_ms=None, **kwargs):
         """Execute a database-collection level command via
         :func:`mongolabclient.client.MongoLabClient.run_command`. The supported
         methods are listed on MongoLab REST API Documentation:
@@ -146,14 +197,17 @@ class Database(object):
            u'nindexes': 1, u'storageSize': 8192,
            u'indexSizes': {u'_id_': 8176},
            u'paddingFactor': 1.0020000000000007, u'size': 1812}
+
+        The request is limited to `max_time_ms` milliseconds when it is given,
+        raising :class:`~mongolabclient.errors.ExecutionTimeout` when it is
+        exceeded.
+
+        .. versionchanged:: 1.3
+           Added `max_time_ms` parameter.
         """
-        cmd = OrderedDict()
-        if isinstance(command, dict):
-            cmd.update(command)
-        elif isinstance(command, basestring):
-            cmd[command] = str(value)
-        cmd.update(kwargs)
-        return self.connection.request.run_command(self.name, cmd)
+        deadline = helpers._deadline(max_time_ms)
+        cmd = helpers._command_document(command, value, kwargs)
+        return self.connection.request.run_command(self.name, cmd, deadline)
 
     def error(self):
         """Get a database error if one occured on the last operation.
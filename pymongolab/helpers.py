@@ -1,7 +1,13 @@
 # -*- coding: utf-8 *-*
 """Bits and pieces used by the REST client that don't really fit elsewhere."""
 
+import threading
+import time
+import weakref
+
+from bson.objectid import ObjectId
 from collections import OrderedDict
+from mongolabclient import compat
 
 
 def _index_document(index_list):
@@ -12,7 +18,7 @@ def _index_document(index_list):
     if isinstance(index_list, dict):
         raise TypeError("passing a dict to sort/create_index/hint is not "
                         "allowed - use a list of tuples instead. did you "
-                        "mean %r?" % list(index_list.iteritems()))
+                        "mean %r?" % list(compat.iteritems(index_list)))
     elif not isinstance(index_list, list):
         raise TypeError("must use a list of (key, direction) pairs, "
                         "not: " + repr(index_list))
@@ -21,11 +27,378 @@ def _index_document(index_list):
 
     index = OrderedDict()
     for (key, value) in index_list:
-        if not isinstance(key, basestring):
+        if not isinstance(key, compat.string_type):
             raise TypeError("first item in each key pair must be a string")
-        if not isinstance(value, (basestring, int)):
+        if not isinstance(value, (compat.string_type, int)):
             raise TypeError("second item in each key pair must be ASCENDING, "
                             "DESCENDING, GEO2D, GEOHAYSTACK, TEXT, or other "
                             "valid MongoDB index specifier.")
         index[key] = value
     return index
+
+
+def _index_list(key_or_list, direction=None):
+    """Helper to generate a list of (key, direction) pairs.
+
+    Takes such a list, or a single key, or a single key and direction.
+    """
+    if direction is not None:
+        return [(key_or_list, direction)]
+    if isinstance(key_or_list, compat.string_type):
+        return [(key_or_list, 1)]
+    if not isinstance(key_or_list, list):
+        raise TypeError("if no direction is specified, key_or_list must be "
+                        "an instance of list")
+    return key_or_list
+
+
+def _sort_document(sort):
+    """Helper to generate the sort order sent with the ``s`` parameter.
+
+    Takes a dict, which is sent as it is, or anything accepted by
+    :func:`_index_list`.
+    """
+    if isinstance(sort, dict):
+        return sort
+    return _index_document(_index_list(sort))
+
+
+def _hint_document(index):
+    """Helper to generate the index sent as the ``$hint`` query modifier.
+
+    Takes the name of an index, a list of (key, direction) pairs or ``None``.
+    """
+    if index is None or isinstance(index, compat.string_type):
+        return index
+    return _index_document(index)
+
+
+def _query_document(spec, sort=None, hint=None):
+    """Helper to generate the query and the sort order sent with the ``q``
+    and ``s`` parameters.
+
+    A hint is sent as the ``$hint`` query modifier, wrapping the query into a
+    ``$query`` document along with the sort order as ``$orderby``.
+    """
+    if hint is None:
+        return spec, sort or {}
+    query = OrderedDict([("$query", spec)])
+    if sort:
+        query["$orderby"] = sort
+    query["$hint"] = hint
+    return query, {}
+
+
+def _fields_document(fields):
+    """Helper to generate the projection sent with the ``f`` parameter.
+
+    Takes a dict of fields or a list of names of fields to include.
+    """
+    if not fields:
+        return {}
+    if isinstance(fields, dict):
+        return fields
+    if isinstance(fields, compat.string_type) or \
+        not isinstance(fields, (list, tuple)):
+        raise TypeError("fields must be a list of key names or a dict, "
+                        "not: " + repr(fields))
+    projection = OrderedDict()
+    for key in fields:
+        if not isinstance(key, compat.string_type):
+            raise TypeError("each key name in fields must be a string")
+        projection[key] = 1
+    return projection
+
+
+def _check_cursor_option(name, value):
+    """Helper to validate the `skip`, `limit` and `batch_size` options of
+    cursors, which must be integers >= 0.
+    """
+    if not isinstance(value, compat.integer_types):
+        raise TypeError("%s must be an integer" % name)
+    if value < 0:
+        raise ValueError("%s must be >= 0" % name)
+    return value
+
+
+def _check_max_time_ms(max_time_ms):
+    """Helper to validate the `max_time_ms` option, an integer or ``None``.
+    """
+    if max_time_ms is not None and \
+        not isinstance(max_time_ms, compat.integer_types):
+        raise TypeError("max_time_ms must be an integer or None")
+    return max_time_ms
+
+
+def _page_params(spec, fields, sort, hint, skip, limit, batch_size,
+    retrieved, kwargs):
+    """Helper to generate the parameters of the list-documents operation
+    requesting the next page of a cursor, after `retrieved` documents.
+
+    Returns a tuple ``(page_size, params)``.
+    """
+    page_size = batch_size
+    if limit:
+        page_size = min(page_size, limit - retrieved)
+    params = dict(kwargs)
+    params["spec"], params["sort"] = _query_document(spec, sort, hint)
+    params["fields"] = fields
+    params["skip"] = skip + retrieved
+    params["limit"] = page_size
+    return page_size, params
+
+
+def _count_with_limit_and_skip(count, skip, limit):
+    """Helper to get how many of `count` matched documents are returned by a
+    cursor with `skip` and `limit`.
+    """
+    count = max(count - skip, 0)
+    if limit:
+        count = min(count, limit)
+    return count
+
+
+def _find_one_params(spec_or_id, fields, kwargs):
+    """Helper to generate the parameters of the list-documents operation
+    requesting the first document of a query or the document with an
+    ``_id``, given as `spec_or_id`.
+    """
+    if isinstance(spec_or_id, ObjectId) or \
+        isinstance(spec_or_id, compat.string_type):
+        spec_or_id = _id_spec(spec_or_id)
+    params = dict(kwargs)
+    if params.get("sort"):
+        params["sort"] = _sort_document(params["sort"])
+    params["spec"] = spec_or_id or {}
+    params["fields"] = _fields_document(fields)
+    params["find_one"] = True
+    return params
+
+
+def _command_document(command, value, kwargs):
+    """Helper to generate the document of a database-collection level
+    command, given as a dict or as its name and `value`.
+    """
+    cmd = OrderedDict()
+    if isinstance(command, dict):
+        cmd.update(command)
+    elif isinstance(command, compat.string_type):
+        cmd[command] = str(value)
+    cmd.update(kwargs)
+    return cmd
+
+
+def _find_and_modify_command(query, update, upsert, sort, fields, kwargs):
+    """Helper to generate the options of the findAndModify command."""
+    if (not update and not kwargs.get('remove', None)):
+        raise ValueError("Must either update or remove")
+    if (update and kwargs.get('remove', None)):
+        raise ValueError("Can't do both update and remove")
+    kwargs = dict(kwargs)
+    if query:
+        kwargs['query'] = query
+    if update:
+        kwargs['update'] = update
+    if upsert:
+        kwargs['upsert'] = upsert
+    fields = _fields_document(fields)
+    if fields:
+        kwargs['fields'] = fields
+    if sort:
+        if isinstance(sort, list):
+            kwargs['sort'] = _index_document(sort)
+        elif (isinstance(sort, OrderedDict) or isinstance(sort, dict) and
+             len(sort) == 1):
+            kwargs['sort'] = sort
+        else:
+            raise TypeError("sort must be a list of (key, direction) "
+                            "pairs, a dict of len 1, or an instance of "
+                            "OrderedDict")
+    return kwargs
+
+
+def _find_and_modify_result(out):
+    """Helper to get the document returned by the findAndModify command."""
+    if not out['ok']:
+        if out["errmsg"] == "No matching object found":
+            return None
+        else:
+            raise ValueError("Unexpected Error: %s" % (out,))
+    return out.get('value')
+
+
+def _id_spec(_id):
+    """Helper to generate the query matching the document with this
+    ``_id``, the same one matched by the url of the document: strings of
+    valid ObjectIds match an ObjectId.
+    """
+    if isinstance(_id, compat.string_type) and ObjectId.is_valid(_id):
+        _id = ObjectId(_id)
+    return {"_id": _id}
+
+
+def _deadline(max_time_ms):
+    """Helper to get the :func:`time.time` when an operation limited to
+    `max_time_ms` milliseconds must be finished, or ``None`` for no limit.
+    """
+    if _check_max_time_ms(max_time_ms) is None:
+        return None
+    return time.time() + max_time_ms / 1000.0
+
+
+def _split_documents(documents, chunk_size=0, max_bytes=0, encode=None):
+    """Helper to split a list of documents into chunks.
+
+    Every chunk has at most `chunk_size` documents and, when `max_bytes` is
+    given, the encoding of the chunk made by `encode`, which takes a list of
+    documents, is at most `max_bytes` bytes long. A document bigger than
+    `max_bytes` is placed alone into its own chunk.
+    """
+    chunks = []
+    chunk = []
+    empty = separator = 0
+    if max_bytes:
+        # Sizes of what `encode` adds around the documents and between them.
+        empty = len(encode([]))
+        separator = len(encode([None, None])) - 2 * len(encode([None])) + \
+            empty
+    size = empty
+    for document in documents:
+        doc_size = len(encode([document])) - empty if max_bytes else 0
+        if chunk and ((chunk_size and len(chunk) >= chunk_size) or
+                      (max_bytes and size + separator + doc_size > max_bytes)):
+            chunks.append(chunk)
+            chunk = []
+            size = empty
+        if chunk:
+            size += separator
+        chunk.append(document)
+        size += doc_size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _run_parallel(func, items, workers=1):
+    """Helper to call `func` on every item using up to `workers` threads.
+
+    Yields ``(index, result, exception)`` tuples as soon as each call finishes,
+    where `index` is the position of the item into `items`. Pending calls are
+    cancelled when the generator is closed.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        for index, item in enumerate(items):
+            try:
+                yield index, func(item), None
+            except Exception as e:
+                yield index, None, e
+        return
+    empty = compat.queue.Empty
+    tasks = compat.queue.Queue()
+    results = compat.queue.Queue()
+    for task in enumerate(items):
+        tasks.put(task)
+
+    def worker():
+        while True:
+            try:
+                index, item = tasks.get_nowait()
+            except empty:
+                return
+            try:
+                results.put((index, func(item), None))
+            except Exception as e:
+                results.put((index, None, e))
+
+    for i in range(min(workers, len(items))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+    try:
+        for i in range(len(items)):
+            yield results.get()
+    finally:
+        while True:
+            try:
+                tasks.get_nowait()
+            except empty:
+                break
+
+
+def _fan_out(func, items, workers=1):
+    """Helper to call `func` on every item using up to `workers` threads.
+
+    Yields ``(index, result)`` tuples as soon as each call finishes. The first
+    exception raised by `func` cancels the pending calls and is raised.
+    """
+    results = _run_parallel(func, items, workers)
+    try:
+        for index, result, error in results:
+            if error is not None:
+                raise error
+            yield index, result
+    finally:
+        results.close()
+
+
+def _map_find(client, queries, workers, kwargs):
+    """Helper to run `queries`, a list of ``(database, collection, spec)``
+    tuples, concurrently on `client`. Yields ``(full_name, documents)``
+    tuples as soon as each query finishes.
+    """
+    queries = list(queries)
+
+    def find(query):
+        database, collection, spec = query
+        return list(client[database][collection].find(spec, **kwargs))
+
+    for index, documents in _fan_out(find, queries, workers):
+        yield u"%s.%s" % queries[index][:2], documents
+
+
+def _map_command(client, commands, workers):
+    """Helper to run `commands`, a list of ``(database, command)`` tuples,
+    concurrently on `client`. Yields ``(database, result)`` tuples as soon as
+    each command finishes.
+    """
+    commands = list(commands)
+
+    def command(item):
+        database, command = item
+        return client[database].command(command)
+
+    for index, result in _fan_out(command, commands, workers):
+        yield commands[index][0], result
+
+
+class _HandleCache(object):
+    """Helper to reuse the handles (databases or collections) created by
+    `factory` for each name, which are got with ``cache[name]``.
+
+    The `max_size` handles used most recently are kept alive, and any other
+    one is reused while it is referenced elsewhere.
+    """
+
+    def __init__(self, factory, max_size=64):
+        self.__factory = factory
+        self.__max_size = max_size
+        self.__lock = threading.Lock()
+        self.__handles = OrderedDict()
+        self.__alive = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self.__handles)
+
+    def __getitem__(self, name):
+        with self.__lock:
+            handle = self.__handles.pop(name, None)
+            if handle is None:
+                handle = self.__alive.get(name)
+                if handle is None:
+                    handle = self.__factory(name)
+                    self.__alive[name] = handle
+                if len(self.__handles) >= self.__max_size:
+                    self.__handles.popitem(last=False)
+            self.__handles[name] = handle
+            return handle
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 *-*
+"""Result classes returned by bulk operations."""
+
+
+class InsertManyResult(object):
+    """The combined result of the chunks sent by
+    :meth:`~pymongolab.collection.Collection.insert_many`.
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, chunks):
+        self.__chunks = chunks
+        self.__inserted_count = 0
+        self.__failures = []
+
+    def _add_inserted(self, n):
+        self.__inserted_count += n
+
+    def _add_failure(self, index, documents, exception):
+        self.__failures.append((index, documents, exception))
+
+    @property
+    def chunks(self):
+        """The number of chunks (requests) the documents were split into."""
+        return self.__chunks
+
+    @property
+    def inserted_count(self):
+        """The number of documents inserted by the chunks that succeeded."""
+        return self.__inserted_count
+
+    @property
+    def failures(self):
+        """A list of ``(chunk_index, documents, exception)`` tuples, one for
+        each chunk that could not be inserted, sorted by `chunk_index`."""
+        return sorted(self.__failures, key=lambda failure: failure[0])
+
+    @property
+    def acknowledged(self):
+        """``True`` when every chunk was inserted."""
+        return not self.__failures
+
+    def __repr__(self):
+        return "InsertManyResult(%r, %r, %r)" % (self.chunks,
+                                                 self.inserted_count,
+                                                 len(self.__failures))
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 *-*
+"""Write-behind buffering of inserts sent in bulk by a background thread."""
+
+from collections import deque
+import threading
+import time
+
+from mongolabclient import errors
+
+
+class BufferedWriter(object):
+    """Buffer of documents inserted into a
+    :class:`~pymongolab.collection.Collection` in bulk by a background
+    thread, so producers don't wait for a HTTP request per document.
+
+    A bulk insert is sent as soon as `max_docs` documents (or `max_bytes`
+    bytes of JSON) are buffered, or `flush_interval` seconds after the oldest
+    buffered document was added. When `max_buffered` documents are waiting,
+    :meth:`insert` blocks until the background thread makes room for them.
+
+    A failed bulk insert does not stop the writer: it is added to
+    :attr:`failures` and passed to `on_error`, a function called with the
+    exception and the list of documents that were not inserted. Only the
+    last `max_failures` failed bulk inserts are kept, but every failed
+    document is counted by :meth:`stats`.
+
+    :Parameters:
+        - `collection`: the collection where documents are inserted
+        - `max_docs` (optional): maximum number of documents per request
+        - `max_bytes` (optional): maximum size in bytes of each request body,
+          ``0`` for no limit
+        - `flush_interval` (optional): maximum seconds a document waits in
+          the buffer
+        - `max_buffered` (optional): maximum number of buffered documents
+        - `on_error` (optional): function called when a request fails
+        - `max_failures` (optional): maximum number of failed bulk inserts
+          kept in :attr:`failures`
+
+    Example usage:
+
+    .. code-block:: python
+
+       >>> from pymongolab import MongoClient
+       >>> con = MongoClient("MongoLabAPIKey")
+       >>> with con.database.events.buffered_writer(max_docs=500) as writer:
+       ...     for event in events:
+       ...         writer.insert(event)
+       >>> writer.stats()
+       {'buffered': 0, 'inserted': 12000, 'failed': 0, 'flushes': 24,
+       'flush_time': 3.1, 'max_flush_time': 0.22}
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, collection, max_docs=1000, max_bytes=0,
+        flush_interval=1.0, max_buffered=10000, on_error=None,
+        max_failures=100):
+        if max_docs < 1:
+            raise ValueError("max_docs must be greater than 0")
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be greater than 0")
+        if max_buffered < max_docs:
+            raise ValueError("max_buffered must be >= max_docs")
+        self.collection = collection
+        self.max_docs = max_docs
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.on_error = on_error
+        self.__encode = collection.database.connection.request.codec.encode
+        self.__cond = threading.Condition(threading.Lock())
+        self.__buffer = deque()
+        self.__bytes = 0
+        self.__oldest = None
+        self.__added = 0
+        self.__done = 0
+        self.__flush_requested = 0
+        self.__closed = False
+        self.__failures = deque(maxlen=max_failures)
+        self.__failed = 0
+        self.__inserted = 0
+        self.__flushes = 0
+        self.__flush_time = 0.0
+        self.__max_flush_time = 0.0
+        self.__thread = threading.Thread(target=self.__run)
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def insert(self, doc_or_docs, timeout=None):
+        """Add a document or a list of documents to the buffer. Blocks while
+        the buffer is full, raising
+        :class:`~mongolabclient.errors.ExecutionTimeout` if there is no room
+        after `timeout` seconds."""
+        if isinstance(doc_or_docs, dict):
+            doc_or_docs = [doc_or_docs]
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        for document in doc_or_docs:
+            size = 0
+            if self.max_bytes:
+                size = len(self.__encode(document)) + 1
+            with self.__cond:
+                if self.__closed:
+                    raise errors.InvalidOperation("insert on a closed "
+                                                  "BufferedWriter")
+                while len(self.__buffer) >= self.max_buffered:
+                    self.__wait(deadline)
+                if not self.__buffer:
+                    self.__oldest = time.time()
+                self.__buffer.append((document, size))
+                self.__bytes += size
+                self.__added += 1
+                self.__cond.notify_all()
+
+    def __wait(self, deadline):
+        if deadline is None:
+            self.__cond.wait()
+            return
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise errors.ExecutionTimeout()
+        self.__cond.wait(remaining)
+
+    def __ready(self):
+        """Returns ``True`` when a bulk insert must be sent now."""
+        if not self.__buffer:
+            return False
+        return (len(self.__buffer) >= self.max_docs or
+                (self.max_bytes and self.__bytes >= self.max_bytes) or
+                self.__closed or self.__flush_requested > self.__done or
+                time.time() - self.__oldest >= self.flush_interval)
+
+    def __run(self):
+        while True:
+            with self.__cond:
+                while not self.__ready():
+                    if self.__closed and not self.__buffer:
+                        return
+                    if self.__buffer:
+                        self.__cond.wait(max(self.__oldest +
+                            self.flush_interval - time.time(), 0.001))
+                    else:
+                        self.__cond.wait()
+                chunk = []
+                size = 2
+                while self.__buffer and len(chunk) < self.max_docs:
+                    document, doc_size = self.__buffer[0]
+                    if chunk and self.max_bytes and \
+                        size + doc_size > self.max_bytes:
+                        break
+                    self.__buffer.popleft()
+                    self.__bytes -= doc_size
+                    size += doc_size
+                    chunk.append(document)
+                self.__oldest = time.time() if self.__buffer else None
+                self.__cond.notify_all()
+            self.__send(chunk)
+
+    def __send(self, chunk):
+        started = time.time()
+        error = None
+        try:
+            self.collection.insert(chunk)
+        except Exception as e:
+            error = e
+        elapsed = time.time() - started
+        with self.__cond:
+            self.__flushes += 1
+            self.__flush_time += elapsed
+            self.__max_flush_time = max(self.__max_flush_time, elapsed)
+            if error is None:
+                self.__inserted += len(chunk)
+            else:
+                self.__failures.append((chunk, error))
+                self.__failed += len(chunk)
+            self.__done += len(chunk)
+            self.__cond.notify_all()
+        if error is not None and self.on_error is not None:
+            try:
+                self.on_error(error, chunk)
+            except Exception:
+                # The failure is already in self.failures; an error in the
+                # callback must not stop the background thread.
+                pass
+
+    def flush(self, timeout=None):
+        """Send every buffered document and wait until all of them have been
+        inserted or have failed, raising
+        :class:`~mongolabclient.errors.ExecutionTimeout` after `timeout`
+        seconds."""
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        with self.__cond:
+            target = self.__added
+            self.__flush_requested = max(self.__flush_requested, target)
+            self.__cond.notify_all()
+            while self.__done < target:
+                self.__wait(deadline)
+
+    def close(self, timeout=None):
+        """Flush the buffer and stop the background thread. No more documents
+        can be inserted afterwards."""
+        with self.__cond:
+            self.__closed = True
+            self.__cond.notify_all()
+        self.flush(timeout)
+        self.__thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def failures(self):
+        """A list of ``(documents, exception)`` tuples, one for each of the
+        last `max_failures` bulk inserts that failed."""
+        with self.__cond:
+            return list(self.__failures)
+
+    def stats(self):
+        """Returns a dict with the counters of this writer: ``buffered``,
+        ``inserted`` and ``failed`` documents, ``flushes`` (bulk inserts
+        sent), and ``flush_time`` and ``max_flush_time`` (total and maximum
+        seconds spent in bulk inserts)."""
+        with self.__cond:
+            return {"buffered": len(self.__buffer),
+                    "inserted": self.__inserted,
+                    "failed": self.__failed,
+                    "flushes": self.__flushes,
+                    "flush_time": self.__flush_time,
+                    "max_flush_time": self.__max_flush_time}
@@ -38,6 +38,41 @@ class doc(Command):
         sys.stdout.write("\nDocumentation step '%s' performed, results here:\n"
             "   %s/\n" % ("html", path))
 
+
+class benchmark(Command):
+
+    description = "run benchmarks against a fake REST API server"
+
+    user_options = [
+        ("filter=", "k", "run only the benchmarks containing this text"),
+        ("output=", "o", "save the results as JSON in this file"),
+        ("compare=", "c", "compare the results with the ones of this file"),
+        ("quick", "q", "run a tenth of iterations")]
+
+    boolean_options = ["quick"]
+
+    def initialize_options(self):
+        self.filter = None
+        self.output = None
+        self.compare = None
+        self.quick = False
+
+    def finalize_options(self):
+        pass
+
+    def run(self):
+        from benchmarks import runner
+        args = []
+        if self.filter:
+            args += ["--filter", self.filter]
+        if self.output:
+            args += ["--output", self.output]
+        if self.compare:
+            args += ["--compare", self.compare]
+        if self.quick:
+            args.append("--quick")
+        runner.main(args)
+
 f = open("README.rst")
 try:
     try:
@@ -58,6 +93,7 @@ setup(
     packages=['mongolabclient', 'pymongolab'],
     keywords=["mongolab", "pymongolab", "mongolabclient", "mongo", "mongodb"],
     install_requires=["pymongo", "requests"],
+    extras_require={"asyncio": ["aiohttp"]},
     license="Apache License, Version 2.0",
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -65,6 +101,8 @@ setup(
         "License :: OSI Approved :: Apache Software License",
         "Operating System :: OS Independent",
         "Programming Language :: Python",
+        "Programming Language :: Python :: 2",
+        "Programming Language :: Python :: 3",
         "Topic :: Database"],
-    cmdclass={"doc": doc},
+    cmdclass={"doc": doc, "benchmark": benchmark},
 )
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 *-*
+"""Tests of pymongolab and mongolabclient. Tests sending requests run
+against :class:`~mongolabclient.testing.FakeMongoLabServer`."""
+
+import unittest
+
+from mongolabclient import testing
+from pymongolab import MongoClient
+
+API_KEY = "a" * 24
+"""API key used by the clients of the tests."""
+
+
+class FakeServerTestCase(unittest.TestCase):
+    """Test case with a fake REST API server shared by all of its tests,
+    emptied before each one."""
+
+    server_options = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = testing.FakeMongoLabServer(**cls.server_options)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset()
+        self.server.latency = 0
+
+    def client(self, **kwargs):
+        """Returns a :class:`~pymongolab.mongo_client.MongoClient` of the
+        fake server, closed after the test."""
+        client = MongoClient(API_KEY, base_url=self.server.base_url, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def requests(self):
+        """Returns the number of requests received by the server."""
+        return self.server.stats()["requests"]
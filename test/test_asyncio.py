@@ -0,0 +1,151 @@
+# -*- coding: utf-8 *-*
+import time
+import unittest
+
+from bson.objectid import ObjectId
+
+from mongolabclient import errors
+from mongolabclient.ratelimit import RateLimiter
+from test import API_KEY, FakeServerTestCase
+
+try:
+    import asyncio
+    from mongolabclient.asyncio import AsyncMongoLabClient
+    from pymongolab.asyncio import AsyncMongoClient
+except (ImportError, SyntaxError):
+    AsyncMongoClient = None
+
+
+@unittest.skipIf(AsyncMongoClient is None, "requires Python 3.5+ and aiohttp")
+class TestAsyncCollection(FakeServerTestCase):
+
+    def setUp(self):
+        super(TestAsyncCollection, self).setUp()
+        self.server.load("db", "col", [{"n": i, "g": i % 3}
+                                       for i in range(25)])
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.connection = AsyncMongoClient(API_KEY,
+                                           base_url=self.server.base_url)
+        self.addCleanup(self.wait, self.connection.close())
+        self.col = self.connection.db.col
+
+    def wait(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_find(self):
+        requests = self.requests()
+        cursor = self.col.find().skip(2).batch_size(10)
+        self.assertEqual(self.requests(), requests)
+        docs = self.wait(cursor.to_list())
+        self.assertEqual([d["n"] for d in docs], list(range(2, 25)))
+        self.assertEqual(self.requests(), requests + 3)
+        docs = self.wait(self.col.find({"g": 1}, limit=2).to_list())
+        self.assertEqual([d["n"] for d in docs], [1, 4])
+
+    def test_sort(self):
+        docs = self.wait(self.col.find({"g": 1}).sort("n", -1).to_list())
+        self.assertEqual([d["n"] for d in docs], list(range(22, 0, -3)))
+        docs = self.wait(self.col.find({"g": 1}).sort("n", -1)
+                         .hint([("g", 1)]).limit(2).to_list())
+        self.assertEqual([d["n"] for d in docs], [22, 19])
+        self.assertEqual(self.wait(self.col.find_one(
+            {}, sort=[("n", -1)]))["n"], 24)
+
+    def test_max_time_ms(self):
+        docs = self.wait(self.col.find().max_time_ms(5000).to_list())
+        self.assertEqual(len(docs), 25)
+        self.server.latency = 0.3
+        cursor = self.col.find().max_time_ms(100)
+        self.assertRaises(errors.ExecutionTimeout, self.wait,
+                          cursor.to_list())
+
+    def test_invalid_options(self):
+        self.assertRaises(TypeError, self.col.find().skip, "1")
+        self.assertRaises(ValueError, self.col.find().skip, -1)
+        self.assertRaises(TypeError, self.col.find().limit, "1")
+        self.assertRaises(TypeError, self.col.find().batch_size, "1")
+        self.assertRaises(ValueError, self.col.find().batch_size, -1)
+        self.assertRaises(TypeError, self.col.find().max_time_ms, "10")
+        self.assertRaises(ValueError, self.wait,
+                          self.col.find_and_modify({"n": 1}))
+
+    def test_count(self):
+        self.assertEqual(self.wait(self.col.count()), 25)
+        self.assertEqual(self.wait(self.col.find({"g": 0}).count()), 9)
+
+    def test_find_one(self):
+        self.assertEqual(self.wait(self.col.find_one({"n": 3}))["n"], 3)
+        self.assertIsNone(self.wait(self.col.find_one({"n": 100})))
+
+    def test_write(self):
+        _id = self.wait(self.col.insert({"a": 1}))["_id"]
+        self.wait(self.col.update({"_id": _id}, {"$set": {"a": 2}}))
+        self.assertEqual(self.wait(self.col.find_one(_id))["a"], 2)
+        self.wait(self.col.remove(_id))
+        self.assertEqual(self.wait(self.col.count()), 25)
+
+    def test_names(self):
+        self.assertEqual(self.wait(self.connection.database_names()), ["db"])
+        self.assertEqual(self.wait(self.connection.db.collection_names()),
+                         ["col"])
+
+    def test_private_names(self):
+        self.assertRaises(AttributeError, getattr, self.connection, "_x")
+        self.assertRaises(AttributeError, getattr, self.connection.db, "_x")
+        self.assertEqual(self.connection["_x"].name, "_x")
+        self.assertEqual(self.connection.db["_x"].name, "_x")
+
+    def test_find_by_id(self):
+        _id = self.wait(self.col.insert({"a": 1, "b": 2}))["_id"]
+        self.assertEqual(self.wait(self.col.find(_id))["b"], 2)
+        self.assertEqual(sorted(self.wait(self.col.find_one(str(_id), ["a"]))),
+                         ["_id", "a"])
+        self.assertIsNone(self.wait(self.col.find(ObjectId())))
+        self.assertIsNone(self.wait(self.col.find_one(ObjectId(), ["a"])))
+
+
+@unittest.skipIf(AsyncMongoClient is None, "requires Python 3.5+ and aiohttp")
+class TestAsyncMongoLabClient(FakeServerTestCase):
+
+    server_options = {"api_keys": [API_KEY]}
+
+    def setUp(self):
+        super(TestAsyncMongoLabClient, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def wait(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def request(self, api_key=API_KEY, **kwargs):
+        request = AsyncMongoLabClient(api_key, base_url=self.server.base_url,
+                                      **kwargs)
+        self.addCleanup(self.wait, request.close())
+        return request
+
+    def test_invalid_api_key(self):
+        request = self.request(str(ObjectId()))
+        self.assertRaises(errors.InvalidAPIKey, self.wait,
+                          request.list_databases())
+        self.assertRaises(errors.InvalidAPIKey, self.wait,
+                          request.validate_api_key())
+        self.assertEqual(self.wait(self.request().list_databases()), [])
+
+    def test_read_timeout(self):
+        request = self.request(read_timeout=0.1)
+        self.server.latency = 0.5
+        self.assertRaises(asyncio.TimeoutError, self.wait,
+                          request.list_databases())
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(max_in_flight=1)
+        request = self.request(rate_limiter=limiter)
+        self.server.latency = 0.1
+        started = time.time()
+        self.wait(asyncio.gather(*[self.loop.create_task(
+            request.list_databases()) for _ in range(3)]))
+        self.assertGreaterEqual(time.time() - started, 0.3)
+        stats = limiter.stats()
+        self.assertEqual((stats["acquired"], stats["in_flight"]), (3, 0))
+        self.assertGreaterEqual(stats["waited"], 2)
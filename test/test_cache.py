@@ -0,0 +1,146 @@
+# -*- coding: utf-8 *-*
+import threading
+import time
+import unittest
+
+from pymongolab.cache import QueryCache
+from test import FakeServerTestCase
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.loads = []
+
+    def loader(self, result):
+        def load():
+            self.loads.append(result)
+            return result
+        return load
+
+    def fetch(self, cache, n, collection="col"):
+        return cache.fetch("db", collection, {"n": n},
+                           self.loader([{"n": n}]))
+
+    def test_hit(self):
+        cache = QueryCache()
+        self.assertEqual(self.fetch(cache, 1), [{"n": 1}])
+        result = self.fetch(cache, 1)
+        self.assertEqual(result, [{"n": 1}])
+        result[0]["n"] = 10
+        self.assertEqual(self.fetch(cache, 1), [{"n": 1}])
+        self.assertEqual(len(self.loads), 1)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertEqual(stats["entries"], 1)
+
+    def test_ttl(self):
+        cache = QueryCache(ttl=0.1)
+        self.fetch(cache, 1)
+        self.fetch(cache, 1)
+        self.assertEqual(len(self.loads), 1)
+        time.sleep(0.2)
+        self.fetch(cache, 1)
+        self.assertEqual(len(self.loads), 2)
+
+    def test_lru(self):
+        cache = QueryCache(max_entries=2)
+        self.fetch(cache, 1)
+        self.fetch(cache, 2)
+        self.fetch(cache, 1)
+        self.fetch(cache, 3)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        del self.loads[:]
+        self.fetch(cache, 1)
+        self.assertEqual(self.loads, [])
+        self.fetch(cache, 2)
+        self.assertEqual(self.loads, [[{"n": 2}]])
+
+    def test_max_bytes(self):
+        cache = QueryCache(max_bytes=25)
+        for n in range(5):
+            self.fetch(cache, n)
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], 25)
+        self.assertEqual(stats["entries"], 2)
+        cache.fetch("db", "col", {"big": 1}, self.loader(["x" * 100]))
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_invalidate(self):
+        cache = QueryCache()
+        self.fetch(cache, 1)
+        self.fetch(cache, 1, "other")
+        cache.invalidate("db", "col")
+        self.assertEqual(cache.stats()["entries"], 1)
+        self.fetch(cache, 1)
+        self.fetch(cache, 1, "other")
+        self.assertEqual(len(self.loads), 3)
+        cache.clear()
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_invalidate_while_loading(self):
+        cache = QueryCache()
+        loading = threading.Event()
+        invalidated = threading.Event()
+
+        def load():
+            loading.set()
+            invalidated.wait(5)
+            return [{"n": "stale"}]
+        thread = threading.Thread(target=cache.fetch,
+                                  args=("db", "col", {"n": 1}, load))
+        thread.start()
+        loading.wait(5)
+        cache.invalidate("db", "col")
+        invalidated.set()
+        thread.join(5)
+        self.assertEqual(self.fetch(cache, 1), [{"n": 1}])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, QueryCache, ttl=0)
+        self.assertRaises(ValueError, QueryCache, max_entries=0)
+
+
+class TestCachedCollection(FakeServerTestCase):
+
+    def setUp(self):
+        super(TestCachedCollection, self).setUp()
+        self.server.load("db", "col", [{"n": i} for i in range(5)])
+        self.cache = QueryCache()
+        self.col = self.client(query_cache=self.cache).db.col
+
+    def test_reads(self):
+        self.assertEqual(self.col.find_one({"n": 1})["n"], 1)
+        self.assertEqual(self.col.count(), 5)
+        self.assertEqual(len([d for d in self.col.find()]), 5)
+        self.assertEqual(self.col.distinct("n"), list(range(5)))
+        requests = self.requests()
+        self.assertEqual(self.col.find_one({"n": 1})["n"], 1)
+        self.assertEqual(self.col.count(), 5)
+        self.assertEqual(len([d for d in self.col.find()]), 5)
+        self.assertEqual(self.col.distinct("n"), list(range(5)))
+        self.assertEqual(self.requests(), requests)
+        self.assertEqual(self.cache.stats()["hits"], 4)
+
+    def test_invalidation(self):
+        self.assertEqual(self.col.count(), 5)
+        self.col.insert({"n": 5})
+        self.assertEqual(self.col.count(), 6)
+        self.col.update({"n": 5}, {"$set": {"n": 6}})
+        self.assertEqual(self.col.find_one({"n": 6})["n"], 6)
+        self.col.remove({"n": 6})
+        self.assertIsNone(self.col.find_one({"n": 6}))
+        self.col.find_and_modify({"n": 0}, {"$set": {"n": 10}})
+        self.assertEqual(self.col.count({"n": 10}), 1)
+        self.assertEqual(self.col.count(), 5)
+
+    def test_invalidation_per_collection(self):
+        other = self.col.database.other
+        self.col.count()
+        other.count()
+        other.insert({"n": 1})
+        requests = self.requests()
+        self.assertEqual(self.col.count(), 5)
+        self.assertEqual(self.requests(), requests)
+        self.assertEqual(other.count(), 1)
+        self.assertEqual(self.requests(), requests + 1)
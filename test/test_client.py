@@ -0,0 +1,297 @@
+# -*- coding: utf-8 *-*
+import threading
+import time
+import unittest
+
+from bson.objectid import ObjectId
+
+from mongolabclient import MongoLabClient, client, compression, errors
+from mongolabclient.retry import RetryBudget, RetryPolicy
+from pymongolab import MongoClient
+from test import API_KEY, FakeServerTestCase
+
+
+class TestMongoLabClient(unittest.TestCase):
+
+    def test_bad_api_key_format(self):
+        self.assertRaises(errors.BadAPIKeyFormat, MongoLabClient, "bad key")
+        self.assertRaises(errors.BadAPIKeyFormat, MongoLabClient, "bad key",
+                          connect=False)
+
+    def test_lazy_connect(self):
+        # Nothing listens on the proxy, so any request would fail.
+        proxy_url = "http://127.0.0.1:9"
+        client = MongoLabClient(API_KEY, proxy_url=proxy_url, connect=False)
+        client.close()
+        MongoClient(API_KEY, proxy_url=proxy_url, connect=False).close()
+
+
+class TestValidation(FakeServerTestCase):
+
+    server_options = {"api_keys": [API_KEY]}
+
+    def test_connect(self):
+        requests = self.requests()
+        MongoLabClient(API_KEY, base_url=self.server.base_url).close()
+        self.assertEqual(self.requests(), requests + 1)
+        MongoLabClient(API_KEY, base_url=self.server.base_url).close()
+        self.assertEqual(self.requests(), requests + 1)
+
+    def test_invalid_api_key(self):
+        api_key = str(ObjectId())
+        self.assertRaises(errors.InvalidAPIKey, MongoLabClient, api_key,
+                          base_url=self.server.base_url)
+        request = MongoLabClient(api_key, base_url=self.server.base_url,
+                                 connect=False)
+        self.addCleanup(request.close)
+        self.assertRaises(errors.InvalidAPIKey, request.list_databases)
+        self.assertRaises(errors.InvalidAPIKey, MongoClient, api_key,
+                          base_url=self.server.base_url)
+
+    def test_lazy(self):
+        api_key = str(ObjectId())
+        self.server.api_keys.add(api_key)
+        requests = self.requests()
+        request = MongoLabClient(api_key, base_url=self.server.base_url,
+                                 connect=False)
+        self.addCleanup(request.close)
+        self.assertEqual(self.requests(), requests)
+        self.assertEqual(request.list_databases(), [])
+        self.assertEqual(self.requests(), requests + 1)
+        MongoLabClient(api_key, base_url=self.server.base_url).close()
+        self.assertEqual(self.requests(), requests + 1)
+
+
+class TestRequests(FakeServerTestCase):
+
+    def request(self, **kwargs):
+        request = MongoLabClient(API_KEY, base_url=self.server.base_url,
+                                 **kwargs)
+        self.addCleanup(request.close)
+        return request
+
+    def test_stream(self):
+        self.server.load("db", "col", [{"n": i, "s": "x" * 100}
+                                       for i in range(2000)])
+        request = self.request()
+        documents = request.list_documents("db", "col", stream=True,
+                                           limit=2000)
+        self.assertFalse(isinstance(documents, list))
+        self.assertEqual([d["n"] for d in documents], list(range(2000)))
+        self.assertRaises(ValueError, request.list_documents, "db", "col",
+                          stream=True, count=True)
+
+    def test_stream_closed_early(self):
+        self.server.load("db", "col", [{"n": i} for i in range(2000)])
+        request = self.request()
+        documents = request.list_documents("db", "col", stream=True,
+                                           limit=2000)
+        self.assertEqual(next(documents)["n"], 0)
+        self.assertEqual(request.pool.in_use, 1)
+        documents.close()
+        self.assertEqual(request.pool.in_use, 0)
+        documents = request.list_documents("db", "col", limit=1)
+        self.assertEqual([d["n"] for d in documents], [0])
+
+    def test_stream_cursor(self):
+        self.server.load("db", "col", [{"n": i} for i in range(30)])
+        docs = self.client().db.col.find().batch_size(10)
+        self.assertEqual([d["n"] for d in docs], list(range(30)))
+
+    def test_retry(self):
+        request = self.request(retry_policy=RetryPolicy(backoff_base=0.01))
+        requests = self.requests()
+        self.server.fail_next(2, 503)
+        self.assertEqual(request.list_documents("db", "col"), [])
+        self.assertEqual(self.requests(), requests + 3)
+
+    def test_retry_attempts(self):
+        request = self.request(retry_policy=RetryPolicy(max_attempts=2,
+                                                        backoff_base=0.01))
+        requests = self.requests()
+        self.server.fail_next(3, 503)
+        self.assertRaises(Exception, request.list_documents, "db", "col")
+        self.assertEqual(self.requests(), requests + 2)
+
+    def test_retry_non_idempotent(self):
+        request = self.request(retry_policy=RetryPolicy(backoff_base=0.01))
+        requests = self.requests()
+        self.server.fail_next(1, 503)
+        self.assertRaises(Exception, request.insert_documents, "db", "col",
+                          {"n": 1})
+        self.assertEqual(self.requests(), requests + 1)
+
+    def test_retry_after(self):
+        request = self.request(retry_policy=RetryPolicy(backoff_base=0.01))
+        self.server.fail_next(1, 429, retry_after=0.3)
+        started = time.time()
+        request.list_documents("db", "col")
+        self.assertGreaterEqual(time.time() - started, 0.3)
+
+    def test_retry_budget(self):
+        policy = RetryPolicy(max_attempts=5, backoff_base=0.01,
+                             budget=RetryBudget(capacity=1, refill_rate=0))
+        request = self.request(retry_policy=policy)
+        requests = self.requests()
+        self.server.fail_next(10, 503)
+        self.assertRaises(Exception, request.list_documents, "db", "col")
+        self.assertEqual(self.requests(), requests + 2)
+        self.assertRaises(Exception, request.list_documents, "db", "col")
+        self.assertEqual(self.requests(), requests + 3)
+
+    def test_deadline(self):
+        request = self.request()
+        self.server.latency = 0.5
+        started = time.time()
+        self.assertRaises(errors.ExecutionTimeout, request.list_documents,
+                          "db", "col", deadline=time.time() + 0.1)
+        self.assertLess(time.time() - started, 0.4)
+        self.assertRaises(errors.ExecutionTimeout, request.list_documents,
+                          "db", "col", deadline=time.time() - 1)
+
+    def test_read_timeout(self):
+        request = self.request(read_timeout=0.1,
+                               retry_policy=RetryPolicy(max_attempts=1))
+        self.server.latency = 0.5
+        self.assertRaises(Exception, request.list_documents, "db", "col")
+
+    def test_max_time_ms(self):
+        col = self.client().db.col
+        self.server.load("db", "col", [{"n": 1}])
+        self.server.latency = 0.5
+        self.assertRaises(errors.ExecutionTimeout, col.find_one, {},
+                          max_time_ms=100)
+        self.assertRaises(errors.ExecutionTimeout, col.insert, {"n": 1},
+                          max_time_ms=100)
+        docs = col.find(max_time_ms=100)
+        self.assertRaises(errors.ExecutionTimeout, next, docs)
+        self.server.latency = 0
+        self.assertEqual(col.find_one({}, max_time_ms=5000)["n"], 1)
+
+    def test_coalesce_reads(self):
+        request = self.request(coalesce_reads=True)
+        self.server.load("db", "col", [{"n": 1}])
+        self.server.latency = 0.3
+        requests = self.requests()
+        results = []
+
+        def read():
+            results.append(request.list_documents("db", "col"))
+        threads = [threading.Thread(target=read) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.requests(), requests + 1)
+        self.assertEqual(len(results), 5)
+        for result in results:
+            self.assertEqual(result[0]["n"], 1)
+        results[0][0]["n"] = 2
+        self.assertEqual(results[1][0]["n"], 1)
+
+    def test_no_coalescing_of_writes(self):
+        request = self.request(coalesce_reads=True)
+        self.server.latency = 0.2
+        requests = self.requests()
+        threads = [threading.Thread(target=request.insert_documents,
+                                    args=("db", "col", {"n": 1}))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.requests(), requests + 3)
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def run_concurrently(self, func, count=5):
+        results = []
+
+        def call():
+            try:
+                results.append(func())
+            except Exception as e:
+                results.append(e)
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_call(self):
+        flight = client._SingleFlight()
+        calls = []
+
+        def load():
+            calls.append(1)
+            time.sleep(0.1)
+            return len(calls)
+        results = self.run_concurrently(lambda: flight.call("k", load))
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(flight.call("k", load), 2)
+        self.assertEqual(flight.call("other", load), 3)
+
+    def test_exception(self):
+        flight = client._SingleFlight()
+
+        def fail():
+            time.sleep(0.1)
+            raise ValueError()
+        results = self.run_concurrently(lambda: flight.call("k", fail))
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    def test_deadline(self):
+        flight = client._SingleFlight()
+        thread = threading.Thread(target=flight.call,
+                                  args=("k", lambda: time.sleep(0.3)))
+        thread.start()
+        time.sleep(0.05)
+        self.assertRaises(errors.ExecutionTimeout, flight.call, "k", None,
+                          time.time() + 0.05)
+        thread.join()
+
+
+class TestCompression(FakeServerTestCase):
+
+    server_options = {"compression": True}
+
+    def test_round_trip(self):
+        settings = compression.Compression()
+        col = self.client(compression=settings).db.col
+        documents = [{"n": i, "name": "document %d" % i} for i in range(500)]
+        col.insert(documents)
+        stored = self.server.collection("db", "col")
+        self.assertEqual([d["name"] for d in stored],
+                         [d["name"] for d in documents])
+        found = [d for d in col.find().batch_size(500)]
+        self.assertEqual([d["n"] for d in found], list(range(500)))
+        found = col.database.connection.request.list_documents(
+            "db", "col", limit=500)
+        self.assertEqual(len(found), 500)
+        stats = settings.stats()
+        self.assertEqual(stats["compressed_requests"], 1)
+        self.assertLess(stats["request_wire_bytes"], stats["request_bytes"])
+        self.assertLess(stats["response_wire_bytes"],
+                        stats["response_bytes"])
+        self.assertGreater(stats["saved_bytes"], 0)
+
+    def test_small_bodies(self):
+        settings = compression.Compression(threshold=1024)
+        self.client(compression=settings).db.col.insert({"n": 1})
+        self.assertEqual(settings.stats()["compressed_requests"], 0)
+        self.assertEqual(len(self.server.collection("db", "col")), 1)
+
+    def test_encodings(self):
+        data = b'{"n": 1}' * 100
+        for encoding in ("gzip", "deflate"):
+            compressed = compression.compress(data, encoding)
+            self.assertLess(len(compressed), len(data))
+            self.assertEqual(compression.decompress(compressed, encoding),
+                             data)
+        self.assertRaises(ValueError, compression.compress, data, "zip")
+        self.assertRaises(ValueError, compression.Compression, "zip")
+        if compression.brotli is None:
+            self.assertRaises(ValueError, compression.Compression, "br")
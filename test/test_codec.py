@@ -0,0 +1,76 @@
+# -*- coding: utf-8 *-*
+import datetime
+import unittest
+
+from bson.objectid import ObjectId
+
+from mongolabclient import codec
+from test import FakeServerTestCase
+
+
+class TestCodec(unittest.TestCase):
+
+    codecs = [codec.JSONCodec(), codec.FastJSONCodec()]
+
+    def test_round_trip(self):
+        document = {"_id": ObjectId(), "n": 1, "list": [{"a": [1, 2]}],
+                    "date": datetime.datetime(2020, 1, 2, 3, 4, 5),
+                    "nested": {"id": ObjectId(), "s": u"ñ"}}
+        for c in self.codecs:
+            decoded = c.decode(c.encode(document))
+            self.assertEqual(decoded["_id"], document["_id"])
+            self.assertEqual(decoded["nested"], document["nested"])
+            self.assertEqual(decoded["list"], document["list"])
+            self.assertEqual(decoded["date"].replace(tzinfo=None),
+                             document["date"])
+
+    def test_default(self):
+        expected = codec.JSONCodec if codec.orjson is None else \
+            codec.FastJSONCodec
+        self.assertIs(type(codec.DEFAULT_CODEC), expected)
+
+    def test_plain(self):
+        for c in self.codecs:
+            self.assertEqual(c.decode(b'{"a": [1, {"$b": 2}], "c": "$d"}'),
+                             {"a": [1, {"$b": 2}], "c": "$d"})
+            self.assertEqual(c.decode('[]'), [])
+
+    def test_iterdecode(self):
+        consumed = []
+        body = b'[{"n": 0}, {"_id": {"$oid": "50243d38e4b00c3b3e75fc94"}},' \
+            b' {"n": 2, "s": "a, ]"}]'
+
+        def chunks():
+            for i in range(0, len(body), 7):
+                consumed.append(i)
+                yield body[i:i + 7]
+        for c in self.codecs:
+            del consumed[:]
+            documents = c.iterdecode(chunks())
+            self.assertEqual(next(documents), {"n": 0})
+            self.assertLess(len(consumed), len(body) // 7)
+            self.assertEqual(next(documents)["_id"],
+                             ObjectId("50243d38e4b00c3b3e75fc94"))
+            self.assertEqual(list(documents), [{"n": 2, "s": "a, ]"}])
+
+    def test_iterdecode_empty(self):
+        for c in self.codecs:
+            self.assertEqual(list(c.iterdecode(iter([b" [ ", b"] "]))), [])
+
+    def test_iterdecode_truncated(self):
+        for c in self.codecs:
+            for body in (b'[{"n": 1}, {"n": 2', b'[{"n": 1},', b'[', b''):
+                documents = c.iterdecode(iter([body]))
+                self.assertRaises(ValueError, list, documents)
+
+
+class TestClientCodec(FakeServerTestCase):
+
+    def test_codecs(self):
+        for c in TestCodec.codecs:
+            col = self.client(codec=c).db.col
+            _id = col.insert({"d": datetime.datetime(2020, 1, 2)})["_id"]
+            self.assertTrue(isinstance(_id, ObjectId))
+            document = col.find_one(_id)
+            self.assertEqual(document["d"].replace(tzinfo=None),
+                             datetime.datetime(2020, 1, 2))
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 *-*
+from bson.objectid import ObjectId
+
+from test import FakeServerTestCase
+
+
+class TestCollection(FakeServerTestCase):
+
+    def setUp(self):
+        super(TestCollection, self).setUp()
+        self.col = self.client().db.col
+        self.col.find_one()
+
+    def test_find_one(self):
+        self.server.load("db", "col", [{"n": i} for i in range(50)])
+        requests = self.requests()
+        sent = self.server.stats()["bytes_sent"]
+        self.assertEqual(self.col.find_one({"n": {"$gt": 10}})["n"], 11)
+        self.assertEqual(self.requests(), requests + 1)
+        self.assertLess(self.server.stats()["bytes_sent"] - sent, 200)
+        self.assertIsNone(self.col.find_one({"n": 100}))
+
+    def test_find_one_sort(self):
+        self.server.load("db", "col", [{"n": i} for i in range(5)])
+        self.assertEqual(self.col.find_one({}, sort=[("n", -1)])["n"], 4)
+        self.assertEqual(self.col.find_one({}, sort={"n": -1})["n"], 4)
+
+    def test_find_by_id(self):
+        _id = self.col.insert({"a": 1, "b": 2})["_id"]
+        self.assertEqual(self.col.find_one(_id)["b"], 2)
+        self.assertEqual(self.col.find_one(str(_id))["b"], 2)
+        self.assertEqual(self.col.find(_id)["a"], 1)
+
+    def test_find_missing_id(self):
+        self.assertIsNone(self.col.find_one(ObjectId()))
+        self.assertIsNone(self.col.find_one(ObjectId(), ["a"]))
+        self.assertIsNone(self.col.find(ObjectId()))
+        self.assertIsNone(self.col.find("missing"))
+
+    def test_projection(self):
+        _id = self.col.insert({"a": 1, "b": "x" * 5000, "c": 3})["_id"]
+        sent = self.server.stats()["bytes_sent"]
+        self.assertEqual(sorted(self.col.find_one(_id, ["a"])),
+                         ["_id", "a"])
+        self.assertEqual(sorted(self.col.find(str(_id), {"c": 1})),
+                         ["_id", "c"])
+        self.assertEqual(sorted(self.col.find_one({"a": 1}, ("a", "c"))),
+                         ["_id", "a", "c"])
+        self.assertEqual([sorted(d) for d in self.col.find({}, ["c"])],
+                         [["_id", "c"]])
+        self.assertLess(self.server.stats()["bytes_sent"] - sent, 1000)
+        self.assertRaises(TypeError, self.col.find, {}, "a")
+
+    def test_find_and_modify_fields(self):
+        self.col.insert({"a": 1, "b": 2})
+        doc = self.col.find_and_modify({"a": 1}, {"$set": {"b": 3}},
+                                       fields=["b"], new=True)
+        self.assertEqual(sorted(doc), ["_id", "b"])
+        self.assertEqual(doc["b"], 3)
+
+    def test_insert_many(self):
+        result = self.col.insert_many([{"n": i} for i in range(25)],
+                                      chunk_size=10, workers=2)
+        self.assertEqual(result.inserted_count, 25)
+        self.assertEqual(len(self.server.collection("db", "col")), 25)
+        requests = self.requests()
+        self.col.insert_many([{"n": i} for i in range(10)], max_bytes=20)
+        self.assertEqual(self.requests(), requests + 5)
+        self.assertEqual(self.col.count(), 35)
+
+    def test_find_by_ids(self):
+        ids = [self.col.insert({"n": i})["_id"] for i in range(5)]
+        self.col.insert({"_id": {"k": 1}, "n": 5})
+        missing = ObjectId()
+        requests = self.requests()
+        docs = self.col.find_by_ids([ids[3], missing, str(ids[0]), {"k": 1},
+                                     ids[3], ids[1]], chunk_size=2)
+        self.assertEqual([d and d["n"] for d in docs], [3, None, 0, 5, 3, 1])
+        self.assertEqual(self.requests(), requests + 3)
+        self.assertEqual(self.col.find_by_ids([]), [])
+
+    def test_find_by_ids_fields(self):
+        _id = self.col.insert({"a": 1, "b": 2})["_id"]
+        docs = self.col.find_by_ids([_id], {"a": 1})
+        self.assertEqual(docs, [{"_id": _id, "a": 1}])
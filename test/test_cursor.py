@@ -0,0 +1,107 @@
+# -*- coding: utf-8 *-*
+from mongolabclient import errors
+from pymongolab import DESCENDING, cursor
+from test import FakeServerTestCase
+
+
+class TestCursor(FakeServerTestCase):
+
+    def setUp(self):
+        super(TestCursor, self).setUp()
+        self.server.load("db", "col", [{"n": i, "g": i % 3}
+                                       for i in range(25)])
+        self.col = self.client().db.col
+        self.col.find_one()
+
+    def test_lazy(self):
+        requests = self.requests()
+        docs = self.col.find().batch_size(10)
+        self.assertEqual(self.requests(), requests)
+        self.assertEqual(next(docs)["n"], 0)
+        self.assertEqual(self.requests(), requests + 1)
+
+    def test_pages(self):
+        requests = self.requests()
+        docs = list(self.col.find().batch_size(10))
+        self.assertEqual([d["n"] for d in docs], list(range(25)))
+        self.assertEqual(self.requests(), requests + 3)
+
+    def test_list_sends_no_count(self):
+        requests = self.requests()
+        self.assertEqual(len(list(self.col.find())), 25)
+        self.assertEqual(self.requests(), requests + 1)
+        self.assertFalse(hasattr(cursor.Cursor, "__len__"))
+
+    def test_skip_limit(self):
+        docs = self.col.find().skip(5).limit(12).batch_size(5)
+        self.assertEqual([d["n"] for d in docs], list(range(5, 17)))
+        docs = self.col.find({"g": 0}, skip=1, limit=2)
+        self.assertEqual([d["n"] for d in docs], [3, 6])
+        self.assertEqual([d["n"] for d in self.col.find()[3:6]], [3, 4, 5])
+        self.assertEqual(self.col.find()[7]["n"], 7)
+        self.assertRaises(IndexError, lambda: self.col.find()[30])
+
+    def test_options_after_iteration(self):
+        docs = self.col.find()
+        next(docs)
+        self.assertRaises(errors.InvalidOperation, docs.limit, 1)
+        self.assertRaises(errors.InvalidOperation, docs.skip, 1)
+        self.assertRaises(errors.InvalidOperation, docs.batch_size, 1)
+        self.assertRaises(errors.InvalidOperation, docs.sort, "n")
+        self.assertRaises(errors.InvalidOperation, docs.hint, "n_1")
+        self.assertRaises(errors.InvalidOperation, docs.max_time_ms, 10)
+        self.assertEqual(next(docs.rewind())["n"], 0)
+
+    def test_invalid_options(self):
+        self.assertRaises(TypeError, self.col.find().skip, "1")
+        self.assertRaises(ValueError, self.col.find().skip, -1)
+        self.assertRaises(TypeError, self.col.find().limit, "1")
+        self.assertRaises(TypeError, self.col.find().batch_size, "1")
+        self.assertRaises(ValueError, self.col.find().batch_size, -1)
+
+    def test_clone(self):
+        docs = self.col.find().sort("n", -1).skip(1).limit(2)
+        list(docs)
+        self.assertEqual([d["n"] for d in docs.clone()], [23, 22])
+
+    def test_count(self):
+        requests = self.requests()
+        sent = self.server.stats()["bytes_sent"]
+        self.assertEqual(self.col.find({"g": 1}).count(), 8)
+        self.assertEqual(self.requests(), requests + 1)
+        self.assertLess(self.server.stats()["bytes_sent"] - sent, 100)
+        self.assertEqual(self.col.find().skip(20).limit(3).count(True), 3)
+        self.assertEqual(self.col.find().skip(20).count(True), 5)
+        self.assertEqual(self.col.find().skip(20).count(), 25)
+        self.assertEqual(self.col.count(), 25)
+
+    def test_sort(self):
+        docs = self.col.find().sort("n", DESCENDING).limit(3)
+        self.assertEqual([d["n"] for d in docs], [24, 23, 22])
+        docs = self.col.find().sort([("g", 1), ("n", -1)]).limit(3)
+        self.assertEqual([d["n"] for d in docs], [24, 21, 18])
+        docs = self.col.find(sort=[("n", -1)], limit=2)
+        self.assertEqual([d["n"] for d in docs], [24, 23])
+        docs = self.col.find(sort={"n": -1}, limit=2)
+        self.assertEqual([d["n"] for d in docs], [24, 23])
+        self.assertRaises(TypeError, self.col.find().sort, {"n": 1})
+
+    def test_sort_single_request(self):
+        requests = self.requests()
+        docs = self.col.find({"g": 2}).sort("n", -1).skip(1).limit(2)
+        self.assertEqual([d["n"] for d in docs], [20, 17])
+        self.assertEqual(self.requests(), requests + 1)
+
+    def test_hint(self):
+        docs = self.col.find({"g": 1}).sort("n", -1).hint([("g", 1)])
+        self.assertEqual([d["n"] for d in docs], list(range(22, 0, -3)))
+        docs = self.col.find({"g": 1}).hint("g_1").skip(1).limit(2)
+        self.assertEqual([d["n"] for d in docs], [4, 7])
+
+    def test_max_time_ms(self):
+        self.assertRaises(TypeError, self.col.find().max_time_ms, "10")
+        docs = self.col.find({"g": 1}).sort("n", -1).max_time_ms(5000)
+        self.assertEqual([d["n"] for d in docs], list(range(22, 0, -3)))
+        self.server.latency = 0.3
+        docs = self.col.find().max_time_ms(100)
+        self.assertRaises(errors.ExecutionTimeout, next, docs)
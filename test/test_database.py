@@ -0,0 +1,23 @@
+# -*- coding: utf-8 *-*
+from test import FakeServerTestCase
+
+
+class TestDatabase(FakeServerTestCase):
+
+    def setUp(self):
+        super(TestDatabase, self).setUp()
+        for name in ("a", "b"):
+            self.server.load("db", name, [{"col": name, "n": i}
+                                          for i in range(3)])
+        self.database = self.client().db
+
+    def test_find_across(self):
+        results = dict(self.database.find_across(spec={"n": 1}))
+        self.assertEqual(sorted(results), ["a", "b"])
+        self.assertEqual([d["col"] for d in results["a"]], ["a"])
+        results = dict(self.database.find_across(["b"], limit=2))
+        self.assertEqual(list(results), ["b"])
+        self.assertEqual(len(results["b"]), 2)
+        self.server.load("db", "c.d", [{"col": "c.d", "n": 1}])
+        results = dict(self.database.find_across(["c.d"], {"n": 1}))
+        self.assertEqual([d["col"] for d in results["c.d"]], ["c.d"])
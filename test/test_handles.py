@@ -0,0 +1,28 @@
+# -*- coding: utf-8 *-*
+import unittest
+
+from pymongolab import MongoClient
+from test import API_KEY
+
+
+class TestHandles(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = MongoClient(API_KEY, connect=False)
+
+    def test_cached(self):
+        database = self.connection.db
+        self.assertIs(self.connection["db"], database)
+        self.assertIs(database.col, database["col"])
+        self.assertIsNot(database.col, database.other)
+        self.assertEqual(database.col.full_name, "db.col")
+
+    def test_slots(self):
+        col = self.connection.db.col
+        for obj in (col.database, col, col.find()):
+            self.assertFalse(hasattr(obj, "__dict__"))
+            self.assertRaises(AttributeError, setattr, obj, "extra", 1)
+
+    def test_private_names(self):
+        self.assertRaises(AttributeError, getattr, self.connection, "_x")
+        self.assertRaises(AttributeError, getattr, self.connection.db, "_x")
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 *-*
+import gc
+import threading
+import time
+import unittest
+import weakref
+from collections import OrderedDict
+
+from bson.objectid import ObjectId
+
+from mongolabclient import codec, compat
+from pymongolab import helpers
+
+
+class Handle(object):
+
+    def __init__(self, name):
+        self.name = name
+
+
+class TestHelpers(unittest.TestCase):
+
+    def test_deadline(self):
+        self.assertIsNone(helpers._deadline(None))
+        deadline = helpers._deadline(500)
+        self.assertTrue(time.time() < deadline <= time.time() + 0.5)
+        self.assertRaises(TypeError, helpers._deadline, 0.5)
+        self.assertRaises(TypeError, helpers._deadline, "500")
+
+    def test_id_spec(self):
+        _id = ObjectId()
+        self.assertEqual(helpers._id_spec(_id), {"_id": _id})
+        self.assertEqual(helpers._id_spec(str(_id)), {"_id": _id})
+        self.assertEqual(helpers._id_spec("name"), {"_id": "name"})
+        self.assertEqual(helpers._id_spec({"k": 1}), {"_id": {"k": 1}})
+
+    def test_fields_document(self):
+        self.assertEqual(helpers._fields_document(None), {})
+        self.assertEqual(helpers._fields_document(["a", "b"]),
+                         {"a": 1, "b": 1})
+        self.assertEqual(helpers._fields_document({"a": 0}), {"a": 0})
+        self.assertRaises(TypeError, helpers._fields_document, "a")
+        self.assertRaises(TypeError, helpers._fields_document, [1])
+
+    def test_sort_document(self):
+        self.assertEqual(helpers._sort_document("a"), {"a": 1})
+        self.assertEqual(list(helpers._sort_document([("b", -1), ("a", 1)])),
+                         ["b", "a"])
+        self.assertEqual(helpers._sort_document({"a": -1}), {"a": -1})
+        self.assertRaises(TypeError, helpers._sort_document, 1)
+
+    def test_query_document(self):
+        sort = OrderedDict([("a", 1)])
+        self.assertEqual(helpers._query_document({"b": 1}, sort),
+                         ({"b": 1}, sort))
+        self.assertEqual(helpers._query_document({"b": 1}), ({"b": 1}, {}))
+        query, sort_document = helpers._query_document({"b": 1}, sort,
+                                                       {"a": 1})
+        self.assertEqual(list(query), ["$query", "$orderby", "$hint"])
+        self.assertEqual(query["$orderby"], sort)
+        self.assertEqual(sort_document, {})
+
+    def test_cursor_options(self):
+        self.assertEqual(helpers._check_cursor_option("skip", 2), 2)
+        self.assertRaises(TypeError, helpers._check_cursor_option, "skip",
+                          "1")
+        self.assertRaises(ValueError, helpers._check_cursor_option, "limit",
+                          -1)
+        self.assertIsNone(helpers._check_max_time_ms(None))
+        self.assertRaises(TypeError, helpers._check_max_time_ms, 1.5)
+        self.assertEqual(helpers._hint_document("a_1"), "a_1")
+        self.assertEqual(list(helpers._hint_document([("a", 1), ("b", -1)])),
+                         ["a", "b"])
+
+    def test_page_params(self):
+        page_size, params = helpers._page_params({"a": 1}, {"b": 1}, None,
+                                                 None, 5, 12, 10, 10,
+                                                 {"c": 1})
+        self.assertEqual(page_size, 2)
+        self.assertEqual(params, {"spec": {"a": 1}, "sort": {},
+                                  "fields": {"b": 1}, "skip": 15, "limit": 2,
+                                  "c": 1})
+        self.assertEqual(helpers._count_with_limit_and_skip(25, 5, 0), 20)
+        self.assertEqual(helpers._count_with_limit_and_skip(25, 5, 10), 10)
+        self.assertEqual(helpers._count_with_limit_and_skip(3, 5, 10), 0)
+
+    def test_find_one_params(self):
+        _id = ObjectId()
+        params = helpers._find_one_params(str(_id), ["a"], {})
+        self.assertEqual(params, {"spec": {"_id": _id}, "fields": {"a": 1},
+                                  "find_one": True})
+        params = helpers._find_one_params(None, None, {"sort": [("a", -1)]})
+        self.assertEqual((params["spec"], params["sort"]), ({}, {"a": -1}))
+
+    def test_find_and_modify(self):
+        command = helpers._find_and_modify_command({"a": 1}, {"b": 2}, False,
+                                                   [("a", 1)], ["b"], {})
+        self.assertEqual(command, {"query": {"a": 1}, "update": {"b": 2},
+                                   "fields": {"b": 1}, "sort": {"a": 1}})
+        self.assertRaises(ValueError, helpers._find_and_modify_command, {},
+                          None, False, None, None, {})
+        self.assertRaises(ValueError, helpers._find_and_modify_command, {},
+                          {"b": 2}, False, None, None, {"remove": True})
+        self.assertRaises(TypeError, helpers._find_and_modify_command, {},
+                          {"b": 2}, False, {"a": 1, "b": 1}, None, {})
+        self.assertEqual(helpers._find_and_modify_result(
+            {"ok": 1, "value": {"b": 2}}), {"b": 2})
+        self.assertIsNone(helpers._find_and_modify_result(
+            {"ok": 0, "errmsg": "No matching object found"}))
+        self.assertRaises(ValueError, helpers._find_and_modify_result,
+                          {"ok": 0, "errmsg": "failed"})
+
+    def test_command_document(self):
+        self.assertEqual(list(helpers._command_document("count", "col",
+                                                        {"query": {}})),
+                         ["count", "query"])
+        self.assertEqual(helpers._command_document({"dbStats": 1}, 1, {}),
+                         {"dbStats": 1})
+
+    def test_split_documents(self):
+        documents = [{"n": i} for i in range(5)]
+        self.assertEqual(helpers._split_documents(documents, 2),
+                         [documents[:2], documents[2:4], documents[4:]])
+        self.assertEqual(helpers._split_documents(documents), [documents])
+        self.assertEqual(helpers._split_documents([]), [])
+        encode = codec.DEFAULT_CODEC.encode
+        chunks = helpers._split_documents(documents, max_bytes=20,
+                                          encode=encode)
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        big = {"s": "x" * 100}
+        self.assertEqual(helpers._split_documents([big, big], max_bytes=20,
+                                                  encode=encode),
+                         [[big], [big]])
+
+    def test_split_documents_query(self):
+        def encode(chunk):
+            spec = {"_id": {"$in": chunk}}
+            return compat.quote_plus(codec.DEFAULT_CODEC.encode(spec))
+        ids = [str(ObjectId()) for _ in range(50)]
+        chunks = helpers._split_documents(ids, max_bytes=300, encode=encode)
+        self.assertEqual(sum(chunks, []), ids)
+        for chunk, following in zip(chunks, chunks[1:]):
+            self.assertLessEqual(len(encode(chunk)), 300)
+            self.assertGreater(len(encode(chunk + following[:1])), 300)
+        self.assertLessEqual(len(encode(chunks[-1])), 300)
+
+    def test_run_parallel(self):
+        def square(n):
+            if n == 3:
+                raise ValueError(n)
+            time.sleep(0.01)
+            return n * n
+        for workers in (1, 4):
+            results = sorted(helpers._run_parallel(square, range(6), workers),
+                             key=lambda result: result[0])
+            self.assertEqual([r[1] for r in results], [0, 1, 4, None, 16, 25])
+            self.assertTrue(isinstance(results[3][2], ValueError))
+
+    def test_run_parallel_workers(self):
+        lock = threading.Lock()
+        state = {"current": 0, "max": 0}
+
+        def work(n):
+            with lock:
+                state["current"] += 1
+                state["max"] = max(state["max"], state["current"])
+            time.sleep(0.02)
+            with lock:
+                state["current"] -= 1
+        list(helpers._run_parallel(work, range(8), workers=3))
+        self.assertEqual(state["max"], 3)
+
+    def test_fan_out(self):
+        results = dict(helpers._fan_out(lambda n: n * 2, range(5), 3))
+        self.assertEqual(results, dict((n, n * 2) for n in range(5)))
+
+        def fail(n):
+            if n == 0:
+                raise ValueError(n)
+            time.sleep(0.05)
+            return n
+        results = helpers._fan_out(fail, range(20), 2)
+        self.assertRaises(ValueError, list, results)
+
+    def test_handle_cache(self):
+        cache = helpers._HandleCache(Handle, max_size=2)
+        a = cache["a"]
+        self.assertIs(cache["a"], a)
+        b = weakref.ref(cache["b"])
+        cache["a"]
+        cache["c"]
+        self.assertEqual(len(cache), 2)
+        gc.collect()
+        self.assertIsNone(b())
+        self.assertIs(cache["a"], a)
+        cache["b"]
+        cache["c"]
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache["a"], a)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 *-*
+import time
+
+from pymongolab import Connection
+from test import API_KEY, FakeServerTestCase
+
+
+class TestMongoClient(FakeServerTestCase):
+
+    def setUp(self):
+        super(TestMongoClient, self).setUp()
+        for database in ("db1", "db2"):
+            self.server.load(database, "col", [{"db": database, "n": i}
+                                               for i in range(3)])
+        self.connection = self.client()
+
+    def test_map_find(self):
+        results = dict(self.connection.map_find([("db1", "col", {"n": 1}),
+                                                 ("db2", "col", {})]))
+        self.assertEqual(sorted(results), ["db1.col", "db2.col"])
+        self.assertEqual([d["n"] for d in results["db1.col"]], [1])
+        self.assertEqual(len(results["db2.col"]), 3)
+        results = dict(self.connection.map_find([("db1", "col", {})],
+                                                limit=2))
+        self.assertEqual(len(results["db1.col"]), 2)
+
+    def test_map_find_concurrent(self):
+        self.server.latency = 0.2
+        started = time.time()
+        results = list(self.connection.map_find(
+            [("db1", "col", {}), ("db2", "col", {}), ("db1", "col", {})],
+            workers=3))
+        self.assertEqual(len(results), 3)
+        self.assertLess(time.time() - started, 0.5)
+
+    def test_map_find_error(self):
+        self.server.fail_next(1, 400)
+        results = self.connection.map_find([("db1", "col", {})])
+        self.assertRaises(Exception, list, results)
+
+    def test_map_command(self):
+        results = dict(self.connection.map_command(
+            [("db1", {"count": "col"}), ("db2", "dbStats")]))
+        self.assertEqual(results["db1"]["n"], 3)
+        self.assertEqual(results["db2"]["objects"], 3)
+
+
+class TestConnection(TestMongoClient):
+
+    def setUp(self):
+        super(TestConnection, self).setUp()
+        self.connection = Connection(API_KEY, base_url=self.server.base_url)
+        self.addCleanup(self.connection.close)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 *-*
+import unittest
+
+from mongolabclient import MongoLabClient, monitoring
+from test import API_KEY
+
+
+class Recorder(monitoring.OperationListener):
+
+    def __init__(self):
+        self.events = []
+
+    def started(self, event):
+        self.events.append(("started", event))
+
+    def succeeded(self, event):
+        self.events.append(("succeeded", event))
+
+    def failed(self, event):
+        self.events.append(("failed", event))
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_record(self):
+        histogram = monitoring.Histogram((0.1, 1, 10))
+        self.assertIsNone(histogram.percentile(50))
+        for value in (0.05, 0.5, 0.7, 20):
+            histogram.record(value)
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.percentile(50), 1)
+        self.assertEqual(histogram.percentile(25), 0.1)
+        self.assertEqual(histogram.percentile(100), 20)
+        exported = histogram.export()
+        self.assertEqual(exported["buckets"],
+                         [(0.1, 1), (1, 2), (10, 0), (None, 1)])
+        self.assertEqual((exported["min"], exported["max"]), (0.05, 20))
+        histogram.reset()
+        self.assertEqual(histogram.count, 0)
+
+
+class TestMetricsListener(unittest.TestCase):
+
+    def event(self, cls, operation="list-documents"):
+        return cls(operation, "get", "db", "col", 1, 0, 200, 300, 0.001,
+                   0.01, 0.002)
+
+    def test_record(self):
+        metrics = monitoring.MetricsListener()
+        metrics.succeeded(self.event(monitoring.OperationSucceededEvent))
+        metrics.succeeded(self.event(monitoring.OperationSucceededEvent))
+        exported = metrics.export()["list-documents"]
+        self.assertEqual((exported["succeeded"], exported["failed"]), (2, 0))
+        self.assertEqual(exported["response_bytes"]["sum"], 600)
+        duration = metrics.histogram("list-documents", "duration")
+        self.assertEqual(duration.count, 2)
+        self.assertAlmostEqual(duration.export()["max"], 0.013)
+        metrics.reset()
+        self.assertEqual(metrics.export(), {})
+
+
+class TestClientEvents(unittest.TestCase):
+
+    def test_failed(self):
+        recorder = Recorder()
+        # Nothing listens on the proxy, so the request fails.
+        client = MongoLabClient(API_KEY, proxy_url="http://127.0.0.1:9",
+                                connect=False, event_listeners=[recorder])
+        self.addCleanup(client.close)
+        self.assertRaises(Exception, client.list_documents, "db", "col")
+        self.assertEqual([name for name, event in recorder.events],
+                         ["started", "failed"])
+        event = recorder.events[1][1]
+        self.assertEqual((event.operation, event.database, event.collection),
+                         ("list-documents", "db", "col"))
+        self.assertIsNotNone(event.failure)
+
+    def test_register(self):
+        recorder = Recorder()
+        self.assertRaises(TypeError, monitoring.register, object())
+        monitoring.register(recorder)
+        try:
+            client = MongoLabClient(API_KEY, proxy_url="http://127.0.0.1:9",
+                                    connect=False)
+            self.addCleanup(client.close)
+            self.assertRaises(Exception, client.list_databases)
+        finally:
+            monitoring.unregister(recorder)
+        self.assertEqual(len(recorder.events), 2)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 *-*
+import threading
+import time
+import unittest
+
+from mongolabclient import pool
+from test import API_KEY, FakeServerTestCase
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, pool.ConnectionPool, max_size=0)
+        self.assertRaises(ValueError, pool.ConnectionPool, max_size=1.5)
+        self.assertRaises(ValueError, pool.ConnectionPool, max_idle_time=0)
+
+    def test_close_unused(self):
+        connections = pool.ConnectionPool(max_size=2, max_idle_time=10)
+        connections.close()
+        connections.close()
+
+
+class TestPooledRequests(FakeServerTestCase):
+
+    def request(self, connections):
+        response = connections.request("get",
+                                       self.server.base_url + "databases",
+                                       params={"apiKey": API_KEY})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_request(self):
+        connections = pool.ConnectionPool()
+        self.addCleanup(connections.close)
+        for _ in range(3):
+            self.request(connections)
+        connections.close()
+        self.request(connections)
+        self.assertEqual(self.requests(), 4)
+
+    def test_block(self):
+        connections = pool.ConnectionPool(max_size=1, block=True)
+        self.addCleanup(connections.close)
+        self.server.latency = 0.05
+        threads = [threading.Thread(target=self.request, args=(connections,))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(self.requests(), 4)
+
+    def test_max_idle_time(self):
+        connections = pool.ConnectionPool(max_idle_time=0.05)
+        self.addCleanup(connections.close)
+        self.request(connections)
+        time.sleep(0.1)
+        self.request(connections)
+        self.assertEqual(self.requests(), 2)
+
+    def test_stream(self):
+        self.server.load("db", "col", [{"n": i, "s": "x" * 100}
+                                       for i in range(2000)])
+        connections = pool.ConnectionPool(max_idle_time=0.05)
+        self.addCleanup(connections.close)
+        response = connections.request(
+            "get", self.server.base_url + "databases/db/collections/col",
+            params={"apiKey": API_KEY, "l": 2000}, stream=True)
+        self.assertEqual(connections.in_use, 1)
+        time.sleep(0.1)
+        self.request(connections)
+        self.assertEqual(connections.in_use, 1)
+        self.assertEqual(len(response.json()), 2000)
+        response.close()
+        response.close()
+        self.assertEqual(connections.in_use, 0)
+
+    def test_client(self):
+        col = self.client(max_pool_size=2, max_idle_time=60).db.col
+        col.insert({"n": 1})
+        self.assertEqual(col.find_one()["n"], 1)
+        col.database.connection.close()
+        self.assertEqual(col.find_one()["n"], 1)
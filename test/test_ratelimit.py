@@ -0,0 +1,129 @@
+# -*- coding: utf-8 *-*
+import threading
+import time
+import unittest
+
+from mongolabclient import errors
+from mongolabclient.ratelimit import RateLimiter
+from test import FakeServerTestCase
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def start(self, target):
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def wait_queued(self, limiter, count):
+        deadline = time.time() + 5
+        while limiter.stats()["queued"] < count:
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.005)
+
+    def test_fifo(self):
+        limiter = RateLimiter(max_in_flight=1)
+        limiter.acquire()
+        order = []
+
+        def waiter(i):
+            def run():
+                with limiter:
+                    order.append(i)
+            return run
+        threads = []
+        for i in range(5):
+            threads.append(self.start(waiter(i)))
+            self.wait_queued(limiter, i + 1)
+        time.sleep(0.01)
+        limiter.release()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(order, list(range(5)))
+        stats = limiter.stats()
+        self.assertEqual((stats["acquired"], stats["waited"]), (6, 5))
+        self.assertEqual((stats["in_flight"], stats["queued"]), (0, 0))
+
+    def test_max_in_flight(self):
+        limiter = RateLimiter(max_in_flight=2)
+        lock = threading.Lock()
+        state = {"current": 0, "max": 0}
+
+        def run():
+            with limiter:
+                with lock:
+                    state["current"] += 1
+                    state["max"] = max(state["max"], state["current"])
+                time.sleep(0.02)
+                with lock:
+                    state["current"] -= 1
+        threads = [self.start(run) for _ in range(8)]
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(state["max"], 2)
+
+    def test_rate(self):
+        limiter = RateLimiter(rate=20, burst=2)
+        started = time.time()
+        for _ in range(6):
+            with limiter:
+                pass
+        self.assertGreaterEqual(time.time() - started, 0.18)
+
+    def test_deadline(self):
+        limiter = RateLimiter(max_in_flight=1)
+        limiter.acquire()
+        self.assertRaises(errors.ExecutionTimeout, limiter.acquire,
+                          time.time() + 0.05)
+        self.assertEqual(limiter.stats()["queued"], 0)
+        limiter.release()
+        limiter.acquire(time.time() + 0.05)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, RateLimiter, rate=0)
+        self.assertRaises(ValueError, RateLimiter, burst=0)
+        self.assertRaises(ValueError, RateLimiter, max_in_flight=0)
+
+
+class TestRateLimitedClient(FakeServerTestCase):
+
+    def test_max_in_flight(self):
+        limiter = RateLimiter(max_in_flight=1)
+        col = self.client(rate_limiter=limiter).db.col
+        self.server.latency = 0.1
+        threads = [threading.Thread(target=col.find_one) for _ in range(3)]
+        started = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.time() - started, 0.3)
+        stats = limiter.stats()
+        self.assertEqual((stats["in_flight"], stats["queued"]), (0, 0))
+        self.assertGreaterEqual(stats["waited"], 2)
+
+    def test_rate(self):
+        limiter = RateLimiter(rate=20, burst=1)
+        col = self.client(rate_limiter=limiter).db.col
+        started = time.time()
+        for _ in range(4):
+            col.find_one()
+        self.assertGreaterEqual(time.time() - started, 0.14)
+
+    def test_stream(self):
+        limiter = RateLimiter(max_in_flight=1)
+        self.server.load("db", "col", [{"n": i} for i in range(100)])
+        request = self.client(rate_limiter=limiter).request
+        documents = request.list_documents("db", "col", stream=True,
+                                           limit=100)
+        self.assertEqual(next(documents)["n"], 0)
+        self.assertEqual(limiter.stats()["in_flight"], 1)
+        self.assertRaises(errors.ExecutionTimeout, request.list_documents,
+                          "db", "col", deadline=time.time() + 0.05)
+        documents.close()
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+        documents = request.list_documents("db", "col", stream=True,
+                                           limit=100)
+        self.assertEqual(len(list(documents)), 100)
+        self.assertEqual(limiter.stats()["in_flight"], 0)
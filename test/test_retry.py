@@ -0,0 +1,112 @@
+# -*- coding: utf-8 *-*
+import time
+import unittest
+from email.utils import formatdate
+
+import requests
+
+from mongolabclient.retry import RetryBudget, RetryPolicy
+
+
+class Response(object):
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def sender(self, *outcomes):
+        outcomes = list(outcomes)
+        sent = []
+
+        def send():
+            sent.append(1)
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return send, sent
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_base=0.1, backoff_max=0.5)
+        for attempt, cap in ((1, 0.1), (2, 0.2), (3, 0.4), (10, 0.5)):
+            delays = [policy.backoff(attempt) for _ in range(200)]
+            self.assertTrue(all(0 <= d <= cap for d in delays))
+            self.assertGreater(len(set(delays)), 1)
+            self.assertGreater(max(delays), cap / 2)
+
+    def test_retry_after(self):
+        self.assertEqual(RetryPolicy.retry_after({"Retry-After": "2"}), 2)
+        self.assertIsNone(RetryPolicy.retry_after({}))
+        self.assertIsNone(RetryPolicy.retry_after({"Retry-After": "soon"}))
+        date = formatdate(time.time() + 30, usegmt=True)
+        delay = RetryPolicy.retry_after({"Retry-After": date})
+        self.assertTrue(25 < delay <= 30)
+        date = formatdate(time.time() - 30, usegmt=True)
+        self.assertEqual(RetryPolicy.retry_after({"Retry-After": date}), 0)
+
+    def test_next_delay(self):
+        policy = RetryPolicy(max_attempts=3, backoff_base=0.01)
+        started = time.time()
+        self.assertIsNotNone(policy.next_delay("GET", 1, started, 503))
+        self.assertIsNone(policy.next_delay("GET", 3, started, 503))
+        self.assertIsNone(policy.next_delay("GET", 1, started, 400))
+        self.assertIsNone(policy.next_delay("POST", 1, started, 503))
+        self.assertIsNotNone(policy.next_delay("GET", 1, started))
+        self.assertEqual(policy.next_delay(
+            "GET", 1, started, 429, {"Retry-After": "1"}), 1)
+        self.assertIsNone(policy.next_delay(
+            "GET", 1, started, 429, {"Retry-After": "1"},
+            deadline=time.time() + 0.5))
+        policy = RetryPolicy(retry_all_methods=True)
+        self.assertIsNotNone(policy.next_delay("POST", 1, started, 503))
+
+    def test_deadline(self):
+        policy = RetryPolicy(backoff_base=0.01, deadline=0.5)
+        self.assertIsNotNone(policy.next_delay("GET", 1, time.time()))
+        self.assertIsNone(policy.next_delay("GET", 1, time.time() - 1))
+
+    def test_budget(self):
+        budget = RetryBudget(capacity=2, refill_rate=20)
+        self.assertTrue(budget.acquire())
+        self.assertTrue(budget.acquire())
+        self.assertFalse(budget.acquire())
+        time.sleep(0.1)
+        self.assertTrue(budget.acquire())
+        policy = RetryPolicy(budget=RetryBudget(capacity=1, refill_rate=0))
+        self.assertIsNotNone(policy.next_delay("GET", 1, time.time()))
+        self.assertIsNone(policy.next_delay("GET", 1, time.time()))
+
+    def test_send(self):
+        policy = RetryPolicy(backoff_base=0.01)
+        failed = Response(503)
+        send, sent = self.sender(failed, requests.ConnectionError(),
+                                 Response(200))
+        self.assertEqual(policy.send("get", send).status_code, 200)
+        self.assertEqual(len(sent), 3)
+        self.assertTrue(failed.closed)
+
+    def test_send_exhausted(self):
+        policy = RetryPolicy(max_attempts=2, backoff_base=0.01)
+        send, sent = self.sender(Response(503), Response(503))
+        self.assertEqual(policy.send("get", send).status_code, 503)
+        send, sent = self.sender(requests.Timeout(), requests.Timeout())
+        self.assertRaises(requests.Timeout, policy.send, "get", send)
+        self.assertEqual(len(sent), 2)
+        send, sent = self.sender(Response(503))
+        self.assertEqual(policy.send("post", send).status_code, 503)
+        self.assertEqual(len(sent), 1)
+
+    def test_send_deadline(self):
+        policy = RetryPolicy(backoff_base=0.01)
+        send, sent = self.sender(Response(429, {"Retry-After": "1"}),
+                                 Response(200))
+        response = policy.send("get", send, deadline=time.time() + 0.5)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(len(sent), 1)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 *-*
+import unittest
+
+from mongolabclient import errors, settings
+
+
+class TestMongoLabSettings(unittest.TestCase):
+
+    def setUp(self):
+        self.templates = settings.MongoLabSettings().compile(
+            "key", {"a": "b"})
+
+    def test_invalid_version(self):
+        self.assertRaises(errors.UnsupportedVersion, settings.MongoLabSettings, "v0")
+
+    def test_compile(self):
+        self.assertEqual(sorted(self.templates),
+                         sorted(settings.MongoLabSettings().operations))
+        template = self.templates[settings.LST_DOCS]
+        self.assertEqual(template.method, "get")
+        self.assertEqual(template.headers, {"a": "b"})
+        self.assertEqual(template.url({"db": "d", "col": "c"}),
+                         "https://api.mongolab.com/api/1/databases/d/"
+                         "collections/c")
+        self.assertEqual(template.query_string({}), "apiKey=key")
+        self.assertEqual(template.query_string({"q": '{"a": 1}'}),
+                         "apiKey=key&q=%7B%22a%22%3A+1%7D")
+
+    def test_document_url(self):
+        template = self.templates[settings.VIW_DOC]
+        for _id in ("1", "2"):
+            self.assertEqual(template.url({"db": "d", "col": "c", "id": _id}),
+                             "https://api.mongolab.com/api/1/databases/d/"
+                             "collections/c/" + _id)
+
+    def test_base_url(self):
+        templates = settings.MongoLabSettings().compile(
+            "key", {}, "http://127.0.0.1:8000/")
+        self.assertEqual(templates[settings.LST_DBS].url({}),
+                         "http://127.0.0.1:8000/databases")
+
+    def test_max_urls(self):
+        template = settings.RequestTemplate("GET", "http://h/%(db)s", "", {},
+                                            max_urls=2)
+        for db in ("a", "b", "c", "a"):
+            self.assertEqual(template.url({"db": db}), "http://h/" + db)
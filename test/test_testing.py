@@ -0,0 +1,216 @@
+# -*- coding: utf-8 *-*
+import errno
+import json
+import socket
+import sys
+import time
+import unittest
+
+import requests
+
+from mongolabclient import testing
+from test import API_KEY, FakeServerTestCase
+
+
+class Output(object):
+
+    def __init__(self):
+        self.data = []
+
+    def write(self, data):
+        self.data.append(data)
+
+    def flush(self):
+        pass
+
+
+class TestMatch(unittest.TestCase):
+
+    document = {"_id": {"$oid": "50243d38e4b00c3b3e75fc94"}, "n": 5,
+                "s": "abc", "tags": ["a", "b"], "sub": {"x": 1}}
+
+    def assertMatches(self, spec, expected=True):
+        self.assertEqual(testing.match(self.document, spec), expected)
+
+    def test_equality(self):
+        self.assertMatches({})
+        self.assertMatches({"n": 5})
+        self.assertMatches({"n": 6}, False)
+        self.assertMatches({"sub.x": 1})
+        self.assertMatches({"tags": "a"})
+        self.assertMatches({"missing": None})
+        self.assertMatches({"_id": {"$oid": "50243d38e4b00c3b3e75fc94"}})
+
+    def test_operators(self):
+        self.assertMatches({"n": {"$gt": 4, "$lte": 5}})
+        self.assertMatches({"n": {"$lt": 5}}, False)
+        self.assertMatches({"n": {"$in": [1, 5]}})
+        self.assertMatches({"n": {"$nin": [1, 5]}}, False)
+        self.assertMatches({"s": {"$ne": "abd"}})
+        self.assertMatches({"missing": {"$exists": False}})
+        self.assertMatches({"n": {"$gt": "a"}}, False)
+        self.assertMatches({"$or": [{"n": 1}, {"s": "abc"}]})
+        self.assertMatches({"$and": [{"n": 5}, {"s": "x"}]}, False)
+
+    def test_project(self):
+        self.assertEqual(testing.project(self.document, {"n": 1}),
+                         {"_id": self.document["_id"], "n": 5})
+        self.assertEqual(testing.project(self.document, {"sub.x": 1,
+                                                         "_id": 0}),
+                         {"sub": {"x": 1}})
+        self.assertEqual(sorted(testing.project(self.document, {"tags": 0})),
+                         ["_id", "n", "s", "sub"])
+
+    def test_update(self):
+        document = {"_id": 1, "n": 1, "tags": ["a"]}
+        testing.update(document, {"$inc": {"n": 2}, "$set": {"s.t": 1},
+                                  "$push": {"tags": "b"}})
+        self.assertEqual(document, {"_id": 1, "n": 3, "s": {"t": 1},
+                                    "tags": ["a", "b"]})
+        testing.update(document, {"$pull": {"tags": "a"},
+                                  "$unset": {"s": 1},
+                                  "$rename": {"n": "m"}})
+        self.assertEqual(document, {"_id": 1, "m": 3, "tags": ["b"]})
+        testing.update(document, {"other": 1})
+        self.assertEqual(document, {"_id": 1, "other": 1})
+
+
+class TestFakeMongoLabServer(FakeServerTestCase):
+
+    def get(self, path, **params):
+        params["apiKey"] = API_KEY
+        return requests.get(self.server.base_url + path, params=params)
+
+    def documents(self, **params):
+        for key in ("q", "s", "f"):
+            if key in params:
+                params[key] = json.dumps(params[key])
+        response = self.get("databases/db/collections/col", **params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_list_documents(self):
+        self.server.load("db", "col", [{"n": i, "g": i % 2}
+                                       for i in range(10)])
+        self.assertEqual(len(self.documents()), 10)
+        self.assertEqual([d["n"] for d in self.documents(
+            q={"g": 1}, s={"n": -1}, sk=1, l=2)], [7, 5])
+        self.assertEqual(self.documents(q={"g": 0}, c="true"), 5)
+        self.assertEqual(self.documents(q={"n": 3}, fo="true")["n"], 3)
+        self.assertIsNone(self.documents(q={"n": 30}, fo="true"))
+        self.assertEqual(sorted(self.documents(f={"g": 1}, l=1)[0]),
+                         ["_id", "g"])
+
+    def test_client(self):
+        col = self.client().db.col
+        col.insert({"n": 1})
+        self.assertEqual(col.find_one({"n": 1})["n"], 1)
+        self.assertEqual(col.database.collection_names(), ["col"])
+
+    def test_load(self):
+        self.server.load("db", "col", [{"n": 1}])
+        stored = self.server.collection("db", "col")
+        self.assertEqual(len(stored), 1)
+        self.assertIn("$oid", stored[0]["_id"])
+        self.assertEqual(self.get("databases").json(), ["db"])
+        self.assertEqual(self.get("databases/db/collections").json(),
+                         ["col"])
+        self.server.reset()
+        self.assertEqual(self.server.collection("db", "col"), [])
+
+    def test_write(self):
+        url = self.server.base_url + "databases/db/collections/col"
+        params = {"apiKey": API_KEY}
+        requests.post(url, params=params, data=json.dumps([{"n": 1},
+                                                           {"n": 2}]))
+        requests.put(url, params=dict(params, q=json.dumps({"n": 1})),
+                     data=json.dumps({"$set": {"m": 1}}))
+        self.assertEqual([d.get("m") for d in self.documents()], [1, None])
+        _id = self.documents(q={"n": 2})[0]["_id"]["$oid"]
+        response = requests.delete(url + "/" + _id, params=params)
+        self.assertEqual(response.json()["n"], 2)
+        self.assertEqual(len(self.documents()), 1)
+        response = self.get("databases/db/collections/col/" + _id)
+        self.assertEqual(response.status_code, 404)
+
+    def test_command(self):
+        self.server.load("db", "col", [{"n": i} for i in range(3)])
+        url = self.server.base_url + "databases/db/runCommand"
+        response = requests.post(url, params={"apiKey": API_KEY},
+                                 data=json.dumps({"count": "col",
+                                                  "query": {"n": 1}}))
+        self.assertEqual(response.json()["n"], 1)
+
+    def test_fail_next(self):
+        self.server.fail_next(2, 429, retry_after=3)
+        response = self.get("databases")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "3")
+        self.assertEqual(self.get("databases").status_code, 429)
+        self.assertEqual(self.get("databases").status_code, 200)
+        stats = self.server.stats()
+        self.assertEqual((stats["requests"], stats["errors"]), (3, 2))
+
+    def test_latency(self):
+        self.server.latency = 0.2
+        started = time.time()
+        self.get("databases")
+        self.assertGreaterEqual(time.time() - started, 0.2)
+
+    def test_stats(self):
+        self.server.load("db", "col", [{"s": "x" * 1000}])
+        self.documents()
+        stats = self.server.stats()
+        self.assertEqual(stats["requests"], 1)
+        self.assertGreater(stats["bytes_sent"], 1000)
+
+
+class TestHTTPServer(unittest.TestCase):
+
+    def test_client_disconnected(self):
+        server = testing._HTTPServer(("127.0.0.1", 0),
+                                     testing._RequestHandler)
+        self.addCleanup(server.server_close)
+        output = Output()
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout = sys.stderr = output
+        try:
+            for error in (socket.error(errno.EPIPE, "Broken pipe"),
+                          socket.error(errno.ECONNRESET, "Reset"),
+                          ValueError("unexpected")):
+                try:
+                    raise error
+                except Exception:
+                    server.handle_error(None, ("127.0.0.1", 1))
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+        output = "".join(output.data)
+        self.assertNotIn("Broken pipe", output)
+        self.assertNotIn("Reset", output)
+        self.assertIn("unexpected", output)
+
+
+class TestServerOptions(unittest.TestCase):
+
+    def test_api_keys(self):
+        with testing.FakeMongoLabServer(api_keys=["b" * 24]) as server:
+            url = server.base_url + "databases"
+            response = requests.get(url, params={"apiKey": API_KEY})
+            self.assertEqual(response.status_code, 401)
+            response = requests.get(url, params={"apiKey": "b" * 24})
+            self.assertEqual(response.status_code, 200)
+
+    def test_error_rate(self):
+        with testing.FakeMongoLabServer(error_rate=1.0,
+                                        error_status=500) as server:
+            response = requests.get(server.base_url + "databases",
+                                    params={"apiKey": API_KEY})
+            self.assertEqual(response.status_code, 500)
+
+    def test_rate_limit(self):
+        with testing.FakeMongoLabServer(rate_limit=2) as server:
+            statuses = [requests.get(server.base_url + "databases",
+                                     params={"apiKey": API_KEY}).status_code
+                        for _ in range(5)]
+            self.assertIn(429, statuses)
+            self.assertEqual(server.stats()["throttled"], statuses.count(429))
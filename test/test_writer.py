@@ -0,0 +1,96 @@
+# -*- coding: utf-8 *-*
+import time
+
+from mongolabclient import errors
+from test import FakeServerTestCase
+
+
+class TestBufferedWriter(FakeServerTestCase):
+
+    def setUp(self):
+        super(TestBufferedWriter, self).setUp()
+        self.col = self.client().db.col
+
+    def stored(self):
+        return [d["n"] for d in self.server.collection("db", "col")]
+
+    def test_max_docs(self):
+        with self.col.buffered_writer(max_docs=10,
+                                      flush_interval=60) as writer:
+            writer.insert([{"n": i} for i in range(25)])
+            writer.flush(5)
+            stats = writer.stats()
+        self.assertEqual(self.stored(), list(range(25)))
+        self.assertEqual(stats["inserted"], 25)
+        self.assertEqual(stats["flushes"], 3)
+        self.assertEqual(stats["buffered"], 0)
+
+    def test_max_bytes(self):
+        with self.col.buffered_writer(max_bytes=200,
+                                      flush_interval=60) as writer:
+            for i in range(20):
+                writer.insert({"n": i, "s": "x" * 50})
+        self.assertEqual(self.stored(), list(range(20)))
+        self.assertGreater(writer.stats()["flushes"], 5)
+
+    def test_flush_interval(self):
+        writer = self.col.buffered_writer(flush_interval=0.1)
+        self.addCleanup(writer.close)
+        writer.insert({"n": 1})
+        self.assertEqual(self.stored(), [])
+        time.sleep(0.5)
+        self.assertEqual(self.stored(), [1])
+
+    def test_close(self):
+        writer = self.col.buffered_writer(flush_interval=60)
+        writer.insert({"n": 1})
+        writer.close(5)
+        self.assertEqual(self.stored(), [1])
+        self.assertRaises(errors.InvalidOperation, writer.insert, {"n": 2})
+        writer.close(5)
+
+    def test_max_buffered(self):
+        self.server.latency = 0.3
+        writer = self.col.buffered_writer(max_docs=1, max_buffered=1)
+        self.addCleanup(writer.close)
+        writer.insert({"n": 1})
+        writer.insert({"n": 2})
+        self.assertRaises(errors.ExecutionTimeout, writer.insert, {"n": 3},
+                          timeout=0.05)
+
+    def test_failures(self):
+        errors_seen = []
+        writer = self.col.buffered_writer(
+            max_docs=2, flush_interval=60, max_failures=2,
+            on_error=lambda error, docs: errors_seen.append(docs))
+        self.server.fail_next(3, 500)
+        for i in range(4):
+            writer.insert([{"n": 2 * i}, {"n": 2 * i + 1}])
+            writer.flush(5)
+        writer.close(5)
+        self.assertEqual(self.stored(), [6, 7])
+        self.assertEqual(len(errors_seen), 3)
+        failures = writer.failures
+        self.assertEqual([[d["n"] for d in docs] for docs, _ in failures],
+                         [[2, 3], [4, 5]])
+        stats = writer.stats()
+        self.assertEqual((stats["inserted"], stats["failed"]), (2, 6))
+
+    def test_on_error_raising(self):
+        def on_error(error, docs):
+            raise RuntimeError()
+        writer = self.col.buffered_writer(flush_interval=60,
+                                          on_error=on_error)
+        self.server.fail_next(1, 500)
+        writer.insert({"n": 1})
+        writer.flush(5)
+        writer.insert({"n": 2})
+        writer.close(5)
+        self.assertEqual(self.stored(), [2])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, self.col.buffered_writer, max_docs=0)
+        self.assertRaises(ValueError, self.col.buffered_writer,
+                          flush_interval=0)
+        self.assertRaises(ValueError, self.col.buffered_writer, max_docs=10,
+                          max_buffered=5)